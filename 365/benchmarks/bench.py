@@ -0,0 +1,178 @@
+import json
+import math
+import time
+import platform
+import statistics
+from datetime import datetime
+
+# A small benchmark framework for the 365 exercises.
+#
+# A benchmark is a setup function registered with @benchmark. It gets an input
+# size, builds the input (not timed) and returns the zero-argument function to
+# time:
+#
+#   @benchmark("two_sum/brute_force", sizes=[10, 100, 1000])
+#   def two_sum_brute(size):
+#       nums = list(range(size))
+#       return lambda: Solution().twoSum(nums, 2 * size - 3)
+#
+# Every (benchmark, size) is warmed up, then timed REPEATS times. Each sample
+# runs the function enough times in a row to last at least MIN_SAMPLE_TIME,
+# and we keep the time per call. Results are summarised as median and IQR
+# (interquartile range, q3 - q1), which a single slow run cannot skew.
+
+BENCHMARKS = {}          #name -> Benchmark, filled by @benchmark when the bench_*.py files are imported
+WARMUP = 1               #untimed samples before measuring
+REPEATS = 7              #timed samples per size
+MIN_SAMPLE_TIME = 0.02   #seconds; fast functions are looped until a sample takes this long
+THRESHOLD = 0.10         #a median more than 10% slower than the baseline counts as a regression
+MAX_EXPONENT = 1.2       #time growing faster than size**1.2 is not "linear" any more
+
+
+class Benchmark:
+    """One registered benchmark: a setup function and the input sizes to run it at."""
+
+    def __init__(self, name, setup, sizes, group):
+        self.name = name
+        self.setup = setup
+        self.sizes = list(sizes)
+        self.group = group
+
+
+#function to register a benchmark (used as a decorator)
+def benchmark(name, sizes=(10, 100, 1000), group=None):
+    def register(setup):
+        if name in BENCHMARKS:
+            raise ValueError(f"Benchmark '{name}' is registered twice")
+        BENCHMARKS[name] = Benchmark(name, setup, sizes, group or setup.__module__)
+        return setup
+    return register
+
+
+#function to find how many calls make one sample last at least min_time
+def calibrate(function, min_time=MIN_SAMPLE_TIME):
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return loops
+        #aim a little past min_time so the next try usually succeeds
+        loops = max(loops * 2, int(loops * min_time * 1.2 / elapsed) if elapsed > 0 else loops * 10)
+
+
+#function to time one function -> list of seconds per call, one per sample
+def measure(function, warmup=WARMUP, repeats=REPEATS, min_time=MIN_SAMPLE_TIME):
+    loops = calibrate(function, min_time)
+    for _ in range(warmup):
+        for _ in range(loops):
+            function()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        samples.append((time.perf_counter() - start) / loops)
+    return samples, loops
+
+
+#function to summarise samples as median / quartiles / IQR
+def summarise(samples, loops):
+    if len(samples) >= 2:
+        q1, median, q3 = statistics.quantiles(samples, n=4, method="inclusive")
+    else:
+        q1 = median = q3 = samples[0]
+    return {
+        "median": median,
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "min": min(samples),
+        "repeats": len(samples),
+        "loops": loops,
+    }
+
+
+#function to run the registered benchmarks whose name contains pattern
+def run_benchmarks(pattern="", sizes=None, repeats=REPEATS, warmup=WARMUP, min_time=MIN_SAMPLE_TIME, report=None):
+    results = {}
+    for name in sorted(BENCHMARKS):
+        if pattern not in name:
+            continue
+        bench = BENCHMARKS[name]
+        results[name] = {}
+        for size in (sizes(bench.sizes) if sizes else bench.sizes):
+            function = bench.setup(size)
+            samples, loops = measure(function, warmup, repeats, min_time)
+            results[name][str(size)] = summarise(samples, loops)
+            if report:
+                report(name, size, results[name][str(size)])
+    return results
+
+
+#function to save results as JSON together with what machine / python produced them
+def save_results(results, filename):
+    data = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "results": results,
+    }
+    with open(filename, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def load_results(filename):
+    with open(filename, "r") as file:
+        return json.load(file)["results"]
+
+
+#function to compare results with a baseline -> rows of (name, size, baseline, now, ratio, status)
+def compare_results(results, baseline, threshold=THRESHOLD):
+    rows = []
+    for name, sizes in results.items():
+        for size, now in sizes.items():
+            before = baseline.get(name, {}).get(size)
+            if before is None:
+                rows.append((name, size, None, now["median"], None, "new"))
+                continue
+            ratio = now["median"] / before["median"]
+            #slower by more than the threshold AND outside the noise of both runs
+            if ratio > 1 + threshold and now["q1"] > before["q3"]:
+                status = "REGRESSION"
+            elif ratio < 1 - threshold and now["q3"] < before["q1"]:
+                status = "faster"
+            else:
+                status = "same"
+            rows.append((name, size, before["median"], now["median"], ratio, status))
+    return rows
+
+
+#function to fit time = a * size**exponent over one benchmark's sizes -> exponent (1.0 linear, 2.0 quadratic)
+def scaling_exponent(sizes):
+    #least-squares slope of log(median) over log(size), so one noisy size cannot decide it
+    points = [(math.log(int(size)), math.log(stats["median"])) for size, stats in sizes.items() if stats["median"] > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+#function to show a time with a unit that fits it
+def format_time(seconds):
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
@@ -0,0 +1,72 @@
+import os
+import atexit
+import random
+import shutil
+import string
+import tempfile
+
+from bench import benchmark
+from loaders import load_leetcode, load_module, LEETCODE_DIR
+
+# The count-signature engine in leetcode/anagrams.py against the sort-based
+# solutions it replaces for big inputs (2_validAnagram.py and 6_groupAnagram.py).
+
+anagrams = load_module(os.path.join(LEETCODE_DIR, "anagrams.py"))
+folder = tempfile.mkdtemp(prefix="bench_anagrams_")
+atexit.register(shutil.rmtree, folder, ignore_errors=True)
+rng = random.Random(50)
+
+
+#function to make size dictionary-like words (3 to 12 letters, about 3 anagrams per group)
+def make_words(size):
+    roots = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 12))) for _ in range(max(1, size // 3))]
+    return ["".join(rng.sample(root, len(root))) for root in rng.choices(roots, k=size)]
+
+
+#function to write a word file with size words (once per size) -> its path
+def words_file(size):
+    path = os.path.join(folder, f"words_{size}.txt")
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("\n".join(make_words(size)) + "\n")
+    return path
+
+
+@benchmark("anagrams/valid_sorted", sizes=[100, 10_000, 1_000_000])
+def valid_sorted(size):
+    s = "".join(rng.choice(string.ascii_lowercase) for _ in range(size))
+    t = "".join(rng.sample(s, len(s)))
+    solution = load_leetcode(2).Solution()
+    return lambda: solution.isAnagram(s, t)
+
+
+@benchmark("anagrams/valid_counted", sizes=[100, 10_000, 1_000_000])
+def valid_counted(size):
+    s = "".join(rng.choice(string.ascii_lowercase) for _ in range(size))
+    t = "".join(rng.sample(s, len(s)))
+    return lambda: anagrams.is_anagram(s, t)
+
+
+@benchmark("anagrams/group_sorted", sizes=[1000, 100_000, 1_000_000])
+def group_sorted(size):
+    words = make_words(size)
+    solution = load_leetcode(6).Solution()
+    return lambda: solution.groupAnagrams(words)
+
+
+@benchmark("anagrams/group_signatures", sizes=[1000, 100_000, 1_000_000])
+def group_signatures(size):
+    words = make_words(size)
+    return lambda: anagrams.group_anagrams(words)
+
+
+@benchmark("anagrams/file_1_worker", sizes=[1_000_000])
+def file_1_worker(size):
+    path = words_file(size)
+    return lambda: anagrams.group_anagrams_file(path, workers=1)
+
+
+@benchmark("anagrams/file_2_workers", sizes=[1_000_000])
+def file_2_workers(size):
+    path = words_file(size)
+    return lambda: anagrams.group_anagrams_file(path, workers=2, chunk_bytes=1024 * 1024)
@@ -0,0 +1,47 @@
+import os
+import csv
+import atexit
+import random
+import shutil
+import tempfile
+
+from bench import benchmark
+from loaders import load_exercise
+
+SIZES = [1000, 100_000]
+
+converter = load_exercise("Week_3_OOP_First_Certificate", "Day_18", "CsvToJson.py")
+folder = tempfile.mkdtemp(prefix="bench_csvtojson_")
+atexit.register(shutil.rmtree, folder, ignore_errors=True)
+
+
+#function to write a students csv with size rows (once per size) -> its path
+def students_csv(size):
+    path = os.path.join(folder, f"students_{size}.csv")
+    if not os.path.exists(path):
+        rng = random.Random(size)
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["name", "age", "city", "grade"])
+            for i in range(size):
+                writer.writerow([f"Student {i}", rng.randint(15, 30), rng.choice(["Kathmandu", "Pokhara", "Lalitpur"]),
+                                 rng.choice("ABCDF")])
+    return path
+
+
+@benchmark("csvtojson/read_all_then_dump", sizes=SIZES)
+def read_all_then_dump(size):
+    source, target = students_csv(size), os.path.join(folder, "out.json")
+    return lambda: converter.write_json(converter.read_csv(source, []), target)
+
+
+@benchmark("csvtojson/stream_array", sizes=SIZES)
+def stream_array(size):
+    source, target = students_csv(size), os.path.join(folder, "out.json")
+    return lambda: converter.stream_csv_to_json(source, target)
+
+
+@benchmark("csvtojson/stream_jsonl", sizes=SIZES)
+def stream_jsonl(size):
+    source, target = students_csv(size), os.path.join(folder, "out.jsonl")
+    return lambda: converter.stream_csv_to_json(source, target, fmt="jsonl")
@@ -0,0 +1,14 @@
+import random
+
+from bench import benchmark
+from loaders import load_exercise
+
+prices = load_exercise("Week_2_Functions_And_First_LeetCode", "Day_11", "listComprehensions.py")
+SIZES = [1000, 100_000, 1_000_000]
+
+for name in ("map", "comprehension", "loop"):
+    @benchmark(f"day11/prices_with_{name}", sizes=SIZES)
+    def prices_bench(size, function=getattr(prices, f"get_prices_with_{name}")):
+        rng = random.Random(size)
+        data = [rng.randrange(100) for _ in range(size)]
+        return lambda: function(data)
@@ -0,0 +1,53 @@
+import random
+
+from bench import benchmark
+from loaders import load_exercise
+
+DAY_13 = ("Week_2_Functions_And_First_LeetCode", "Day_13")
+SIZES = [100, 10_000, 1_000_000]
+
+filters = load_exercise(*DAY_13, "data_filters.py")
+mappers = load_exercise(*DAY_13, "data_mappers.py")
+processor = load_exercise(*DAY_13, "data_processor.py")
+vectorized = load_exercise(*DAY_13, "data_vectorized.py")
+pipeline = load_exercise(*DAY_13, "data_pipeline.py")
+
+
+#function to make size random ints between -1000 and 1000
+def numbers(size):
+    rng = random.Random(size)
+    return [rng.randint(-1000, 1000) for _ in range(size)]
+
+
+#the four numeric functions: plain Python, the NumPy backend on a list, and on an array
+for name, args in (("filter_positive", ()), ("filter_divisible", (3,)), ("square_all", ()), ("multiply_by", (10,))):
+    python_version = getattr(filters, name, None) or getattr(mappers, name)
+    vectorized_version = getattr(vectorized, name)
+
+    @benchmark(f"day13/{name}/python", sizes=SIZES)
+    def python_bench(size, function=python_version, args=args):
+        data = numbers(size)
+        return lambda: function(data, *args)
+
+    @benchmark(f"day13/{name}/vectorized_list", sizes=SIZES)
+    def list_bench(size, function=vectorized_version, args=args):
+        data = numbers(size)
+        return lambda: function(data, *args)
+
+    if vectorized.numpy is not None:
+        @benchmark(f"day13/{name}/vectorized_array", sizes=SIZES)
+        def array_bench(size, function=vectorized_version, args=args):
+            data = vectorized.numpy.array(numbers(size))
+            return lambda: function(data, *args)
+
+
+@benchmark("day13/chain/eager", sizes=SIZES)
+def chain_eager(size):
+    data = numbers(size)
+    return lambda: sum(processor.process_student_scores(mappers.square_all(filters.filter_positive(data))))
+
+
+@benchmark("day13/chain/pipeline", sizes=SIZES)
+def chain_pipeline(size):
+    data = numbers(size)
+    return lambda: pipeline.Pipeline(data).filter_positive().square_all().process_student_scores().sum()
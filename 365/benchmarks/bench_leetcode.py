@@ -0,0 +1,53 @@
+import random
+import string
+
+from bench import benchmark
+from loaders import load_leetcode
+
+rng = random.Random(365)
+
+
+@benchmark("leetcode/1_two_sum", sizes=[100, 10_000, 1_000_000])
+def two_sum(size):
+    nums = list(range(size))
+    target = (size - 2) + (size - 1)  #the answer is the last two numbers: the worst case
+    solution = load_leetcode(1).Solution()
+    return lambda: solution.twoSum(nums, target)
+
+
+@benchmark("leetcode/2_valid_anagram", sizes=[100, 10_000, 100_000])
+def valid_anagram(size):
+    s = "".join(rng.choice(string.ascii_lowercase) for _ in range(size))
+    t = "".join(rng.sample(s, len(s)))
+    solution = load_leetcode(2).Solution()
+    return lambda: solution.isAnagram(s, t)
+
+
+@benchmark("leetcode/3_contains_duplicate", sizes=[100, 10_000, 1_000_000])
+def contains_duplicate(size):
+    nums = rng.sample(range(size * 10), size)  #no duplicate: every number has to be looked at
+    solution = load_leetcode(3).Solution()
+    return lambda: solution.containsDuplicate(nums)
+
+
+@benchmark("leetcode/4_max_profit", sizes=[100, 10_000, 100_000])
+def max_profit(size):
+    prices = [rng.randint(1, 10_000) for _ in range(size)]
+    solution = load_leetcode(4).Solution()
+    return lambda: solution.maxProfit(prices)
+
+
+@benchmark("leetcode/5_valid_parentheses", sizes=[100, 10_000, 100_000])
+def valid_parentheses(size):
+    opening = "".join(rng.choice("([{") for _ in range(size // 2))
+    text = opening + opening[::-1].translate(str.maketrans("([{", ")]}"))
+    solution = load_leetcode(5).Solution()
+    return lambda: solution.isValid(text)
+
+
+@benchmark("leetcode/6_group_anagrams", sizes=[100, 10_000, 100_000])
+def group_anagrams(size):
+    roots = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8))) for _ in range(max(1, size // 10))]
+    words = ["".join(rng.sample(root, len(root))) for root in rng.choices(roots, k=size)]
+    solution = load_leetcode(6).Solution()
+    return lambda: solution.groupAnagrams(words)
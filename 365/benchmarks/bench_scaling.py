@@ -0,0 +1,37 @@
+import os
+
+from bench import benchmark
+from loaders import load_leetcode, load_module, LEETCODE_DIR
+
+# Worst-case inputs at sizes up to 10**7 for the hash-based leetcode solutions.
+# check_scaling.py runs these and checks that time grows linearly with size.
+
+SIZES = [10**4, 10**5, 10**6, 10**7]
+
+streaming = load_module(os.path.join(LEETCODE_DIR, "streaming.py"))
+
+
+@benchmark("scaling/two_sum", sizes=SIZES)
+def two_sum(size):
+    nums = list(range(size))
+    target = (size - 2) + (size - 1)  #only the last two numbers add up to it
+    solution = load_leetcode(1).Solution()
+    return lambda: solution.twoSum(nums, target)
+
+
+@benchmark("scaling/two_sum_stream", sizes=SIZES)
+def two_sum_stream(size):
+    target = (size - 2) + (size - 1)
+    return lambda: streaming.two_sum_stream(iter(range(size)), target)  #numbers are produced one at a time
+
+
+@benchmark("scaling/contains_duplicate", sizes=SIZES)
+def contains_duplicate(size):
+    nums = list(range(size))  #no duplicate: every number has to be looked at
+    solution = load_leetcode(3).Solution()
+    return lambda: solution.containsDuplicate(nums)
+
+
+@benchmark("scaling/contains_duplicate_stream", sizes=SIZES)
+def contains_duplicate_stream(size):
+    return lambda: streaming.contains_duplicate_stream(iter(range(size)))
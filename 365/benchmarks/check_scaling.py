@@ -0,0 +1,97 @@
+import os
+import sys
+import random
+import argparse
+import tempfile
+from itertools import combinations
+
+import bench
+import bench_scaling
+from loaders import load_leetcode
+
+# Checks for the hash-based two_sum / contains_duplicate (and their streaming
+# versions): first correctness on small inputs full of duplicates, compared
+# with brute force, then the scaling/* benchmarks up to 10**7 numbers, whose
+# fitted exponent must stay under bench.MAX_EXPONENT (1.0 = linear).
+
+
+#function to check a two sum answer: two different positions whose numbers add up to target
+def valid_pair(nums, target, answer):
+    if not answer:
+        return not any(nums[i] + nums[j] == target for i, j in combinations(range(len(nums)), 2))
+    i, j = answer
+    return i != j and nums[i] + nums[j] == target
+
+
+#function to check results on random small lists with many repeated numbers -> list of failures
+def check_correctness(rounds=2000):
+    two_sum = load_leetcode(1).Solution().twoSum
+    contains_duplicate = load_leetcode(3).Solution().containsDuplicate
+    streaming = bench_scaling.streaming
+    rng = random.Random(49)
+    failures = []
+
+    fixed = [([2, 7, 11, 15], 9), ([3, 2, 4], 6), ([3, 3], 6), ([1, 5, 5, 1], 10), ([0, 4, 3, 0], 0), ([-3, 4, 3, 90], 0)]
+    cases = fixed + [
+        ([rng.randint(-5, 5) for _ in range(rng.randint(0, 12))], rng.randint(-10, 10))
+        for _ in range(rounds)
+    ]
+    for nums, target in cases:
+        if not valid_pair(nums, target, two_sum(nums, target)):
+            failures.append(f"twoSum({nums}, {target}) -> {two_sum(nums, target)}")
+        if streaming.two_sum_stream(iter(nums), target) != two_sum(nums, target):  #same pair, and [] when there is none
+            failures.append(f"two_sum_stream({nums}, {target}) -> {streaming.two_sum_stream(iter(nums), target)}")
+        expected = len(set(nums)) != len(nums)
+        if contains_duplicate(nums) != expected or streaming.contains_duplicate_stream(iter(nums)) != expected:
+            failures.append(f"containsDuplicate({nums}) should be {expected}")
+
+    #numbers read lazily from a file
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "numbers.txt")
+        with open(path, "w") as file:
+            file.write("\n".join(str(n) for n in [4, 8, 15, 16, 23, 42, 8]) + "\n\n")
+        if streaming.two_sum_stream(streaming.read_numbers(path), 38) != [2, 4]:
+            failures.append("two_sum_stream(read_numbers(file), 38) should be [2, 4]")
+        if not streaming.contains_duplicate_stream(streaming.read_numbers(path)):
+            failures.append("contains_duplicate_stream(read_numbers(file)) should find the second 8")
+    return failures, len(cases)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Correctness and linear-scaling checks for two_sum / contains_duplicate")
+    parser.add_argument("--max-size", type=int, default=bench_scaling.SIZES[-1], help="largest input size to time")
+    parser.add_argument("--max-exponent", type=float, default=bench.MAX_EXPONENT)
+    args = parser.parse_args()
+
+    failures, count = check_correctness()
+    print(f"Correctness: {count} inputs, {len(failures)} failure(s)")
+    for failure in failures[:10]:
+        print(f"  {failure}")
+
+    print("\nScaling (worst case, median of 3):")
+    results = bench.run_benchmarks(
+        "scaling/",
+        sizes=lambda sizes: [size for size in sizes if size <= args.max_size],
+        repeats=3, warmup=0, min_time=0,
+        report=lambda name, size, stats: print(f"  {name:<35} {size:>10} {bench.format_time(stats['median']):>10}"),
+    )
+    slow = []
+    unmeasured = []
+    for name, sizes in results.items():
+        exponent = bench.scaling_exponent(sizes)
+        if exponent is None:  #fewer than 2 timed sizes, nothing to fit a line through
+            print(f"  {name:<35} exponent n/a")
+            unmeasured.append(name)
+            continue
+        linear = exponent <= args.max_exponent
+        print(f"  {name:<35} exponent {exponent:.2f} {'ok' if linear else 'NOT LINEAR'}")
+        if not linear:
+            slow.append(name)
+    if unmeasured or not results:
+        print(f"\nCannot check scaling: it needs at least 2 sizes <= --max-size ({args.max_size}) "
+              f"per benchmark, sizes are {bench_scaling.SIZES}")
+    return 1 if failures or slow or unmeasured or not results else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import os
+import re
+import sys
+import importlib.util
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  #the 365 folder
+LEETCODE_DIR = os.path.join(ROOT, "leetcode")
+PYTHON_DIR = os.path.join(ROOT, "python")
+
+# The exercises are plain scripts, not packages, and the leetcode files have
+# names like "4_Best_Time_to_Buy_and_Sell _Stock.py" that cannot be imported
+# normally. They also use List[int] without importing it, because LeetCode
+# provides it. So modules are loaded straight from their file path, with
+# List put into the module before its code runs.
+
+
+#function to load a python file as a module (its folder is on sys.path while it loads, for sibling imports)
+def load_module(path, inject=None):
+    name = "bench_" + re.sub(r"\W", "_", os.path.splitext(os.path.basename(path))[0])
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    module.__dict__.update(inject or {})
+    folder = os.path.dirname(path)
+    sys.path.insert(0, folder)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(folder)
+    sys.modules[name] = module  #so worker processes can find functions from it again
+    return module
+
+
+#function to load leetcode/<number>_*.py -> its module (the Solution class is module.Solution)
+def load_leetcode(number):
+    for filename in sorted(os.listdir(LEETCODE_DIR)):
+        if filename.endswith(".py") and filename.split("_")[0] == str(number):
+            return load_module(os.path.join(LEETCODE_DIR, filename), inject={"List": List})
+    raise FileNotFoundError(f"No leetcode solution numbered {number} in {LEETCODE_DIR}")
+
+
+#function to load an exercise, e.g. load_exercise("Week_2_Functions_And_First_LeetCode", "Day_13", "data_filters.py")
+def load_exercise(*parts):
+    return load_module(os.path.join(PYTHON_DIR, *parts))
@@ -0,0 +1,79 @@
+import os
+import sys
+import glob
+import argparse
+import importlib
+
+import bench
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_FILE = os.path.join(HERE, "results", "latest.json")
+BASELINE_FILE = os.path.join(HERE, "results", "baseline.json")
+
+
+#function to import every bench_*.py next to this file, which registers their benchmarks
+def load_benchmarks():
+    sys.path.insert(0, HERE)
+    for path in sorted(glob.glob(os.path.join(HERE, "bench_*.py"))):
+        importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+
+
+def print_result(name, size, stats):
+    print(f"{name:<45} {size:>10} {bench.format_time(stats['median']):>10} "
+          f"± {bench.format_time(stats['iqr'] / 2):>9}  ({stats['repeats']}x{stats['loops']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the 365 benchmarks and compare them with a baseline")
+    parser.add_argument("-k", "--filter", default="", help="only benchmarks whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="only the smallest two sizes of each benchmark")
+    parser.add_argument("--repeats", type=int, default=bench.REPEATS, help="timed samples per size")
+    parser.add_argument("--save", default=RESULTS_FILE, help="where to write the results JSON")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=bench.THRESHOLD, help="slowdown that counts as a regression (0.10 = 10%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="also save these results as the new baseline")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args()
+
+    load_benchmarks()
+    if args.list:
+        for name, registered in sorted(bench.BENCHMARKS.items()):
+            if args.filter in name:
+                print(f"{name:<45} sizes {registered.sizes}")
+        return 0
+
+    print(f"{'benchmark':<45} {'size':>10} {'median':>10}   {'IQR/2':>9}  (repeats x loops)")
+    results = bench.run_benchmarks(
+        args.filter,
+        sizes=(lambda sizes: sizes[:2]) if args.quick else None,
+        repeats=args.repeats,
+        report=print_result,
+    )
+    if not results:
+        print(f"No benchmark matches '{args.filter}'")
+        return 1
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+    bench.save_results(results, args.save)
+    print(f"\nResults saved to {args.save}")
+    if args.update_baseline:
+        bench.save_results(results, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} yet (run with --update-baseline to create one)")
+        return 0
+    rows = bench.compare_results(results, bench.load_results(args.baseline), args.threshold)
+    regressions = [row for row in rows if row[5] == "REGRESSION"]
+    print(f"\nCompared with {args.baseline}:")
+    for name, size, before, now, ratio, status in rows:
+        if status != "same":
+            change = f"{ratio:.2f}x" if ratio else ""
+            print(f"  {status:<10} {name} [{size}] {bench.format_time(before)} -> {bench.format_time(now)} {change}")
+    print(f"{len(regressions)} regression(s), {sum(row[5] == 'same' for row in rows)} unchanged")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,9 @@
 class Solution:
     def twoSum(self, nums: List[int], target: int) -> List[int]:
-        n=len(nums)  #first we calculated the length of list
-        for number in nums:  #loop around the list
-            i=0
-            while i<n: # while loop from 1st index of list
-                if(number+nums[i]==target): #checking if it matches the targert
-                    if(nums.index(number)!=i): #checking if it is the same index
-                        return[nums.index(number), i] #returning the output
-                i+=1
-
-
-
-
-        
-
-
-
-        
\ No newline at end of file
+        seen={}  #number -> index where we first saw it
+        for i, number in enumerate(nums):  #one pass over the list
+            if target-number in seen:  #its partner came earlier, dict lookup is O(1)
+                return [seen[target-number], i]  #returning the output
+            if number not in seen:
+                seen[number]=i  #stored after the check, so a number is never paired with itself
+        return []
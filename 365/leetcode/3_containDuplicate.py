@@ -1,8 +1,8 @@
 class Solution:
     def containsDuplicate(self, nums: List[int]) -> bool:
+        seen=set()  #numbers we already passed
         for n in nums:
-            for i in range(len(nums)):
-                if(n==nums[i]):
-                    if(nums.index(n)!=i):
-                        return True
-        return False
\ No newline at end of file
+            if n in seen:  #set lookup is O(1), so the whole loop is O(n)
+                return True
+            seen.add(n)
+        return False
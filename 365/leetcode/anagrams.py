@@ -0,0 +1,164 @@
+import os
+import sys
+import time
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy  #optional: counts a whole batch of words at once
+except ImportError:
+    numpy = None
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+SORT_BELOW = 32          #pure Python only: shorter lowercase words are keyed by their sorted letters (see below)
+VECTOR_MIN_WORDS = 1000  #fewer words than this are not worth a NumPy round trip
+VECTOR_BATCH = 20000     #words counted per bincount (26 int64 counts each, so about 4 MB a batch)
+CHUNK_BYTES = 8 * 1024 * 1024  #bytes of the word file one worker groups at a time
+
+# Anagrams have the same letter counts, so the counts are the key ("signature")
+# a word is grouped by:
+#   - lowercase a-z words: 26 counts, as 26 bytes (a tuple if a letter appears
+#     more than 255 times). Counting is O(k) and runs in C.
+#   - anything else: a Counter of the characters after Unicode NFC
+#     normalisation, so "é" typed as one or as two code points is the same letter.
+# Grouping a big list with NumPy counts VECTOR_BATCH words per pass (one
+# bincount over all their letters), so the temporary arrays and keys stay a
+# few MB for any number of words. Without NumPy, 26 str.count calls cost more than sorting a
+# short word in C, so words under SORT_BELOW letters use the sorted letters as
+# their key there; any word longer than that is counted. Anagrams always have
+# the same length and characters, so they always get the same kind of key.
+
+
+#function to check if a word takes the fast a-z path
+def is_lower_ascii(word):
+    return word.isascii() and word.isalpha() and word.islower()
+
+
+#function to get the letter-count signature of a word (equal for anagrams, different otherwise)
+def signature(word):
+    if is_lower_ascii(word):
+        counts = list(map(word.count, LETTERS))
+        return bytes(counts) if len(word) <= 255 else tuple(counts)
+    return frozenset(Counter(unicodedata.normalize("NFC", word)).items())
+
+
+#function to check if t is an anagram of s in O(len) time
+def is_anagram(s, t):
+    if len(s) != len(t) and is_lower_ascii(s):
+        return False  #(after NFC normalisation different lengths can still match, so only a-z can stop here)
+    return signature(s) == signature(t)
+
+
+#function to get the key used for grouping without NumPy
+def python_key(word):
+    if len(word) < SORT_BELOW and is_lower_ascii(word):
+        return "".join(sorted(word))
+    return signature(word)
+
+
+#function to compute the signatures of many a-z words at once -> list of 26-byte keys
+def vector_signatures(words):
+    lengths = numpy.fromiter(map(len, words), dtype=numpy.int64, count=len(words))
+    letters = numpy.frombuffer("".join(words).encode("ascii"), dtype=numpy.uint8) - ord("a")
+    owners = numpy.repeat(numpy.arange(len(words), dtype=numpy.int64), lengths)
+    counts = numpy.bincount(owners * 26 + letters, minlength=len(words) * 26).astype(numpy.uint8)
+    flat = counts.tobytes()
+    return [flat[start:start + 26] for start in range(0, len(flat), 26)]
+
+
+#function to group words into {key: [words]} (keys in order of first appearance)
+def group_by_key(words, vectorized):
+    groups = {}
+    if vectorized:
+        for first in range(0, len(words), VECTOR_BATCH):
+            batch = words[first:first + VECTOR_BATCH]
+            on_fast_path = [len(word) <= 255 and is_lower_ascii(word) for word in batch]
+            fast = [word for word, is_fast in zip(batch, on_fast_path) if is_fast]
+            fast_keys = iter(vector_signatures(fast)) if fast else iter(())
+            for word, is_fast in zip(batch, on_fast_path):
+                key = next(fast_keys) if is_fast else signature(word)
+                if key in groups:
+                    groups[key].append(word)
+                else:
+                    groups[key] = [word]
+        return groups
+
+    for word in words:
+        key = python_key(word)
+        if key in groups:
+            groups[key].append(word)
+        else:
+            groups[key] = [word]
+    return groups
+
+
+#function to group anagrams, like leetcode 6 (groups in order of first appearance)
+def group_anagrams(words):
+    words = list(words)
+    return list(group_by_key(words, numpy is not None and len(words) >= VECTOR_MIN_WORDS).values())
+
+
+#function to group the words in one byte range of a file -> list of (key, words), in order
+def group_range(filename, start, stop, vectorized):
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        text = file.read(stop - start).decode('utf-8')
+    words = [word for word in (line.strip() for line in text.split('\n')) if word]
+    return list(group_by_key(words, vectorized).items())
+
+
+#function to cut a file into byte ranges that each end just after a newline
+def line_ranges(filename, chunk_bytes=CHUNK_BYTES):
+    size = os.path.getsize(filename)
+    ranges = []
+    start = 0
+    with open(filename, 'rb') as file:
+        while start < size:
+            file.seek(min(start + chunk_bytes, size))
+            file.readline()  #finish the line the cut landed in
+            stop = min(file.tell(), size)
+            ranges.append((start, stop))
+            start = stop
+    return ranges
+
+
+#function to group the anagrams in a big word file on several processes, then merge the partial groups
+def group_anagrams_file(filename, workers=None, chunk_bytes=CHUNK_BYTES):
+    workers = workers or os.cpu_count() or 1
+    ranges = line_ranges(filename, chunk_bytes)
+    #one decision for all chunks, so every worker builds the same kind of keys
+    vectorized = numpy is not None
+    groups = {}
+    if workers <= 1 or len(ranges) <= 1:
+        partials = (group_range(filename, start, stop, vectorized) for start, stop in ranges)
+        for partial in partials:
+            merge_groups(groups, partial)
+        return list(groups.values())
+
+    with ProcessPoolExecutor(workers) as pool:
+        partials = pool.map(group_range, [filename] * len(ranges), [a for a, b in ranges], [b for a, b in ranges],
+                            [vectorized] * len(ranges))
+        for partial in partials:  #in file order, so groups keep the order of first appearance
+            merge_groups(groups, partial)
+    return list(groups.values())
+
+
+#function to add one chunk's groups to the running result
+def merge_groups(groups, partial):
+    for key, words in partial:
+        if key in groups:
+            groups[key].extend(words)
+        else:
+            groups[key] = words
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python anagrams.py words.txt [workers]")
+        sys.exit(1)
+    begin = time.perf_counter()
+    found = group_anagrams_file(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    biggest = max(found, key=len) if found else []
+    print(f"{sum(map(len, found))} words in {len(found)} anagram groups ({time.perf_counter() - begin:.1f}s)")
+    print(f"Largest group ({len(biggest)}): {', '.join(biggest[:10])}")
@@ -0,0 +1,34 @@
+# Streaming versions of 1_two_sum and 3_containDuplicate: they take any
+# iterator of numbers (e.g. read_numbers("numbers.txt")), look at each number
+# once, and stop as soon as the answer is known. The input is never turned
+# into a list; only the set / dict of numbers seen so far is kept.
+
+
+#function to read one integer per line from a file, lazily (blank lines skipped)
+def read_numbers(filename):
+    with open(filename, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield int(line)
+
+
+#function to find positions i < j with numbers[i] + numbers[j] == target, [] if there are none (same as twoSum)
+def two_sum_stream(numbers, target):
+    seen = {}
+    for i, number in enumerate(numbers):
+        if target - number in seen:
+            return [seen[target - number], i]
+        if number not in seen:
+            seen[number] = i
+    return []
+
+
+#function to check if any number appears twice; stops reading at the first repeat
+def contains_duplicate_stream(numbers):
+    seen = set()
+    for number in numbers:
+        if number in seen:
+            return True
+        seen.add(number)
+    return False
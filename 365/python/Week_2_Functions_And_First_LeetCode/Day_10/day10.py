@@ -1,92 +1,51 @@
-import os
-import json
+import csv
 
-#function to load expense after program run
+from expense_storage import load_config, open_storage
+from expense_import import import_csv
+from expense_validation import validate_amount, validate_category, validate_date, validate_note
+
+#function to load expense after program run (storage engine chosen in tracker_config.json)
 def load_expense():  
-    if not os.path.exists("expenses.json"):
-        return [] #if doesnot exist then returning empty list
-    
-    try:
-        with open("expenses.json", "r") as file:
-            return json.load(file) 
-        
-    except json.JSONDecodeError:
-        print("Expenses file is corrupted. Starting fresh.")
-        return []
+    return open_storage(load_config())
  
 
-#function to save expenses in the file
+#function to save expenses (json: writes a fresh snapshot, sqlite: commits)
 def save_expenses(expenses):
-    with open("expenses.json","w") as file:  #write mode because we loaded the previous data and then added so need to overrite 
-        json.dump(expenses, file, indent =2)
+    expenses.save()
 
 #function to take input for which feature to apply
 def menu():
     try:
         print("\n----Welcome to Expence Tracker----\n")
-        print("1. Add expense\n2. View all expenses\n3. View by category\n4. Calculate total spent\n5. Exit\n")
-        choice = int(input("Your choice(1/2/3/4/5): "))
-        if choice not in range(1,6):
-            print("Please enter a number between 1 and 5")
+        print("1. Add expense\n2. View all expenses\n3. View by category\n4. View by date range\n"
+              "5. View by category and date range\n6. Calculate total spent\n7. Totals by category and month\n"
+              "8. Import expenses from CSV\n9. Exit\n")
+        choice = int(input("Your choice(1/2/3/4/5/6/7/8/9): "))
+        if choice not in range(1,10):
+            print("Please enter a number between 1 and 9")
             return None
         return choice
     except ValueError:
         print("Invaild input! Please enter a number.")
         return None
 
-#function to validate category
-def validate_category(category):
-    category = category.strip()
-    if not category:
-        raise ValueError("Category cannot be empty!")
-    if len(category) > 50:
-        raise ValueError("Category name too long (max 50 chars)")
-    return category
-
-#function to validate date
-def validate_date(date_str):
-    # Simple format check: YYYY/MM/DD
-    try:
-        year, month, day = date_str.split('/')
-        year, month, day = int(year), int(month), int(day)
-        if not (1 <= day <= 31):
-            raise ValueError("Day must be 1-31")
-        if not (1 <= month <= 12):
-            raise ValueError("Month must be 1-12")
-        if year < 2020 or year > 2030:
-            raise ValueError("Year seems unreasonable")
-        return date_str
-    except ValueError as e:
-        raise ValueError(f"Invalid date format. Use YYYY/MM/DD. Error: {e}")
-
-#function to validate note
-def validate_note(note):
-    note = note.strip()
-    if len(note) > 200:
-        raise ValueError("Note too long (max 200 chars)")
-    return note if note else "No note"
-
 #functin to add expenses on the list
 def add_expense(expenses):
     while True: 
         try: 
             print("Enter your expeses details as follows: \n")
-            amount = float(input("Amount: "))
-            if amount <=0:
-                raise ValueError("Amount must be positive")
+            amount = validate_amount(input("Amount: "))
             
             category = validate_category(input("Category: "))
             date = validate_date(input("Date (YYYY/MM/DD): "))
             note = validate_note(input("Note: "))
 
-            expenses.append({
+            expenses.add({
             "amount" : amount,
             "category" : category,
             "date" : date,
             "note" : note
-            })
-
-            save_expenses(expenses)
+            })  #json: one journal line, sqlite: one INSERT - never a full rewrite
             print("\n Expenses added")
 
             more= input("Want to add more expenses (Y/N): ").lower()
@@ -101,31 +60,85 @@ def view_expense(expenses):
     if not expenses:
         print("No expenses recenlty!!!\n")
     else:
-        for i, e in enumerate(expenses,1):
-            print(f"{i}. Amount: {e['amount']} for Category: {e['category']}, Date: {e['date']}, with a Note: {e['note']}\n")
+        show_expenses(expenses.all())
+
+#function to print (number, expense) pairs
+def show_expenses(found):
+    for i, e in found:
+        print(f"{i}. Amount: {e['amount']} for Category: {e['category']}, Date: {e['date']}, with a Note: {e['note']}\n")
 
-#function to view expenses caategory wise
+#function to view expenses caategory wise (uses the category index instead of scanning the list)
 def view_category(expenses):
     if not expenses:
         print("No expenses recenlty!!!\n")
     else:
-        cat= input("Enter the category!!!").lower()
-        found= False
-        for i, e in enumerate(expenses,1):
-            if(e["category"].lower()==cat):
-                print(f"{i}. Amount: {e['amount']} for Category: {e['category']}, Date: {e['date']}, with a Note: {e['note']}\n")
-                found=True
-        if not found:
+        found = expenses.by_category(input("Enter the category!!!"))
+        if found:
+            show_expenses(found)
+        else:
             print("No category found!!!\n")
 
-#function to calculate total expenses
+#function to ask for a date range, empty input means no limit on that side
+def input_date_range():
+    start = input("From date (YYYY/MM/DD, empty for no limit): ").strip()
+    end = input("To date (YYYY/MM/DD, empty for no limit): ").strip()
+    return (validate_date(start) if start else None), (validate_date(end) if end else None)
+
+#function to view expenses between two dates, optionally for one category
+def view_date_range(expenses, with_category=False):
+    if not expenses:
+        print("No expenses recenlty!!!\n")
+        return
+    try:
+        category = input("Enter the category!!!") if with_category else None
+        start, end = input_date_range()
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    found = expenses.by_date_range(start, end, category)
+    if found:
+        show_expenses(found)
+    else:
+        print("No expenses found for that filter!!!\n")
+
+#function to calculate total expenses (kept up to date on every add, exact to the cent)
 def calcu_total(expenses):
     if not expenses:
         print("No expenses recenlty!!!\n")
     else:
-        total = sum(e["amount"] for e in expenses)
+        total = expenses.total()
         print(f"The total amount according to expeneses list is: {total}")
 
+#function to show totals per category and per month (computed by the storage engine)
+def view_totals(expenses):
+    if not expenses:
+        print("No expenses recenlty!!!\n")
+    else:
+        print("Totals by category:")
+        for category, total in expenses.totals_by_category().items():
+            print(f"  {category}: {total}")
+        print("Totals by month:")
+        for month, total in expenses.totals_by_month().items():
+            print(f"  {month}: {total}")
+        print("Totals by category and month:")
+        for category, months in expenses.totals_by_category_month().items():
+            for month, total in months.items():
+                print(f"  {category} {month}: {total}")
+
+#function to import a bank statement csv (amount, category, date and optional note columns)
+def import_expenses(expenses):
+    path = input("CSV file: ").strip()
+    negative = input("Are expenses negative numbers in this file (Y/N): ").lower() == "y"
+    try:
+        imported, rejected, error_file = import_csv(expenses, path, negative_debits=negative)
+    except (OSError, ValueError, csv.Error) as e:  #csv.Error: even the header line cannot be read
+        print(f"Error: {e}")
+        return
+    print(f"\n Imported {imported} expenses, rejected {rejected}")
+    if error_file:
+        print(f"Rejected rows and reasons are in {error_file}")
+
 
 def main():
     expenses = load_expense()
@@ -139,14 +152,23 @@ def main():
             case 3:
                 view_category(expenses)
             case 4:
-                calcu_total(expenses)
+                view_date_range(expenses)
             case 5:
+                view_date_range(expenses, with_category=True)
+            case 6:
+                calcu_total(expenses)
+            case 7:
+                view_totals(expenses)
+            case 8:
+                import_expenses(expenses)
+            case 9:
                 break
             case _:
                 print("Wrong Input please cleary state next time!!!\n")
         more_1 = input("Want again to proceed(Y/N): ").lower()
         if more_1 != "y":
             break
+    expenses.close()
 
 if __name__ == "__main__":
     main()
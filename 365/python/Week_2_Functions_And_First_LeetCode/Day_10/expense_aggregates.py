@@ -0,0 +1,106 @@
+import os
+import json
+from decimal import Decimal
+
+from expense_index import date_key
+
+AGGREGATES_FILE = "expenses.aggregates.json"
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+
+# Running totals kept next to the expenses, so reports never re-add the history:
+#   {"count": expenses covered,
+#    "total": grand total,
+#    "months": {"2026/01": total},
+#    "categories": {casefolded name: {"name": as first typed, "total": total, "months": {"2026/01": total}}}}
+# All money is Decimal rounded to cents, so totals are exact (no float drift).
+
+
+#function to turn an amount (float or string) into exact money
+def money(amount):
+    return Decimal(str(amount)).quantize(CENT)
+
+
+#function to get the "YYYY/MM" month of a "YYYY/MM/DD" date
+def month_of(date_str):
+    month = (date_key(date_str) or 0) // 100
+    return f"{month // 100}/{month % 100:02d}"
+
+
+#function to create empty aggregates
+def new_aggregates():
+    return {"count": 0, "total": ZERO, "months": {}, "categories": {}}
+
+
+#function to add one expense to the aggregates - a fixed number of dict updates, O(1)
+def add_to_aggregates(aggregates, expense):
+    amount = money(expense["amount"])
+    month = month_of(expense["date"])
+    key = expense["category"].casefold()
+    if key not in aggregates["categories"]:
+        aggregates["categories"][key] = {"name": expense["category"], "total": ZERO, "months": {}}
+    category = aggregates["categories"][key]
+
+    aggregates["count"] += 1
+    aggregates["total"] += amount
+    aggregates["months"][month] = aggregates["months"].get(month, ZERO) + amount
+    category["total"] += amount
+    category["months"][month] = category["months"].get(month, ZERO) + amount
+
+
+#function to compute aggregates from scratch (only needed when the saved file is missing or stale)
+def build_aggregates(expenses):
+    aggregates = new_aggregates()
+    for expense in expenses:
+        add_to_aggregates(aggregates, expense)
+    return aggregates
+
+
+#function to save aggregates (money as strings, so nothing is lost to float)
+def save_aggregates(aggregates, aggregates_file=AGGREGATES_FILE):
+    data = {
+        "count": aggregates["count"],
+        "total": str(aggregates["total"]),
+        "months": {month: str(total) for month, total in aggregates["months"].items()},
+        "categories": {
+            key: {
+                "name": category["name"],
+                "total": str(category["total"]),
+                "months": {month: str(total) for month, total in category["months"].items()},
+            }
+            for key, category in aggregates["categories"].items()
+        },
+    }
+    temp_file = aggregates_file + ".tmp"
+    with open(temp_file, "w") as file:
+        json.dump(data, file)
+    os.replace(temp_file, aggregates_file)
+
+
+#function to load saved aggregates and catch up on expenses added after they were saved
+def load_aggregates(expenses, aggregates_file=AGGREGATES_FILE):
+    try:
+        with open(aggregates_file, "r") as file:
+            data = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return build_aggregates(expenses)
+
+    if data["count"] > len(expenses):
+        return build_aggregates(expenses)  #saved for data we no longer have, start over
+
+    aggregates = {
+        "count": data["count"],
+        "total": Decimal(data["total"]),
+        "months": {month: Decimal(total) for month, total in data["months"].items()},
+        "categories": {
+            key: {
+                "name": category["name"],
+                "total": Decimal(category["total"]),
+                "months": {month: Decimal(total) for month, total in category["months"].items()},
+            }
+            for key, category in data["categories"].items()
+        },
+    }
+    for expense in expenses[aggregates["count"]:]:
+        add_to_aggregates(aggregates, expense)
+    return aggregates
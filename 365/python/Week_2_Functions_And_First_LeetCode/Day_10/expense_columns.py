@@ -0,0 +1,248 @@
+import sys
+import time
+import random
+import tracemalloc
+from array import array
+
+from expense_index import date_key
+from expense_aggregates import money
+
+try:
+    import numpy  #optional: reductions and filters run as array operations when it is installed
+except ImportError:
+    numpy = None
+
+# Expenses stored column by column instead of one dict per expense:
+#   amounts    -> array of int64 cents (exact money, 8 bytes each)
+#   categories -> array of uint32 codes into category_names (each name stored once)
+#   days       -> array of int32 YYYYMMDD (same date key as the indexes and SQLite)
+#   notes      -> array of uint32 codes into note_names ("No note" is stored once, not a million times)
+# Expense number i lives at position i in every column, so an expense costs
+# about 20 bytes instead of a dict with four strings (hundreds of bytes).
+# Dates that were not typed as YYYY/MM/DD (e.g. "2026/1/5") keep the typed
+# text in odd_dates, and amounts that are not whole cents (12.345) keep the
+# typed value in odd_amounts, so reading an expense back (and saving it) gives
+# exactly what was added. The sums still use the column, rounded to the cent
+# like every engine's aggregates.
+
+
+class ExpenseColumns:
+    """A list of expenses kept as typed columns. Indexing and iterating give the usual dicts."""
+
+    def __init__(self, expenses=()):
+        self.amounts = array("q")
+        self.categories = array("I")
+        self.days = array("i")
+        self.notes = array("I")
+        self.category_names = []
+        self.category_codes = {}
+        self.note_names = []
+        self.note_codes = {}
+        self.odd_dates = {}
+        self.odd_amounts = {}
+        self.extend(expenses)
+
+    def __len__(self):
+        return len(self.amounts)
+
+    #function to turn a string into its code in a string table, adding it the first time
+    @staticmethod
+    def _intern(value, names, codes):
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+
+    def append(self, expense):
+        position = len(self.amounts)
+        day = date_key(expense["date"]) or 0
+        cents = int(money(expense["amount"]) * 100)
+        self.amounts.append(cents)
+        self.categories.append(self._intern(expense["category"], self.category_names, self.category_codes))
+        self.days.append(day)
+        self.notes.append(self._intern(expense["note"], self.note_names, self.note_codes))
+        if self._date(day) != expense["date"]:
+            self.odd_dates[position] = expense["date"]
+        if not (isinstance(expense["amount"], float) and cents / 100 == expense["amount"]):
+            self.odd_amounts[position] = expense["amount"]
+
+    def extend(self, expenses):
+        for expense in expenses:
+            self.append(expense)
+
+    @staticmethod
+    def _date(day):
+        return f"{day // 10000:04d}/{day // 100 % 100:02d}/{day % 100:02d}"
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        return {
+            "amount": self.odd_amounts.get(position, self.amounts[position] / 100),
+            "category": self.category_names[self.categories[position]],
+            "date": self.odd_dates.get(position) or self._date(self.days[position]),
+            "note": self.note_names[self.notes[position]],
+        }
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+    #function to get the codes of every spelling of a category ("Food", "food", ...)
+    def category_codes_for(self, category):
+        key = category.strip().casefold()
+        return [code for code, name in enumerate(self.category_names) if name.casefold() == key]
+
+    #function to find positions by date range and/or category, ordered by date (then by position)
+    def find(self, start=None, end=None, category=None):
+        low = date_key(start) if start else None
+        high = date_key(end) if end else None
+        codes = self.category_codes_for(category) if category is not None else None
+        if codes == []:
+            return []
+
+        if numpy is not None:
+            days = numpy.frombuffer(self.days, dtype=numpy.int32)
+            mask = numpy.ones(len(days), dtype=bool)
+            if low is not None:
+                mask &= days >= low
+            if high is not None:
+                mask &= days <= high
+            if codes is not None:
+                mask &= numpy.isin(numpy.frombuffer(self.categories, dtype=numpy.uint32), codes)
+            positions = numpy.flatnonzero(mask)
+            order = numpy.argsort(days[positions], kind="stable")
+            return positions[order].tolist()
+
+        codes = set(codes) if codes is not None else None
+        positions = [
+            position for position, (day, code) in enumerate(zip(self.days, self.categories))
+            if (low is None or day >= low) and (high is None or day <= high) and (codes is None or code in codes)
+        ]
+        positions.sort(key=self.days.__getitem__)  #stable sort keeps equal dates in the order they were added
+        return positions
+
+    #function to sum cents, optionally per category code and/or per YYYYMM month -> {(code, month): cents}
+    #(a part that is not grouped on is None in the key; no grouping gives {(None, None): total})
+    def sum_cents(self, by_category=False, by_month=False):
+        if not len(self):
+            return {}
+        if numpy is not None:
+            return self._sum_cents_numpy(by_category, by_month)
+
+        if not by_category and not by_month:
+            return {(None, None): sum(self.amounts)}
+        if not by_month:
+            sums = [0] * len(self.category_names)
+            for code, cents in zip(self.categories, self.amounts):
+                sums[code] += cents
+            return {(code, None): cents for code, cents in enumerate(sums) if cents}
+        sums = {}
+        if not by_category:
+            for day, cents in zip(self.days, self.amounts):
+                sums[day // 100] = sums.get(day // 100, 0) + cents
+            return {(None, month): cents for month, cents in sums.items()}
+        for code, day, cents in zip(self.categories, self.days, self.amounts):
+            key = (code, day // 100)
+            sums[key] = sums.get(key, 0) + cents
+        return sums
+
+    def _sum_cents_numpy(self, by_category, by_month):
+        amounts = numpy.frombuffer(self.amounts, dtype=numpy.int64)
+        if not by_category and not by_month:
+            return {(None, None): int(amounts.sum())}
+
+        #one small group number per expense: code * number of months + month number
+        codes = numpy.frombuffer(self.categories, dtype=numpy.uint32).astype(numpy.int64) if by_category else 0
+        months = 1
+        month_numbers = 0
+        if by_month:
+            days = numpy.frombuffer(self.days, dtype=numpy.int32).astype(numpy.int64)
+            month_numbers = days // 10000 * 13 + days // 100 % 100  #13 per year: month 0 is an unreadable date
+            first = int(month_numbers.min())
+            month_numbers = month_numbers - first
+            months = int(month_numbers.max()) + 1
+        groups = codes * months + month_numbers
+        size = (len(self.category_names) if by_category else 1) * months
+
+        #bincount adds in float64, which is exact for whole cents up to 2**53 (about 90 trillion)
+        counts = numpy.bincount(groups, minlength=size)
+        sums = numpy.rint(numpy.bincount(groups, weights=amounts, minlength=size)).astype(numpy.int64)
+        totals = {}
+        for group in numpy.flatnonzero(counts).tolist():
+            code, number = divmod(group, months)
+            month = None
+            if by_month:
+                year, month = divmod(number + first, 13)
+                month = year * 100 + month
+            totals[(code if by_category else None, month)] = int(sums[group])
+        return totals
+
+
+#function to measure bytes per expense and scan time for dicts vs columns
+def compare(count=1_000_000, seed=7):
+    rng = random.Random(seed)
+    names = ["Food", "Rent", "Travel", "Bills", "Fun", "Health", "food"]
+    notes = ["No note", "lunch", "bus ticket", "groceries"]
+
+    def make():
+        return [
+            {"amount": rng.randint(1, 50000) / 100, "category": rng.choice(names),
+             "date": f"2025/{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}", "note": rng.choice(notes)}
+            for _ in range(count)
+        ]
+
+    tracemalloc.start()
+    expenses = make()
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    columns = ExpenseColumns(make())  #same random data, the temporary dicts are freed after conversion
+    column_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def timed(function):
+        start = time.perf_counter()
+        function()
+        return time.perf_counter() - start
+
+    #the dict side is the plain loop over the list that day10.py used before the indexes and aggregates
+    def totals_by_category():
+        totals = {}
+        for e in expenses:
+            totals[e["category"]] = totals.get(e["category"], 0) + e["amount"]
+        return totals
+
+    scans = {
+        "total": (
+            lambda: sum(e["amount"] for e in expenses),
+            lambda: columns.sum_cents(),
+        ),
+        "category": (
+            lambda: [i for i, e in enumerate(expenses) if e["category"].casefold() == "food"],
+            lambda: columns.find(category="food"),
+        ),
+        "date range": (
+            lambda: [i for i, e in enumerate(expenses) if 20250301 <= date_key(e["date"]) <= 20250331],
+            lambda: columns.find("2025/03/01", "2025/03/31"),
+        ),
+        "totals by category": (
+            totals_by_category,
+            lambda: columns.sum_cents(by_category=True),
+        ),
+    }
+
+    print(f"{count} expenses ({'numpy' if numpy is not None else 'pure Python'} reductions)")
+    print(f"  memory: dicts {dict_bytes / count:.0f} bytes/expense, columns {column_bytes / count:.0f} bytes/expense")
+    for name, (with_dicts, with_columns) in scans.items():
+        dicts_time, columns_time = timed(with_dicts), timed(with_columns)
+        print(f"  {name}: dicts {dicts_time * 1000:.0f} ms, columns {columns_time * 1000:.0f} ms "
+              f"({dicts_time / columns_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    compare(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,170 @@
+import os
+import csv
+import sys
+import time
+from itertools import islice
+
+from expense_validation import validate_amount, validate_category, validate_date, validate_note
+
+CHUNK_ROWS = 50000  #rows read, validated and committed at a time
+
+#accepted header names (case-insensitive) for each field; note is optional
+COLUMNS = {
+    "amount": ("amount", "value", "debit"),
+    "category": ("category", "type"),
+    "date": ("date", "transaction date", "booking date"),
+    "note": ("note", "description", "memo", "details"),
+}
+
+# Validation works a column at a time. Dates, categories and amounts repeat a
+# lot in a statement, so each distinct value is checked once per chunk and
+# the result is looked up for every row. The checks are the validators from
+# expense_validation.py that day10.py uses when an expense is typed in, so an
+# imported expense follows exactly the same rules. The only extra step is
+# reading the amount: thousands separators ("1,250.00") are dropped and, for
+# statements that list debits as negative numbers, the sign is flipped first.
+
+
+#function to find which csv column holds each field
+def map_header(header):
+    names = [name.strip().lower() for name in header]
+    mapping = {}
+    for field, aliases in COLUMNS.items():
+        for alias in aliases:
+            if alias in names:
+                mapping[field] = names.index(alias)
+                break
+    missing = [field for field in ("amount", "category", "date") if field not in mapping]
+    if missing:
+        raise ValueError(f"CSV header has no column for: {', '.join(missing)}")
+    return mapping
+
+
+#function to turn a validator (returns the value or raises ValueError) into a check -> (value, None) or (None, reason)
+def as_check(validate):
+    def check(value):
+        try:
+            return validate(value), None
+        except ValueError as e:
+            return None, str(e)
+    return check
+
+
+#function to read a statement amount and validate it like a typed one
+def read_amount(value, negative_debits=False):
+    amount = float(value.strip().replace(",", ""))
+    return validate_amount(-amount if negative_debits else amount)
+
+
+#function to check a whole column, each distinct value only once
+def check_column(column, check):
+    results = {value: check(value) for value in set(column)}
+    return [results[value] for value in column]
+
+
+#function to read csv rows; a row the csv module cannot parse (NUL byte, huge field) comes out as its csv.Error
+def read_rows(reader):
+    while True:
+        try:
+            yield next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            yield e
+
+
+#function to validate one chunk of rows -> (valid expenses, [(row, reason)])
+def validate_chunk(rows, mapping, width, negative_debits=False):
+    errors = []
+    complete = []
+    for row in rows:
+        if isinstance(row, csv.Error):
+            errors.append((row, f"unreadable row: {row}"))
+        elif len(row) != width:
+            errors.append((row, f"expected {width} columns, got {len(row)}"))
+        else:
+            complete.append(row)
+    if not complete:
+        return [], errors
+
+    columns = list(zip(*complete))
+    amounts = check_column(columns[mapping["amount"]], as_check(lambda value: read_amount(value, negative_debits)))
+    categories = check_column(columns[mapping["category"]], as_check(validate_category))
+    dates = check_column(columns[mapping["date"]], as_check(validate_date))
+    if "note" in mapping:
+        notes = check_column(columns[mapping["note"]], as_check(validate_note))
+    else:
+        notes = [(validate_note(""), None)] * len(complete)
+
+    valid = []
+    for row, *checked in zip(complete, amounts, categories, dates, notes):
+        reasons = [reason for value, reason in checked if reason]
+        if reasons:
+            errors.append((row, "; ".join(reasons)))
+        else:
+            amount, category, date, note = (value for value, reason in checked)
+            valid.append({"amount": amount, "category": category, "date": date, "note": note})
+    return valid, errors
+
+
+#function to import a csv statement into the storage, chunk by chunk
+def import_csv(storage, csv_file, error_file=None, negative_debits=False, chunk_rows=CHUNK_ROWS):
+    error_file = error_file or csv_file + ".errors.csv"
+    imported = 0
+    rejected = 0
+
+    with open(csv_file, "r", newline="", encoding="utf-8-sig") as source, \
+         open(error_file, "w", newline="", encoding="utf-8") as errors_out:
+        reader = csv.reader(source)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("CSV file is empty")
+        mapping = map_header(header)
+
+        rows_in = read_rows(reader)
+        error_writer = csv.writer(errors_out)
+        error_writer.writerow(["line", "reason"] + header)
+
+        line = 1  #header line
+        while True:
+            rows = list(islice(rows_in, chunk_rows))
+            if not rows:
+                break
+            first_line = line + 1
+            line += len(rows)
+
+            valid, errors = validate_chunk(rows, mapping, len(header), negative_debits)
+            if valid:
+                storage.add_many(valid)  #one transaction / one journal write per chunk
+            imported += len(valid)
+            rejected += len(errors)
+
+            #error rows keep their line number so they are easy to fix in the original file
+            positions = {id(row): first_line + i for i, row in enumerate(rows)}
+            numbered = sorted((positions[id(row)], reason, row) for row, reason in errors)
+            error_writer.writerows([number, reason] + (row if isinstance(row, list) else [])
+                                   for number, reason, row in numbered)
+
+    if rejected == 0:
+        os.remove(error_file)
+        error_file = None
+    return imported, rejected, error_file
+
+
+def main():
+    from expense_storage import load_config, open_storage
+
+    if len(sys.argv) < 2:
+        print("Usage: python expense_import.py statement.csv [--negative-debits]")
+        return
+    storage = open_storage(load_config())
+    start = time.perf_counter()
+    imported, rejected, error_file = import_csv(storage, sys.argv[1], negative_debits="--negative-debits" in sys.argv)
+    storage.close()
+    print(f"Imported {imported} expenses in {time.perf_counter() - start:.1f}s, rejected {rejected}.")
+    if error_file:
+        print(f"Rejected rows and reasons are in {error_file}")
+
+
+if __name__ == "__main__":
+    main()
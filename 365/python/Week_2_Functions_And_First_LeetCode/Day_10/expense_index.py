@@ -0,0 +1,101 @@
+from bisect import bisect_left, bisect_right
+from heapq import merge
+
+# In-memory indexes over the expense list, built once at load and kept up to
+# date on every add. Each index is a pair of parallel lists sorted by date:
+#   keys      -> date as an int YYYYMMDD (so plain int compares give date order)
+#   positions -> position of that expense in the expense list
+# index["all"] covers every expense, index["categories"][casefolded name]
+# covers one category. A date-range query is two bisects plus the k matches.
+
+
+#function to turn "YYYY/MM/DD" (also "2026/1/5") into a sortable int, None if it cannot be read
+def date_key(date_str):
+    try:
+        year, month, day = date_str.split('/')
+        return int(year) * 10000 + int(month) * 100 + int(day)
+    except (ValueError, AttributeError):
+        return None
+
+
+#function to add one expense (at position in the list) to the indexes
+def index_expense(index, expense, position):
+    key = date_key(expense["date"])
+    if key is None:
+        key = 0  #unreadable dates sort first so they are still found by category
+    category = expense["category"].casefold()
+    if category not in index["categories"]:
+        index["categories"][category] = ([], [])
+
+    for keys, positions in (index["all"], index["categories"][category]):
+        if not keys or key >= keys[-1]:
+            #new expenses are usually the latest ones, so this is the common case
+            keys.append(key)
+            positions.append(position)
+        else:
+            at = bisect_right(keys, key)
+            keys.insert(at, key)
+            positions.insert(at, position)
+
+
+#function to add a batch of expenses (positions start.. in the list) to the indexes
+def index_expenses(index, expenses, start):
+    #sort the batch once, then merge it into each sorted list in one linear pass
+    #(inserting a big batch of random dates one by one would shift the lists every time)
+    batch = build_index(expenses[start:])
+    for category, (keys, positions) in batch["categories"].items():
+        if category not in index["categories"]:
+            index["categories"][category] = ([], [])
+        _merge(index["categories"][category], keys, positions, start)
+    _merge(index["all"], *batch["all"], start)
+
+
+#function to merge sorted keys/positions (positions relative to offset) into an index pair
+def _merge(pair, keys, positions, offset):
+    old_keys, old_positions = pair
+    if not keys:
+        return  #empty batch: nothing to merge
+    if not old_keys or keys[0] >= old_keys[-1]:
+        old_keys.extend(keys)
+        old_positions.extend(position + offset for position in positions)
+        return
+    merged = list(merge(zip(old_keys, old_positions), zip(keys, (position + offset for position in positions))))
+    old_keys[:] = [key for key, position in merged]
+    old_positions[:] = [position for key, position in merged]
+
+
+#function to build the indexes for a whole expense list
+def build_index(expenses):
+    index = {"all": ([], []), "categories": {}}
+    all_keys, all_positions = index["all"]
+
+    #sort once, then every key can simply be appended in order
+    keys = [date_key(e["date"]) or 0 for e in expenses]
+    for position in sorted(range(len(expenses)), key=keys.__getitem__):
+        category = expenses[position]["category"].casefold()
+        if category not in index["categories"]:
+            index["categories"][category] = ([], [])
+        cat_keys, cat_positions = index["categories"][category]
+
+        all_keys.append(keys[position])
+        all_positions.append(position)
+        cat_keys.append(keys[position])
+        cat_positions.append(position)
+    return index
+
+
+#function to find positions with a date between start and end (inclusive), optionally in one category
+def find_by_date_range(index, start, end, category=None):
+    if category is None:
+        keys, positions = index["all"]
+    else:
+        keys, positions = index["categories"].get(category.strip().casefold(), ([], []))
+
+    low = bisect_left(keys, date_key(start)) if start else 0
+    high = bisect_right(keys, date_key(end)) if end else len(keys)
+    return positions[low:high]
+
+
+#function to find positions of one category (case-insensitive), ordered by date
+def find_by_category(index, category):
+    return find_by_date_range(index, None, None, category)
@@ -0,0 +1,124 @@
+import os
+import json
+
+SNAPSHOT_FILE = "expenses.json"            #full list of expenses (same format as before)
+JOURNAL_FILE = "expenses.journal.jsonl"    #one JSON line per expense added since the snapshot
+COMPACT_BYTES = 64 * 1024                  #fold the journal into the snapshot once it grows past this...
+                                           #...and past the snapshot size, so big imports aren't rewritten over and over
+EXPENSE_KEYS = ("amount", "category", "date", "note")
+
+# Every journal line is {"id": position in the list, "expense": {...}}.
+# Expenses are only ever appended, so an entry whose id is already inside
+# the snapshot was compacted before and is skipped on replay. That keeps a
+# crash between writing the snapshot and emptying the journal harmless.
+
+
+#function to load the snapshot, keeping a corrupted file instead of overwriting it later
+def load_snapshot(snapshot_file=SNAPSHOT_FILE):
+    if not os.path.exists(snapshot_file):
+        return []
+
+    try:
+        with open(snapshot_file, "r") as file:
+            return json.load(file)
+
+    except json.JSONDecodeError:
+        backup = f"{snapshot_file}.corrupt"
+        os.replace(snapshot_file, backup)
+        print(f"Expenses file is corrupted. It was moved to {backup}; loading the journal only.")
+        return []
+
+
+#function to check that a decoded journal line is {"id": int, "expense": {amount, category, date, note}}
+def is_journal_entry(entry):
+    if not isinstance(entry, dict):
+        return False
+    position, expense = entry.get("id"), entry.get("expense")
+    return (isinstance(position, int) and not isinstance(position, bool) and position >= 0
+            and isinstance(expense, dict) and all(key in expense for key in EXPENSE_KEYS))
+
+
+#function to replay the journal on top of the snapshot
+def replay_journal(expenses, journal_file=JOURNAL_FILE):
+    if not os.path.exists(journal_file):
+        return expenses
+
+    good_end = 0  #byte offset just after the last complete line
+    skipped = 0
+    with open(journal_file, "rb") as file:
+        for line in file:
+            if not line.endswith(b"\n"):
+                break  #torn last line: the program stopped halfway through a write
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                entry = None
+            if not is_journal_entry(entry):
+                skipped += 1  #valid JSON of the wrong shape is just as unreadable
+                good_end += len(line)
+                continue
+            if entry["id"] >= len(expenses):
+                expenses.append(entry["expense"])
+            good_end += len(line)
+
+    if good_end < os.path.getsize(journal_file):
+        #drop the torn line so the next append starts on a fresh line
+        with open(journal_file, "r+b") as file:
+            file.truncate(good_end)
+        print("Recovered from a partially written expense (the last, unfinished entry was dropped).")
+    if skipped:
+        print(f"Skipped {skipped} unreadable journal line(s).")
+
+    return expenses
+
+
+#function to load expenses from snapshot + journal
+def load_expenses(snapshot_file=SNAPSHOT_FILE, journal_file=JOURNAL_FILE):
+    return replay_journal(load_snapshot(snapshot_file), journal_file)
+
+
+#function to append one expense with a single write (and fsync so it survives a crash)
+def append_expense(expenses, expense, journal_file=JOURNAL_FILE, snapshot_file=SNAPSHOT_FILE, sync=True):
+    line = json.dumps({"id": len(expenses), "expense": expense}) + "\n"
+    with open(journal_file, "a") as file:
+        file.write(line)
+        file.flush()
+        if sync:
+            os.fsync(file.fileno())
+    expenses.append(expense)
+    compact_if_needed(expenses, snapshot_file, journal_file)
+
+
+#function to append many expenses with one write and one fsync (bulk imports)
+def append_expenses(expenses, new_expenses, journal_file=JOURNAL_FILE, snapshot_file=SNAPSHOT_FILE):
+    start = len(expenses)
+    lines = [json.dumps({"id": start + i, "expense": expense}) + "\n" for i, expense in enumerate(new_expenses)]
+    with open(journal_file, "a") as file:
+        file.write("".join(lines))
+        file.flush()
+        os.fsync(file.fileno())
+    expenses.extend(new_expenses)
+    compact_if_needed(expenses, snapshot_file, journal_file)
+
+
+#function to compact once the journal is big enough to be worth it
+def compact_if_needed(expenses, snapshot_file=SNAPSHOT_FILE, journal_file=JOURNAL_FILE):
+    snapshot_size = os.path.getsize(snapshot_file) if os.path.exists(snapshot_file) else 0
+    #waiting until the journal is as big as the snapshot keeps the total bytes written linear
+    if os.path.getsize(journal_file) >= max(COMPACT_BYTES, snapshot_size):
+        compact(expenses, snapshot_file, journal_file)
+
+
+#function to write the full list as a new snapshot and empty the journal
+def compact(expenses, snapshot_file=SNAPSHOT_FILE, journal_file=JOURNAL_FILE):
+    temp_file = snapshot_file + ".tmp"
+    with open(temp_file, "w") as file:
+        #one expense per line: still a JSON list, but each item goes through the fast C encoder
+        #(json.dump with indent falls back to the pure Python one, which is slow for big lists)
+        file.write("[\n" + ",\n".join(json.dumps(expense) for expense in expenses) + "\n]\n")
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_file, snapshot_file)  #atomic: readers see the old or the new snapshot, never half of one
+
+    #the snapshot now holds every journal entry, so the journal can start over
+    open(journal_file, "w").close()
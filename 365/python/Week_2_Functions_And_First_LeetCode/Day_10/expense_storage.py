@@ -0,0 +1,333 @@
+import os
+import json
+import sqlite3
+from decimal import Decimal
+
+from expense_journal import (load_expenses, load_snapshot, replay_journal, append_expense, append_expenses,
+                             compact, SNAPSHOT_FILE, JOURNAL_FILE)
+from expense_index import build_index, index_expense, index_expenses, find_by_category, find_by_date_range, date_key
+from expense_aggregates import (AGGREGATES_FILE, money, add_to_aggregates,
+                                load_aggregates, save_aggregates)
+from expense_columns import ExpenseColumns
+
+CONFIG_FILE = "tracker_config.json"
+DEFAULT_CONFIG = {
+    "storage": "json",            #"json" (expenses.json + journal), "columnar" (same files, compact in memory) or "sqlite"
+    "sqlite_path": "expenses.db",
+}
+INSERT_BATCH = 1000  #rows per executemany call when adding many expenses
+SCHEMA_VERSION = 2   #1: migrated from expenses.json, 2: aggregates table
+ALL = ""             #aggregates.category_key for "every category"
+ALL_MONTHS = -1      #aggregates.month for "every month"
+
+
+#function to read the tracker config, falling back to the defaults for anything missing
+def load_config(config_file=CONFIG_FILE):
+    config = dict(DEFAULT_CONFIG)
+    if os.path.exists(config_file):
+        with open(config_file, "r") as file:
+            config.update(json.load(file))
+    return config
+
+
+#function to open the storage engine chosen in the config
+def open_storage(config):
+    if config["storage"] == "sqlite":
+        return SqliteStorage(config["sqlite_path"])
+    if config["storage"] == "json":
+        return JsonStorage()
+    if config["storage"] == "columnar":
+        return ColumnarStorage()
+    raise ValueError(f"Unknown storage '{config['storage']}' (use 'json', 'columnar' or 'sqlite')")
+
+
+# All engines have the same methods, so day10.py does not care which one it got.
+# Lookups return (number, expense) pairs; number is what the menu shows.
+# Totals are Decimal and come from running aggregates, never from re-adding the history.
+# The columnar engine is the json engine with the list swapped for columns, so
+# it shares the aggregates, totals, save and close of JsonStorage.
+
+
+class JsonStorage:
+    """Expenses in memory, saved as expenses.json + an append-only journal."""
+
+    def __init__(self, snapshot_file=SNAPSHOT_FILE, journal_file=JOURNAL_FILE, aggregates_file=AGGREGATES_FILE):
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.aggregates_file = aggregates_file
+        self.expenses = load_expenses(snapshot_file, journal_file)
+        self.index = build_index(self.expenses)  #built once, then updated by add
+        self.aggregates = load_aggregates(self.expenses, aggregates_file)  #only replays what was added since the last save
+
+    def __len__(self):
+        return len(self.expenses)
+
+    def add(self, expense):
+        append_expense(self.expenses, expense, self.journal_file, self.snapshot_file)
+        index_expense(self.index, expense, len(self.expenses) - 1)
+        add_to_aggregates(self.aggregates, expense)
+
+    def add_many(self, expenses):
+        start = len(self.expenses)
+        append_expenses(self.expenses, expenses, self.journal_file, self.snapshot_file)  #one write + fsync per batch
+        index_expenses(self.index, self.expenses, start)  #one sort + merge per batch
+        for expense in expenses:
+            add_to_aggregates(self.aggregates, expense)
+
+    def all(self):
+        return list(enumerate(self.expenses, 1))
+
+    def _numbered(self, positions):
+        return [(i + 1, self.expenses[i]) for i in positions]
+
+    def by_category(self, category):
+        return self._numbered(find_by_category(self.index, category))
+
+    def by_date_range(self, start, end, category=None):
+        return self._numbered(find_by_date_range(self.index, start, end, category))
+
+    def total(self):
+        return self.aggregates["total"]
+
+    def totals_by_category(self):
+        categories = self.aggregates["categories"]
+        return {categories[key]["name"]: categories[key]["total"] for key in sorted(categories)}
+
+    def totals_by_month(self):
+        return dict(sorted(self.aggregates["months"].items()))
+
+    def totals_by_category_month(self):
+        categories = self.aggregates["categories"]
+        return {categories[key]["name"]: dict(sorted(categories[key]["months"].items())) for key in sorted(categories)}
+
+    def save(self):
+        compact(self.expenses, self.snapshot_file, self.journal_file)
+        save_aggregates(self.aggregates, self.aggregates_file)
+
+    def close(self):
+        save_aggregates(self.aggregates, self.aggregates_file)  #small file, saves replaying the journal next time
+
+
+class ColumnarStorage(JsonStorage):
+    """Expenses in typed columns (see expense_columns.py), saved in the same files as JsonStorage."""
+
+    def __init__(self, snapshot_file=SNAPSHOT_FILE, journal_file=JOURNAL_FILE, aggregates_file=AGGREGATES_FILE):
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.aggregates_file = aggregates_file
+        #the snapshot's dicts are only alive while they are copied into the columns
+        self.expenses = replay_journal(ExpenseColumns(load_snapshot(snapshot_file)), journal_file)
+        self.aggregates = load_aggregates(self.expenses, aggregates_file)
+
+    #no index to update: the columns are scanned instead (see ExpenseColumns.find)
+    def add(self, expense):
+        append_expense(self.expenses, expense, self.journal_file, self.snapshot_file)
+        add_to_aggregates(self.aggregates, expense)
+
+    def add_many(self, expenses):
+        append_expenses(self.expenses, expenses, self.journal_file, self.snapshot_file)
+        for expense in expenses:
+            add_to_aggregates(self.aggregates, expense)
+
+    def by_category(self, category):
+        return self._numbered(self.expenses.find(category=category))
+
+    def by_date_range(self, start, end, category=None):
+        return self._numbered(self.expenses.find(start, end, category))
+
+
+class SqliteStorage:
+    """Expenses in a SQLite database with indexes on category and date."""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")  #appends don't rewrite the database file
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS expenses (
+                    id INTEGER PRIMARY KEY,
+                    amount_cents INTEGER NOT NULL,   -- exact money, no float rounding in SUM
+                    category TEXT NOT NULL,
+                    category_key TEXT NOT NULL,      -- casefolded category for lookups
+                    date TEXT NOT NULL,              -- as typed, e.g. 2026/01/10
+                    day INTEGER NOT NULL,            -- YYYYMMDD, for range queries and months
+                    note TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_expenses_category_day ON expenses (category_key, day);
+                CREATE INDEX IF NOT EXISTS idx_expenses_day ON expenses (day);
+
+                -- running totals, updated in the same transaction as every insert
+                CREATE TABLE IF NOT EXISTS aggregates (
+                    category_key TEXT NOT NULL,      -- '' = all categories
+                    month INTEGER NOT NULL,          -- YYYYMM, -1 = all months
+                    category TEXT NOT NULL,          -- name as first typed
+                    cents INTEGER NOT NULL,
+                    PRIMARY KEY (category_key, month)
+                ) WITHOUT ROWID;
+            """)
+        self.upgrade()
+
+    #function to bring an older (or new) database up to SCHEMA_VERSION
+    def upgrade(self, snapshot_file=SNAPSHOT_FILE, journal_file=JOURNAL_FILE):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+        #copy expenses.json (+ journal) into the database the first time it is opened
+        if version < 1 and not self and (os.path.exists(snapshot_file) or os.path.exists(journal_file)):
+            expenses = load_expenses(snapshot_file, journal_file)
+            self.add_many(expenses)
+            print(f"Migrated {len(expenses)} expenses from {snapshot_file} to SQLite.")
+
+        #databases from before the aggregates table get their totals computed once
+        if version < 2:
+            self.conn.executescript(f"""
+                    BEGIN;
+                    DELETE FROM aggregates;
+                    INSERT INTO aggregates
+                        SELECT category_key, day / 100, category, SUM(amount_cents) FROM expenses
+                        GROUP BY category_key, day / 100;
+                    INSERT INTO aggregates
+                        SELECT category_key, {ALL_MONTHS}, category, cents FROM (
+                            SELECT category_key, category, SUM(amount_cents) AS cents, MIN(id)
+                            FROM expenses GROUP BY category_key
+                        );
+                    INSERT INTO aggregates
+                        SELECT '{ALL}', day / 100, '', SUM(amount_cents) FROM expenses GROUP BY day / 100;
+                    INSERT INTO aggregates
+                        SELECT '{ALL}', {ALL_MONTHS}, '', SUM(amount_cents) FROM expenses HAVING COUNT(*) > 0;
+                    COMMIT;
+                """)
+
+        with self.conn:
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM expenses").fetchone()[0]
+
+    def __bool__(self):
+        #cheaper than COUNT(*) for the "any expenses yet?" checks in the menu
+        return self.conn.execute("SELECT EXISTS (SELECT 1 FROM expenses)").fetchone()[0] == 1
+
+    @staticmethod
+    def _row(expense):
+        return (
+            int(money(expense["amount"]) * 100),
+            expense["category"],
+            expense["category"].casefold(),
+            expense["date"],
+            date_key(expense["date"]) or 0,
+            expense["note"],
+        )
+
+    def add(self, expense):
+        with self.conn:  #one transaction = one commit
+            self._insert([self._row(expense)])
+
+    def add_many(self, expenses):
+        rows = []
+        with self.conn:  #all batches in a single transaction
+            for expense in expenses:
+                rows.append(self._row(expense))
+                if len(rows) >= INSERT_BATCH:
+                    self._insert(rows)
+                    rows = []
+            if rows:
+                self._insert(rows)
+
+    def _insert(self, rows):
+        self.conn.executemany(
+            "INSERT INTO expenses (amount_cents, category, category_key, date, day, note) VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+        #add the batch to the running totals: sum per (category, month) in Python first,
+        #so a batch of any size costs one upsert per distinct total it touches
+        deltas = {}
+        for cents, category, key, date, day, note in rows:
+            month = day // 100
+            for total_key in ((key, month), (key, ALL_MONTHS), (ALL, month), (ALL, ALL_MONTHS)):
+                name, total = deltas.get(total_key, (category if total_key[0] else "", 0))
+                deltas[total_key] = (name, total + cents)  #keeps the first spelling seen, like the json engine
+        self.conn.executemany(
+            """INSERT INTO aggregates (category_key, month, category, cents) VALUES (?, ?, ?, ?)
+               ON CONFLICT (category_key, month) DO UPDATE SET cents = cents + excluded.cents""",
+            [(key, month, name, cents) for (key, month), (name, cents) in deltas.items()],
+        )
+
+    def _select(self, where="", params=()):
+        cursor = self.conn.execute(
+            f"SELECT id, amount_cents, category, date, note FROM expenses {where}", params
+        )
+        return [
+            (row[0], {"amount": row[1] / 100, "category": row[2], "date": row[3], "note": row[4]})
+            for row in cursor
+        ]
+
+    def all(self):
+        return self._select("ORDER BY id")
+
+    def by_category(self, category):
+        return self.by_date_range(None, None, category)
+
+    def by_date_range(self, start, end, category=None):
+        conditions = []
+        params = []
+        if category is not None:
+            conditions.append("category_key = ?")
+            params.append(category.strip().casefold())
+        if start:
+            conditions.append("day >= ?")
+            params.append(date_key(start))
+        if end:
+            conditions.append("day <= ?")
+            params.append(date_key(end))
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        return self._select(f"{where} ORDER BY day, id", params)
+
+    @staticmethod
+    def _money(cents):
+        return Decimal(cents).scaleb(-2)  #exact: 1250 -> Decimal("12.50")
+
+    @staticmethod
+    def _month(month):
+        return f"{month // 100}/{month % 100:02d}"
+
+    def total(self):
+        row = self.conn.execute(
+            "SELECT cents FROM aggregates WHERE category_key = ? AND month = ?", (ALL, ALL_MONTHS)
+        ).fetchone()
+        return self._money(row[0] if row else 0)
+
+    def totals_by_category(self):
+        rows = self.conn.execute(
+            "SELECT category, cents FROM aggregates WHERE category_key != ? AND month = ? ORDER BY category_key",
+            (ALL, ALL_MONTHS),
+        )
+        return {category: self._money(cents) for category, cents in rows}
+
+    def totals_by_month(self):
+        rows = self.conn.execute(
+            "SELECT month, cents FROM aggregates WHERE category_key = ? AND month != ? ORDER BY month",
+            (ALL, ALL_MONTHS),
+        )
+        return {self._month(month): self._money(cents) for month, cents in rows}
+
+    def totals_by_category_month(self):
+        rows = self.conn.execute(
+            """SELECT name.category, a.month, a.cents
+               FROM aggregates a JOIN aggregates name
+                 ON name.category_key = a.category_key AND name.month = ?
+               WHERE a.category_key != ? AND a.month != ?
+               ORDER BY a.category_key, a.month""",
+            (ALL_MONTHS, ALL, ALL_MONTHS),
+        )
+        totals = {}
+        for category, month, cents in rows:
+            totals.setdefault(category, {})[self._month(month)] = self._money(cents)
+        return totals
+
+    def save(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
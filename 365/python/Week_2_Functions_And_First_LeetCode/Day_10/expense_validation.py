@@ -0,0 +1,49 @@
+import math
+
+# The rules for a valid expense, used both when one is typed in day10.py and
+# when a csv statement is imported (expense_import.py), so the two can never
+# accept different things. Each function returns the cleaned value or raises
+# ValueError with a message for the user.
+
+
+#function to validate amount (anything float() reads, but it has to be a real positive number)
+def validate_amount(amount):
+    amount = float(amount)
+    if not math.isfinite(amount):
+        raise ValueError("Amount must be a number")  #float() also reads "nan" and "inf"
+    if amount <= 0:
+        raise ValueError("Amount must be positive")
+    return amount
+
+#function to validate category
+def validate_category(category):
+    category = category.strip()
+    if not category:
+        raise ValueError("Category cannot be empty!")
+    if len(category) > 50:
+        raise ValueError("Category name too long (max 50 chars)")
+    return category
+
+#function to validate date
+def validate_date(date_str):
+    # Simple format check: YYYY/MM/DD
+    date_str = date_str.strip()
+    try:
+        year, month, day = date_str.split('/')
+        year, month, day = int(year), int(month), int(day)
+        if not (1 <= day <= 31):
+            raise ValueError("Day must be 1-31")
+        if not (1 <= month <= 12):
+            raise ValueError("Month must be 1-12")
+        if year < 2020 or year > 2030:
+            raise ValueError("Year seems unreasonable")
+        return date_str
+    except ValueError as e:
+        raise ValueError(f"Invalid date format. Use YYYY/MM/DD. Error: {e}")
+
+#function to validate note
+def validate_note(note):
+    note = note.strip()
+    if len(note) > 200:
+        raise ValueError("Note too long (max 200 chars)")
+    return note if note else "No note"
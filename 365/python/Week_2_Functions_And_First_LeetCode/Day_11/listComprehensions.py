@@ -1,24 +1,27 @@
 #to check which approch is sutiable for large dataset
+#(the same comparison at several sizes, with median/IQR, is in 365/benchmarks/bench_day11.py)
 
 import random
 import timeit
 TAX_RATE = .08
-PRICES = [random.randrange(100) for _ in range(100_000)]
+
 def get_price(price):
      return price * (1 + TAX_RATE)
 
-def get_prices_with_map():
-     return list(map(get_price, PRICES))
+def get_prices_with_map(prices):
+     return list(map(get_price, prices))
 
-def get_prices_with_comprehension():
-     return [get_price(price) for price in PRICES]
+def get_prices_with_comprehension(prices):
+     return [get_price(price) for price in prices]
 
-def get_prices_with_loop():
-     prices = []
-     for price in PRICES:
-         prices.append(get_price(price))
-     return prices
+def get_prices_with_loop(prices):
+     result = []
+     for price in prices:
+         result.append(get_price(price))
+     return result
 
-print(timeit.timeit(get_prices_with_map, number=100))
-print(timeit.timeit(get_prices_with_comprehension, number=100))
-print(timeit.timeit(get_prices_with_loop, number=100))
\ No newline at end of file
+if __name__ == "__main__":
+     PRICES = [random.randrange(100) for _ in range(100_000)]
+     print(timeit.timeit(lambda: get_prices_with_map(PRICES), number=100))
+     print(timeit.timeit(lambda: get_prices_with_comprehension(PRICES), number=100))
+     print(timeit.timeit(lambda: get_prices_with_loop(PRICES), number=100))
@@ -0,0 +1,103 @@
+import sys
+import math
+import time
+import random
+
+import data_filters
+import data_mappers
+import data_vectorized
+
+SIZES = [10**power for power in range(1, 8)]  #10 ... 10,000,000
+
+# Times each Day_13 function on lists of random ints, in plain Python and
+# through data_vectorized (which includes turning the list into an array and
+# the result back into a list), plus on an ndarray that is already built.
+# The crossover is the first size where the vectorized call wins.
+# Before timing, check_results makes sure both give the same answers on lists
+# big enough for NumPy that have the awkward values in them (nan, inf, ints
+# past 2**53 next to floats).
+
+
+#function to time a call; small inputs are repeated so the clock can see them
+def best_time(function, *args):
+    repeats = max(1, 100000 // len(args[0]))
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            function(*args)
+        best = min(best, (time.perf_counter() - start) / repeats)
+    return best
+
+
+#function to compare two results element by element (nan counts as equal to nan)
+def same_values(first, second):
+    if len(first) != len(second):
+        return False
+    for a, b in zip(first, second):
+        if a != b and not (isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b)):
+            return False
+    return True
+
+
+#function to run every function on the awkward lists through both versions -> list of failures
+def check_results(functions):
+    size = data_vectorized.VECTOR_MIN_SIZE
+    nan, inf = float("nan"), float("inf")
+    lists = {
+        "ints and nan": [1, nan] * size,
+        "ints and inf": [1, inf, -inf] * size,
+        "floats and nan": [0.5, nan, -2.0] * size,
+        "ints past 2**53 and floats": [2**53 + 1, 0.5] * size,
+        "ints past int64": [2**63, -1] * size,
+    }
+    failures = []
+    for name, python_version, vectorized, args in functions:
+        for label, numbers in lists.items():
+            try:
+                answer = vectorized(numbers, *args)
+            except Exception as error:
+                failures.append(f"{name}({label}) raised {error!r}")
+                continue
+            if not same_values(answer, python_version(numbers, *args)):
+                failures.append(f"{name}({label}) differs from the Python version")
+    return failures
+
+
+def main(sizes=SIZES):
+    numpy = data_vectorized.numpy
+    if numpy is None:
+        print("NumPy is not installed, data_vectorized always uses the Python versions.")
+        return
+    functions = [
+        ("filter_positive", data_filters.filter_positive, data_vectorized.filter_positive, ()),
+        ("filter_divisible", data_filters.filter_divisible, data_vectorized.filter_divisible, (3,)),
+        ("square_all", data_mappers.square_all, data_vectorized.square_all, ()),
+        ("multiply_by", data_mappers.multiply_by, data_vectorized.multiply_by, (10,)),
+    ]
+    failures = check_results(functions)
+    print(f"Results: {len(failures)} difference(s) from the Python versions")
+    for failure in failures:
+        print(f"  {failure}")
+    if failures:
+        return 1
+    data_vectorized.VECTOR_MIN_SIZE = 0  #measure the NumPy path at every size
+    rng = random.Random(13)
+    for name, python_version, vectorized, args in functions:
+        print(f"\n{name}")
+        print(f"{'size':>10} {'python':>12} {'numpy (list)':>14} {'numpy (array)':>14}")
+        crossover = None
+        for size in sizes:
+            numbers = [rng.randint(-1000, 1000) for _ in range(size)]
+            array = numpy.array(numbers)
+            python_time = best_time(python_version, numbers, *args)
+            list_time = best_time(vectorized, numbers, *args)
+            array_time = best_time(vectorized, array, *args)
+            if crossover is None and list_time < python_time:
+                crossover = size
+            print(f"{size:>10} {python_time * 1e6:>10.1f}us {list_time * 1e6:>12.1f}us {array_time * 1e6:>12.1f}us")
+        print(f"NumPy wins on lists from about {crossover} elements" if crossover else "NumPy never won on lists")
+
+
+if __name__ == "__main__":
+    sys.exit(main([int(size) for size in sys.argv[1:]] or SIZES))
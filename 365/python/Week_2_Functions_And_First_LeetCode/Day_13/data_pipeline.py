@@ -0,0 +1,173 @@
+import sys
+import time
+import tracemalloc
+
+import data_filters
+import data_mappers
+import data_processor
+
+# A lazy version of chaining the Day_13 functions:
+#   Pipeline(numbers).filter_positive().square_all().process_student_scores().sum()
+# Nothing runs until a terminal (to_list, sum, count, write). Then all stages
+# are written out as ONE loop and compiled, e.g.
+#   for x in source:
+#       if not (x >= 0): continue
+#       x = x ** 2
+#       if not (x >= 50): continue
+#       x = x + 5
+#       total += x
+# so there is no list between stages and no lambda call per element: the
+# built-in stages are plain expressions inside the loop. Any other function
+# can still be added with map() / filter() (one call per element for that stage).
+
+BATCH_LINES = 10000  #lines joined before each write in Pipeline.write
+COMPILED = {}        #generated code -> compiled function, so a short pipeline is not recompiled every run
+
+
+#function to read a text file lazily, one stripped line at a time (blank lines skipped)
+def read_lines(filename):
+    with open(filename, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield line
+
+
+class Pipeline:
+    """A lazy chain of filter/map stages over any iterable, fused into one loop when it runs."""
+
+    def __init__(self, source, stages=()):
+        self.source = source
+        self.stages = tuple(stages)  #("filter" or "map", expression using x and c<n>, constant or None)
+
+    @classmethod
+    def from_file(cls, filename, parse=None):
+        pipeline = cls(read_lines(filename))
+        return pipeline.map(parse) if parse else pipeline
+
+    def _add(self, kind, expression, constant=None):
+        return Pipeline(self.source, self.stages + ((kind, expression, constant),))
+
+    #custom stages: one call of function per element
+    def map(self, function):
+        return self._add("map", "{c}(x)", function)
+
+    def filter(self, function):
+        return self._add("filter", "{c}(x)", function)
+
+    #the Day_13 operations, as inline expressions (same results as the functions they are named after)
+    def filter_positive(self):
+        return self._add("filter", "x >= 0")
+
+    def filter_divisible(self, divisor):
+        if divisor == 0:
+            raise ZeroDivisionError("divisor cannot be 0")
+        return self._add("filter", "x % {c} == 0", divisor)
+
+    def filter_by_length(self, max_length=10):
+        return self._add("filter", "len(x) < {c}", max_length)
+
+    def square_all(self):
+        return self._add("map", "x ** 2")
+
+    def multiply_by(self, multiplier):
+        return self._add("map", "x * {c}", multiplier)
+
+    def to_uppercase(self):
+        return self._add("map", "x.upper()")
+
+    def process_student_scores(self):
+        return self._add("filter", "x >= 50")._add("map", "x + 5")
+
+    def format_names(self):
+        return self._add("map", "x.title()")
+
+    #function to write the fused loop for the stages; action is what happens to each x that gets through
+    def _source(self, setup, action, finish):
+        constants = [constant for kind, expression, constant in self.stages]
+        names = "".join(f", c{number}" for number in range(len(constants)))
+        lines = [f"def run(source, out{names}):"]
+        lines += ["    " + line for line in setup]
+        lines.append("    for x in source:")
+        for number, (kind, expression, constant) in enumerate(self.stages):
+            expression = expression.format(c=f"c{number}")
+            if kind == "filter":
+                lines.append(f"        if not ({expression}): continue")
+            else:
+                lines.append(f"        x = {expression}")
+        lines += ["        " + line for line in action]
+        lines += ["    " + line for line in finish]
+        return "\n".join(lines), constants
+
+    #function to compile the loop (once per distinct code) -> run(source, out=None)
+    def _compile(self, setup, action, finish):
+        code, constants = self._source(setup, action, finish)
+        if code not in COMPILED:
+            namespace = {}
+            exec(code, namespace)  #only our own expressions; stage values are passed in as arguments, never pasted into the code
+            COMPILED[code] = namespace["run"]
+        run = COMPILED[code]
+        return lambda source, out=None: run(source, out, *constants)
+
+    #function to show the loop to_list() would run (handy to see what got fused)
+    def explain(self):
+        return self._source(["result = []", "append = result.append"], ["append(x)"], ["return result"])[0]
+
+    #terminals: these run the pipeline
+    def __iter__(self):
+        return self._compile([], ["yield x"], [])(self.source)
+
+    def to_list(self):
+        return self._compile(["result = []", "append = result.append"], ["append(x)"], ["return result"])(self.source)
+
+    def sum(self):
+        return self._compile(["total = 0"], ["total += x"], ["return total"])(self.source)
+
+    def count(self):
+        return self._compile(["count = 0"], ["count += 1"], ["return count"])(self.source)
+
+    #function to write one result per line (in batches); returns how many lines were written
+    def write(self, filename):
+        run = self._compile(
+            ["count = 0", "batch = []", "append = batch.append"],
+            ["append(str(x))",
+             f"if len(batch) >= {BATCH_LINES}:",
+             "    out.write('\\n'.join(batch) + '\\n')",
+             "    count += len(batch)",
+             "    batch.clear()"],
+            ["if batch:",
+             "    out.write('\\n'.join(batch) + '\\n')",
+             "return count + len(batch)"],
+        )
+        with open(filename, 'w') as file:
+            return run(self.source, file)
+
+
+#function to compare the eager chain with the pipeline: peak memory and time
+def compare(count=1_000_000):
+    def numbers():
+        return ((i * 7919) % 2001 - 1000 for i in range(count))  #a stream, like lines from a file
+
+    def eager():
+        return sum(data_processor.process_student_scores(data_mappers.square_all(data_filters.filter_positive(numbers()))))
+
+    def lazy():
+        return Pipeline(numbers()).filter_positive().square_all().process_student_scores().sum()
+
+    for name, run in (("eager lists", eager), ("pipeline", lazy)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        total = run()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name}: sum={total} peak {peak / 1024:.0f} KB, {seconds:.2f}s (with tracemalloc on)")
+
+    for name, run in (("eager lists", eager), ("pipeline", lazy)):
+        start = time.perf_counter()
+        run()
+        print(f"{name}: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    compare(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -1,14 +1,13 @@
-scores = [45, 78, 92, 34, 67, 88]
-names= ["john doe", "JANE SMITH", "bOb WiLsOn"]
-
+#function to add 5 bonus marks to every passing score (50 and above)
 def process_student_scores(scores):
     return [score +5 for score in scores if score >=50]
 
+#function to write every name in title case
 def format_names(names):
     return [str.title() for str in names]
 
-print(f"The Processes scores are {process_student_scores(scores)}\n")
-print(f"Formatted Names: {format_names(names)}")
-
-
-
+if __name__ == "__main__":
+    scores = [45, 78, 92, 34, 67, 88]
+    names= ["john doe", "JANE SMITH", "bOb WiLsOn"]
+    print(f"The Processes scores are {process_student_scores(scores)}\n")
+    print(f"Formatted Names: {format_names(names)}")
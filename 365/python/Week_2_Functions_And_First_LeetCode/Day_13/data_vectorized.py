@@ -0,0 +1,131 @@
+import data_filters
+import data_mappers
+
+try:
+    import numpy  #optional: without it every call simply uses the Python versions
+except ImportError:
+    numpy = None
+
+VECTOR_MIN_SIZE = 3000  #below this a list is as fast or faster in plain Python (see data_benchmark.py)
+INT64_MAX = 2**63 - 1
+FLOAT_EXACT = 2**53  #every int up to this size is exactly a float64, larger ones get rounded
+
+# Same functions as data_filters / data_mappers, but big numeric inputs are
+# done as one NumPy operation instead of a Python call per element.
+#   - an ndarray in gives an ndarray out, always through NumPy
+#   - any other iterable gives a list out; it goes through NumPy only when it
+#     has at least VECTOR_MIN_SIZE numbers (ints or floats) and the result
+#     cannot overflow int64, otherwise the Python version runs
+#   - a divisor or multiplier that is not an int64-sized int or a float
+#     always takes the Python version (for an ndarray too, converted back)
+# A list mixing ints and floats becomes a float64 array, so its ints come back
+# as floats (2 -> 2.0). That only happens while every int, and every int
+# square or product, is at most 2**53, so the values stay equal; a list with
+# bigger ints runs in Python. A float square can still differ from x**2 in
+# the last bit (x * x is the correctly rounded one; Python's ** goes through
+# the C pow function).
+
+
+#function to turn the input into an array when NumPy is worth it, else None
+def as_numbers(values):
+    if numpy is None:
+        return None
+    if isinstance(values, numpy.ndarray):
+        return values
+    if len(values) < VECTOR_MIN_SIZE:
+        return None
+    array = numpy.asarray(values)
+    #strings, bools, huge ints (object arrays) and nested lists stay in Python
+    if array.ndim != 1 or array.dtype.kind not in "if":
+        return None
+    if array.dtype.kind == "f" and has_ints(values) and largest_int(values) > FLOAT_EXACT:
+        return None  #float64 would change these ints
+    return array
+
+
+#function to check if a list has Python ints in it (map and set run in C, so this is quick)
+def has_ints(values):
+    return int in set(map(type, values))
+
+
+#function to get the largest |x| of the ints in a list
+def largest_int(values):
+    return max(abs(x) for x in values if type(x) is int)
+
+
+#function to check that an int result |x| * factor (factor=None means x * x) is exact in the array:
+#inside int64 for an int array, at most 2**53 for ints mixed into a float array
+def fits_int64(values, array, factor=None):
+    if isinstance(values, numpy.ndarray) or not len(array):
+        return True  #ndarrays keep NumPy's own rules
+    if array.dtype.kind == "i":
+        largest, limit = int(numpy.abs(array).max()), INT64_MAX
+    elif isinstance(factor, float) or not has_ints(values):
+        return True  #float results in Python too, and floats do not wrap around
+    else:
+        #only the ints need to stay exact, and the floats may be nan or inf, which int() refuses
+        largest, limit = largest_int(values), FLOAT_EXACT
+    return largest * (largest if factor is None else abs(factor)) <= limit
+
+
+#function to check that a divisor / multiplier can become a NumPy scalar (an int past int64 cannot)
+def fits_scalar(value):
+    if isinstance(value, float):
+        return True
+    return isinstance(value, int) and -INT64_MAX - 1 <= value <= INT64_MAX
+
+
+#function to run the Python version, giving an ndarray back for an ndarray in
+def in_python(function, numbers, *args):
+    if numpy is None or not isinstance(numbers, numpy.ndarray):
+        return function(numbers, *args)
+    values = function(numbers.tolist(), *args)
+    if not values:
+        return numbers[:0]
+    return numpy.array(values)  #NumPy picks the dtype: object for ints past int64 or e.g. Fractions
+
+
+#function to make sure the input can be measured (generators are read into a list once)
+def sized(values):
+    return values if hasattr(values, "__len__") else list(values)
+
+
+#function to give the result back in the same kind of container as the input
+def result(values, array):
+    if isinstance(values, numpy.ndarray):
+        return array
+    return array.tolist()
+
+
+def filter_positive(numbers):
+    numbers = sized(numbers)
+    array = as_numbers(numbers)
+    if array is None:
+        return data_filters.filter_positive(numbers)
+    return result(numbers, array[array >= 0])
+
+
+def filter_divisible(numbers, divisor):
+    numbers = sized(numbers)
+    array = as_numbers(numbers)
+    if array is None or not fits_scalar(divisor) or divisor == 0:
+        #Python raises ZeroDivisionError (NumPy would not) and handles ints of any size
+        return in_python(data_filters.filter_divisible, numbers, divisor)
+    with numpy.errstate(invalid="ignore"):  #inf % n is nan in both, only NumPy warns about it
+        return result(numbers, array[array % divisor == 0])
+
+
+def square_all(numbers):
+    numbers = sized(numbers)
+    array = as_numbers(numbers)
+    if array is None or not fits_int64(numbers, array):
+        return data_mappers.square_all(numbers)
+    return result(numbers, array * array)
+
+
+def multiply_by(numbers, multiplier):
+    numbers = sized(numbers)
+    array = as_numbers(numbers)
+    if array is None or not fits_scalar(multiplier) or not fits_int64(numbers, array, multiplier):
+        return in_python(data_mappers.multiply_by, numbers, multiplier)
+    return result(numbers, array * multiplier)
@@ -1,5 +1,15 @@
+import io
+import os
 import csv
 import json
+import mmap
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+BATCH_ROWS = 10000          #rows converted before each write (and progress report)
+BUFFER_SIZE = 1024 * 1024   #bytes buffered by the output file
+CHUNK_BYTES = 16 * 1024 * 1024  #largest piece of the csv one worker converts at a time (parallel mode)
+
 def read_csv(filename, data):
     with open(filename,'r') as csv_file:
         reader=csv.DictReader(csv_file)
@@ -11,12 +21,165 @@ def write_json(data, filename):
     with open(filename,'w') as json_file:
         json.dump(data,json_file,indent=4)
 
-def convert_csv_to_json(csv_file, json_file):
-    data = []
-    data = read_csv(csv_file, data)
-    write_json(data, json_file)
+#function to turn one row into text, the same way json.dump writes a list item
+def format_row(row, indent=None):
+    text = json.dumps(row, indent=indent)
+    if indent is None:
+        return text
+    #items inside a list are indented one level deeper
+    return "\n".join(" " * indent + line for line in text.split("\n"))
+
+#function to get what goes between rows / around them for each output format
+def layout(fmt="array", indent=None):
+    if fmt == "jsonl":
+        if indent is not None:
+            #an indented row spans several lines, and JSON Lines is read one line per row
+            raise ValueError("indent cannot be used with fmt='jsonl' (each row has to stay on one line)")
+        return "", "\n", "\n", ""   #start, separator, end, empty file
+    if fmt != "array":
+        raise ValueError(f"Unknown format '{fmt}' (use 'array' or 'jsonl')")
+    if indent is None:
+        return "[", ", ", "]", "[]"
+    return "[\n", ",\n", "\n]", "[]"
+
+#function to convert a csv to json while reading it, so memory stays flat for any file size
+#fmt="array" writes exactly what json.dump(rows, indent=indent) would, fmt="jsonl" writes one row per line
+#progress(rows_done, bytes_read, total_bytes) is called after every batch
+def stream_csv_to_json(csv_file, json_file, fmt="array", indent=None, progress=None,
+                       encoding="utf-8", batch_rows=BATCH_ROWS):
+    start, separator, end, empty = layout(fmt, indent)
+    total_bytes = os.path.getsize(csv_file)
+    rows_done = 0
+
+    with open(csv_file, 'r', newline='', encoding=encoding) as source, \
+         open(json_file, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as target:
+        reader = csv.DictReader(source)
+        batch = []
+        for row in reader:
+            batch.append(format_row(row, indent))
+            if len(batch) >= batch_rows:
+                target.write((separator if rows_done else start) + separator.join(batch))
+                rows_done += len(batch)
+                batch = []
+                if progress:
+                    progress(rows_done, source.buffer.tell(), total_bytes)
+
+        if batch:
+            target.write((separator if rows_done else start) + separator.join(batch))
+            rows_done += len(batch)
+        target.write(end if rows_done else empty)
+        if progress:
+            progress(rows_done, total_bytes, total_bytes)
+    return rows_done
+
+#function to print progress as a percentage
+def print_progress(rows_done, bytes_read, total_bytes):
+    percent = 100 * bytes_read / total_bytes if total_bytes else 100
+    print(f"\r{rows_done} rows ({percent:.0f}%)", end="" if bytes_read < total_bytes else "\n")
+
+# Parallel mode: the csv is memory-mapped and cut into byte ranges that each
+# start at the beginning of a record, every range is converted in its own
+# process, and the pieces are joined in order. A newline only ends a record
+# when it is outside quotes, and since "" inside a quoted field is two quotes,
+# "inside quotes" is just an odd number of quote bytes since the last record
+# start. So the workers first count the quotes in each rough range, the
+# running count says whether a cut point is inside quotes, and each cut is
+# moved forward to the next newline that is not. This assumes standard
+# quoting (quotes only around fields) and an ASCII-compatible encoding.
+
+#function to count quote bytes in part of the file (read in windows, so memory stays small)
+def count_quotes(csv_file, start, stop):
+    count = 0
+    with open(csv_file, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for window in range(start, stop, CHUNK_BYTES):
+            count += data[window:min(window + CHUNK_BYTES, stop)].count(b'"')
+    return count
+
+#function to find where the next record starts at or after pos (inside tells if pos is inside quotes)
+def next_record_start(data, pos, inside=False):
+    while True:
+        quote = data.find(b'"', pos)
+        if not inside:
+            newline = data.find(b'\n', pos)
+            if newline != -1 and (quote == -1 or newline < quote):
+                return newline + 1
+        if quote == -1:
+            return len(data)
+        inside = not inside
+        pos = quote + 1
+
+#function to convert one byte range of the csv into a part file -> number of rows
+def convert_range(csv_file, start, stop, fieldnames, part_file, fmt, indent, encoding):
+    with open(csv_file, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        text = data[start:stop].decode(encoding)
+    reader = csv.DictReader(io.StringIO(text, newline=''), fieldnames=fieldnames)
+    rows = [format_row(row, indent) for row in reader]
+    separator = layout(fmt, indent)[1]
+    with open(part_file, 'w', encoding='utf-8') as part:
+        part.write(separator.join(rows))
+    return len(rows)
+
+#function to convert a csv to json on several processes; the output is byte for byte the same as stream_csv_to_json
+def parallel_csv_to_json(csv_file, json_file, fmt="array", indent=None, progress=None,
+                         encoding="utf-8", workers=None, chunk_bytes=CHUNK_BYTES):
+    workers = workers or os.cpu_count() or 1
+    total_bytes = os.path.getsize(csv_file)
+    if workers <= 1 or total_bytes <= chunk_bytes:
+        return stream_csv_to_json(csv_file, json_file, fmt, indent, progress, encoding)
+    start, separator, end, empty = layout(fmt, indent)
+
+    with open(csv_file, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        header_end = next_record_start(data, 0)
+        fieldnames = next(csv.reader(io.StringIO(data[:header_end].decode(encoding), newline='')), None)
+        if not fieldnames:
+            #header not on the first line: rare enough to leave to the serial converter
+            return stream_csv_to_json(csv_file, json_file, fmt, indent, progress, encoding)
+
+        #rough cut points, several per worker so a slow piece does not hold up the rest
+        pieces = max(workers * 4, (total_bytes - header_end) // chunk_bytes + 1)
+        cuts = [header_end + (total_bytes - header_end) * i // pieces for i in range(pieces)] + [total_bytes]
+
+        with ProcessPoolExecutor(workers) as pool:
+            counts = list(pool.map(count_quotes, [csv_file] * pieces, cuts[:-1], cuts[1:]))
+            bounds = [header_end]
+            quotes = 0
+            for cut, count in zip(cuts[1:-1], counts):
+                quotes += count
+                bounds.append(max(bounds[-1], next_record_start(data, cut, quotes % 2 == 1)))
+            bounds.append(total_bytes)
+        ranges = [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+    part_files = [f"{json_file}.part{i}" for i in range(len(ranges))]
+    try:
+        rows_done = 0
+        with ProcessPoolExecutor(workers) as pool, \
+             open(json_file, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as target:
+            jobs = pool.map(convert_range, [csv_file] * len(ranges), [a for a, b in ranges], [b for a, b in ranges],
+                            [fieldnames] * len(ranges), part_files, [fmt] * len(ranges),
+                            [indent] * len(ranges), [encoding] * len(ranges))
+            for (a, b), part_file, rows in zip(ranges, part_files, jobs):  #map gives results in order
+                if rows:
+                    target.write(separator if rows_done else start)
+                    target.flush()
+                    with open(part_file, 'r', encoding='utf-8') as part:
+                        shutil.copyfileobj(part, target)
+                    rows_done += rows
+                os.remove(part_file)
+                if progress:
+                    progress(rows_done, b, total_bytes)
+            target.write(end if rows_done else empty)
+    finally:
+        for part_file in part_files:
+            if os.path.exists(part_file):
+                os.remove(part_file)
+    return rows_done
+
+def convert_csv_to_json(csv_file, json_file, fmt="array", indent=None, progress=None, workers=1):
+    if workers != 1:
+        return parallel_csv_to_json(csv_file, json_file, fmt, indent, progress, workers=workers)
+    return stream_csv_to_json(csv_file, json_file, fmt, indent, progress)
 
 if __name__ == "__main__":
     csv_file = 'students.csv'
     json_file = 'result.json'
-    convert_csv_to_json(csv_file, json_file)
\ No newline at end of file
+    convert_csv_to_json(csv_file, json_file, indent=4, progress=print_progress)
@@ -0,0 +1,337 @@
+"""
+Freud Mental Health AI - Dataset Pipeline Benchmark
+===================================================
+
+Generates synthetic Dataset.json files of increasing size and times each
+FreudDatasetBuilder phase (load_data, build_dataset, optional dedup and
+balancing, split_and_save) on them, together with the peak memory of
+every phase.
+
+Each scale runs in a fresh process, so memory numbers of one scale never
+leak into the next. Phases are timed without tracing (best of --repeat
+runs). Peak memory comes from a separate tracemalloc pass.
+
+The report gives each phase a scaling exponent k, with time ~ patterns^k.
+k is fitted on a log-log scale across all scales. Linear code stays near
+1.0. A phase above --max-exponent is flagged and the script exits with
+status 1, so quadratic regressions show up long before they hit real
+data.
+
+Usage:
+    python freud_benchmark.py
+    python freud_benchmark.py --scales 50 100 200 400 800 --dedup --balance
+    python freud_benchmark.py --generate-only big_dataset.json --intents 20000
+
+Author: Your Project
+Date: January 2026
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from typing import Dict, List
+
+from freud_dataset_builder import FreudDatasetBuilder, RANDOM_SEED
+from freud_memory import rss_peak_mb
+
+
+REPORT_FILE = "freud_benchmark_report.json"
+DEFAULT_SCALES = (100, 200, 400, 800)  # Number of intents
+PATTERNS_PER_INTENT = 80  # Dataset.json averages ~78
+RESPONSES_PER_INTENT = 70  # Dataset.json averages ~74
+DUPLICATE_RATE = 0.05  # Share of patterns that are one-word edits of an earlier pattern
+MAX_EXPONENT = 1.3  # Scaling exponent above which a phase is flagged
+MIN_TIMED_SECONDS = 0.02  # Shorter phases are too noisy to judge scaling
+
+# The builder treats these tags specially (augmentation prefixes)
+EMOTION_TAGS = ['sad', 'anxious', 'stressed', 'angry', 'happy', 'greeting', 'neutral', 'depressed']
+
+SYLLABLES = [c + v for c in "bdfghklmnprstvwz" for v in "aeiou"]
+
+
+def _vocabulary(size: int = 3000) -> List[str]:
+    """Deterministic pseudo-words made of two or three syllables"""
+    rng = random.Random(RANDOM_SEED)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))))
+    return sorted(words)
+
+
+def generate_synthetic_dataset(
+    path: str,
+    intents: int,
+    patterns: int = PATTERNS_PER_INTENT,
+    responses: int = RESPONSES_PER_INTENT,
+    duplicate_rate: float = DUPLICATE_RATE,
+    seed: int = RANDOM_SEED,
+) -> int:
+    """
+    Write a Dataset.json-shaped file with synthetic intents.
+
+    Words are drawn from a Zipf-like distribution so shingle statistics
+    resemble natural text, and a share of patterns are near-copies of
+    earlier ones to give deduplication something to find. Intents are
+    written one at a time, so generating millions of patterns needs no
+    more memory than a single intent.
+
+    Args:
+        path: Output file
+        intents: Number of intents
+        patterns: Patterns per intent
+        responses: Responses per intent
+        duplicate_rate: Share of patterns that copy an earlier one with one word changed
+        seed: Random seed
+
+    Returns:
+        Size of the written file in bytes
+    """
+    rng = random.Random(seed)
+    vocab = _vocabulary()
+    cum_weights = list(accumulate(1 / (rank + 1) for rank in range(len(vocab))))
+
+    def sentence(low: int, high: int) -> str:
+        words = rng.choices(vocab, cum_weights=cum_weights, k=rng.randint(low, high))
+        return " ".join(words).capitalize() + rng.choice([".", "?", "!", ""])
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"intents": [')
+        for n in range(intents):
+            base = EMOTION_TAGS[n % len(EMOTION_TAGS)]
+            tag = base if n < len(EMOTION_TAGS) else f"{base}-{n // len(EMOTION_TAGS)}"
+
+            intent_patterns = []
+            for _ in range(patterns):
+                if intent_patterns and rng.random() < duplicate_rate:
+                    words = rng.choice(intent_patterns).split()
+                    words[rng.randrange(len(words))] = rng.choice(vocab)
+                    intent_patterns.append(" ".join(words))
+                else:
+                    intent_patterns.append(sentence(4, 12))
+
+            intent = {
+                'tag': tag,
+                'patterns': intent_patterns,
+                'responses': [sentence(8, 16) for _ in range(responses)],
+            }
+            f.write(("," if n else "") + "\n" + json.dumps(intent))
+        f.write("\n]}\n")
+
+    return os.path.getsize(path)
+
+
+def _run_phases(input_file: str, output_dir: str, dedup: bool, balance: bool, trace: bool) -> Dict:
+    """Run the builder phases once, timing each and (optionally) tracing its peak memory"""
+    builder = FreudDatasetBuilder(input_file, output_dir)
+    phases = [
+        ('load_data', builder.load_data),
+        ('build_dataset', builder.build_dataset),
+    ]
+    if dedup:
+        phases.append(('deduplicate', builder.deduplicate))
+    if balance:
+        phases.append(('balance', builder.balance))
+    phases.append(('split_and_save', builder.split_and_save))
+
+    seconds = {}
+    peaks = {}
+    samples = 0
+
+    if trace:
+        tracemalloc.start()
+
+    # The builder is chatty - keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, phase in phases:
+            if trace:
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            phase()
+            seconds[name] = time.perf_counter() - start
+            if trace:
+                peaks[name] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+            samples = max(samples, len(builder.samples))
+
+    if trace:
+        tracemalloc.stop()
+
+    return {'seconds': seconds, 'peak_mb': peaks, 'samples': samples}
+
+
+def benchmark_scale(
+    intents: int,
+    patterns: int = PATTERNS_PER_INTENT,
+    responses: int = RESPONSES_PER_INTENT,
+    dedup: bool = False,
+    balance: bool = False,
+    repeat: int = 3,
+) -> Dict:
+    """
+    Benchmark all builder phases on one synthetic dataset size.
+
+    Runs in the calling process - use a fresh process per scale so the
+    RSS peak belongs to this scale alone.
+    """
+    with tempfile.TemporaryDirectory(prefix="freud_bench_") as tmp:
+        input_file = os.path.join(tmp, "Dataset.json")
+
+        start = time.perf_counter()
+        size = generate_synthetic_dataset(input_file, intents, patterns, responses)
+        generate_seconds = time.perf_counter() - start
+
+        timed = [
+            _run_phases(input_file, os.path.join(tmp, f"out_{n}"), dedup, balance, trace=False)
+            for n in range(repeat)
+        ]
+        traced = _run_phases(input_file, os.path.join(tmp, "out_traced"), dedup, balance, trace=True)
+
+    return {
+        'intents': intents,
+        'patterns': intents * patterns,
+        'responses': intents * responses,
+        'input_mb': size / 1024 ** 2,
+        'samples': traced['samples'],
+        'generate_seconds': generate_seconds,
+        'seconds': {name: min(run['seconds'][name] for run in timed) for name in traced['seconds']},
+        'peak_mb': traced['peak_mb'],
+        'rss_peak_mb': rss_peak_mb(),
+    }
+
+
+def scaling_exponents(rows: List[Dict], max_exponent: float = MAX_EXPONENT) -> Dict[str, Dict]:
+    """
+    Scaling exponent of every phase, measured against the pattern count.
+
+    1.0 means linear, 2.0 quadratic. The exponent that gets flagged is the
+    least-squares slope of log(time) over log(patterns) across all scales
+    where the phase took at least MIN_TIMED_SECONDS. A single noisy pair
+    cannot trip it. The exponents between neighbouring scales are kept for
+    reference.
+    """
+    results = {}
+
+    for phase in rows[0]['seconds']:
+        pairs = [
+            math.log(large['seconds'][phase] / small['seconds'][phase]) / math.log(large['patterns'] / small['patterns'])
+            for small, large in zip(rows, rows[1:])
+            if min(small['seconds'][phase], large['seconds'][phase]) > 0
+        ]
+
+        points = [
+            (math.log(row['patterns']), math.log(row['seconds'][phase]))
+            for row in rows
+            if row['seconds'][phase] >= MIN_TIMED_SECONDS
+        ]
+        exponent = None
+        if len(points) >= 2:
+            mean_x = sum(x for x, _ in points) / len(points)
+            mean_y = sum(y for _, y in points) / len(points)
+            spread = sum((x - mean_x) ** 2 for x, _ in points)
+            if spread > 0:
+                exponent = sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+        results[phase] = {
+            'exponent': exponent,
+            'points': len(points),
+            'pairwise': pairs,
+            'flagged': exponent is not None and exponent > max_exponent,
+        }
+
+    return results
+
+
+def print_report(report: Dict):
+    """Print the per-scale table and the scaling exponents"""
+    rows = report['scales']
+    phases = list(rows[0]['seconds'])
+
+    print(f"\n📊 Builder phase timings (best of {report['repeat']}, peak traced MB in brackets)")
+    header = f"   {'patterns':>10}{'samples':>10}{'input MB':>10}"
+    header += "".join(f"{phase:>26}" for phase in phases)
+    print(header)
+    print(f"   {'-' * (len(header) - 3)}")
+    for row in rows:
+        line = f"   {row['patterns']:>10,}{row['samples']:>10,}{row['input_mb']:>10.1f}"
+        for phase in phases:
+            cell = f"{row['seconds'][phase]:.3f}s ({row['peak_mb'][phase]:.1f} MB)"
+            line += f"{cell:>26}"
+        print(line)
+
+    print(f"\n📈 Scaling exponents (time ~ patterns^k, flagged above {report['max_exponent']})")
+    for phase, item in report['exponents'].items():
+        pairwise = " ".join(f"{k:.2f}" for k in item['pairwise'])
+        if item['exponent'] is None:
+            print(f"   · {phase:<16} k = n/a   (too fast to measure; pairwise {pairwise})")
+        else:
+            status = "❌" if item['flagged'] else "✅"
+            print(f"   {status} {phase:<16} k = {item['exponent']:.2f}  "
+                  f"(fit over {item['points']} scales; pairwise {pairwise})")
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Freud Mental Health AI - Dataset Pipeline Benchmark")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="Numbers of synthetic intents to benchmark")
+    parser.add_argument("--patterns", type=int, default=PATTERNS_PER_INTENT, help="Patterns per intent")
+    parser.add_argument("--responses", type=int, default=RESPONSES_PER_INTENT, help="Responses per intent")
+    parser.add_argument("--dedup", action="store_true", help="Include the near-duplicate removal phase")
+    parser.add_argument("--balance", action="store_true", help="Include the emotion balancing phase")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per scale (best is kept)")
+    parser.add_argument("--max-exponent", type=float, default=MAX_EXPONENT,
+                        help="Flag phases that scale worse than patterns^k")
+    parser.add_argument("--output", default=REPORT_FILE, help="Where to write the JSON report")
+    parser.add_argument("--generate-only", metavar="PATH", default=None,
+                        help="Only write a synthetic dataset with --intents intents to PATH")
+    parser.add_argument("--intents", type=int, default=1000, help="Intents for --generate-only")
+    args = parser.parse_args()
+
+    print("🧠 Freud Mental Health AI - Dataset Pipeline Benchmark")
+    print("=" * 80)
+
+    if args.generate_only:
+        size = generate_synthetic_dataset(args.generate_only, args.intents, args.patterns, args.responses)
+        print(f"✅ Wrote {args.intents:,} intents ({args.intents * args.patterns:,} patterns, "
+              f"{size / 1024 ** 2:.1f} MB) to {args.generate_only}")
+        return
+
+    rows = []
+    for intents in sorted(args.scales):
+        print(f"⏱️ {intents:,} intents ({intents * args.patterns:,} patterns)...")
+        # Fresh process per scale, so memory from one scale never leaks into the next
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            row = executor.submit(
+                benchmark_scale, intents, args.patterns, args.responses,
+                args.dedup, args.balance, args.repeat,
+            ).result()
+        rows.append(row)
+
+    report = {
+        'created': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'repeat': args.repeat,
+        'max_exponent': args.max_exponent,
+        'scales': rows,
+        'exponents': scaling_exponents(rows, args.max_exponent),
+    }
+    print_report(report)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Report saved to {args.output}")
+
+    if any(item['flagged'] for item in report['exponents'].values()):
+        print("❌ At least one phase scales worse than expected")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,11 +12,23 @@ Author: Your Project
 Date: January 2026
 """
 
+import argparse
+import bisect
+import gzip
+import hashlib
+import heapq
 import json
 import random
+import re
 import os
+import time
+import tracemalloc
+import zlib
+from itertools import islice
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterator, Iterable, Optional, Sequence
 from collections import defaultdict
 
 
@@ -25,9 +37,425 @@ RANDOM_SEED = 42
 TRAIN_SPLIT = 0.9  # 90% train, 10% validation
 MAX_CONVERSATION_LENGTH = 512  # tokens
 AUGMENTATION_FACTOR = 1.2  # Create 20% more samples through augmentation
+SHARD_SIZE_BYTES = 64 * 1024 * 1024  # Max uncompressed size of one JSONL shard
+READ_CHUNK_SIZE = 64 * 1024  # Bytes read at a time when streaming Dataset.json
+TOKENIZE_BATCH_SIZE = 1000  # Samples per tokenizer call when packing
 
-# Set random seed for reproducibility
-random.seed(RANDOM_SEED)
+# Near-duplicate removal (MinHash + LSH)
+DEDUP_THRESHOLD = 0.8  # Estimated Jaccard similarity at which samples count as duplicates
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16  # 16 bands x 4 rows
+SHINGLE_SIZE = 3  # Words per shingle
+MINHASH_CHUNK_SIZE = 200  # Samples hashed per numpy batch
+
+# Incremental builds - bump when generate_intent_samples output changes
+BUILD_CACHE_VERSION = 2
+
+# Emotion balancing
+MAX_SAMPLES_PER_EMOTION = 600  # Over-represented emotions are downsampled to this
+MIN_SAMPLES_PER_EMOTION = 20  # Rare emotions are resampled up to this
+
+# Empathetic prefixes used by response augmentation
+AUGMENTATION_PREFIXES = {
+    'sad': ['I hear you. ', 'I understand. ', 'That sounds difficult. '],
+    'anxious': ['I can sense your worry. ', 'Anxiety can be tough. ', ''],
+    'stressed': ['Stress is real. ', 'That sounds overwhelming. ', ''],
+    'angry': ['I hear your frustration. ', 'It\'s okay to feel angry. ', ''],
+    'happy': ['I\'m glad to hear that! ', 'That\'s wonderful! ', ''],
+}
+
+
+def intent_rng(tag: str, seed: int = RANDOM_SEED) -> random.Random:
+    """
+    Random generator for one intent, derived from the seed and the intent tag.
+    
+    Every intent draws from its own stream, so the generated samples do
+    not depend on which intents were processed before it (or by which
+    worker process).
+    """
+    digest = hashlib.sha256(f"{seed}:{tag}".encode('utf-8')).digest()
+    return random.Random(int.from_bytes(digest[:8], 'big'))
+
+
+def weighted_sample(rng: random.Random, items: Sequence, weights: Sequence[float], k: int) -> List:
+    """
+    Pick k items without replacement, each with probability proportional
+    to its weight (Efraimidis-Spirakis: keep the k largest u ** (1 / w)).
+    """
+    keys = ((rng.random() ** (1.0 / weight), item) for item, weight in zip(items, weights))
+    return [item for _, item in heapq.nlargest(k, keys, key=lambda pair: pair[0])]
+
+
+class SampleRecord:
+    """
+    Compact description of one training sample.
+    
+    Instead of the rendered text (which repeats the long system prompt),
+    a record holds indices into its intent's patterns and responses plus
+    the augmentation prefix used, if any. FreudDatasetBuilder.render_sample
+    turns it into text at write time.
+    """
+    
+    __slots__ = ('emotion_id', 'patterns', 'responses', 'prefix')
+    
+    def __init__(self, emotion_id: int, patterns: Tuple[int, ...], responses: Tuple[int, ...], prefix: int = -1):
+        self.emotion_id = emotion_id  # Index into FreudDatasetBuilder.emotion_table
+        self.patterns = patterns  # Pattern index per turn
+        self.responses = responses  # Response index per turn
+        self.prefix = prefix  # AUGMENTATION_PREFIXES index (single-turn only), -1 for none
+    
+    @property
+    def kind(self) -> str:
+        return 'single_turn' if len(self.patterns) == 1 else 'multi_turn'
+    
+    def __getstate__(self):
+        return (self.emotion_id, self.patterns, self.responses, self.prefix)
+    
+    def __setstate__(self, state):
+        self.emotion_id, self.patterns, self.responses, self.prefix = state
+
+
+def iter_intents(path: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Yield the objects of the top-level "intents" array one at a time.
+
+    Only the intent currently being decoded is held in memory, so this
+    works on Dataset.json files far larger than RAM.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        # Skip ahead to the opening bracket of the intents array
+        buffer = ''
+        while True:
+            chunk = f.read(chunk_size)
+            buffer += chunk
+            match = re.search(r'"intents"\s*:\s*\[', buffer)
+            if match:
+                buffer = buffer[match.end():]
+                break
+            if not chunk:
+                return
+            buffer = buffer[-32:]  # Keep enough to match a key split across chunks
+
+        while True:
+            buffer = buffer.lstrip().lstrip(',').lstrip()
+
+            if buffer.startswith(']'):
+                return
+
+            try:
+                intent, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                # Object not complete yet - read more
+                chunk = f.read(max(chunk_size, len(buffer)))
+                if not chunk:
+                    raise
+                buffer += chunk
+                continue
+
+            yield intent
+            buffer = buffer[end:]
+
+
+def split_for_sample(text: str) -> str:
+    """
+    Deterministically assign a sample to 'train' or 'validation'.
+
+    The decision only depends on the sample text, so identical samples
+    always land in the same split and no shuffle buffer is needed.
+    """
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+    return 'train' if int.from_bytes(digest, 'big') / 2 ** 64 < TRAIN_SPLIT else 'validation'
+
+
+class ShardWriter:
+    """
+    Writes JSON Lines records into size-bounded, optionally gzipped shards.
+    """
+
+    def __init__(self, output_dir: Path, prefix: str, max_bytes: int = SHARD_SIZE_BYTES, compress: bool = False):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.shards = []
+        self._file = None
+        self._bytes = 0
+        self._count = 0
+
+    def _open_next(self):
+        self._close_current()
+        suffix = ".jsonl.gz" if self.compress else ".jsonl"
+        name = f"{self.prefix}-{len(self.shards):05d}{suffix}"
+        path = self.output_dir / name
+        if self.compress:
+            self._file = gzip.open(path, 'wb')
+        else:
+            self._file = open(path, 'wb')
+        self.shards.append({'file': name, 'samples': 0, 'bytes': 0})
+        self._bytes = 0
+        self._count = 0
+
+    def _close_current(self):
+        if self._file is not None:
+            self._file.close()
+            self.shards[-1]['samples'] = self._count
+            self.shards[-1]['bytes'] = self._bytes
+            self._file = None
+
+    def write(self, record: Dict):
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+        if self._file is None or (self._bytes and self._bytes + len(line) > self.max_bytes):
+            self._open_next()
+        self._file.write(line)
+        self._bytes += len(line)
+        self._count += 1
+
+    def close(self) -> List[Dict]:
+        self._close_current()
+        return self.shards
+
+
+def iter_shard_samples(output_dir: Path, shards: List[Dict]) -> Iterator[str]:
+    """Read sample texts back from JSONL shards listed in a manifest"""
+    for shard in shards:
+        path = Path(output_dir) / shard['file']
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)['text']
+
+
+def pack_lengths(lengths: List[int], seq_len: int) -> List[List[int]]:
+    """
+    Pack samples into rows of seq_len tokens (best-fit decreasing).
+    
+    Samples are placed longest first into the row with the least free
+    space that still fits them. Rows are found by bisecting a sorted list
+    of the free-space values currently available.
+    
+    Returns:
+        List of rows, each a list of sample indices
+    """
+    rows = []
+    rows_by_space = {}  # free space -> row ids with that much space left
+    spaces = []  # sorted free-space values present in rows_by_space
+    
+    for idx in sorted(range(len(lengths)), key=lambda i: -lengths[i]):
+        length = lengths[idx]
+        pos = bisect.bisect_left(spaces, length)
+        
+        if pos < len(spaces):
+            space = spaces[pos]
+            row = rows_by_space[space].pop()
+            if not rows_by_space[space]:
+                del rows_by_space[space]
+                spaces.pop(pos)
+        else:
+            space = seq_len
+            row = len(rows)
+            rows.append([])
+        
+        rows[row].append(idx)
+        
+        left = space - length
+        if left > 0:
+            if left not in rows_by_space:
+                rows_by_space[left] = []
+                bisect.insort(spaces, left)
+            rows_by_space[left].append(row)
+    
+    return rows
+
+
+def load_packed(output_dir: str, split: str):
+    """
+    Memory-map a packed split written by FreudDatasetBuilder.save_packed.
+    
+    Returns:
+        (rows, index, info): rows is a [num_rows, seq_len] token array,
+        index is a [num_samples, 2] array of (flat start, length) per sample
+        and info is the split's entry in packed_manifest.json
+    """
+    import numpy as np
+    
+    output_dir = Path(output_dir)
+    with open(output_dir / "packed_manifest.json", 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    info = manifest['splits'][split]
+    if info['rows']:
+        rows = np.memmap(output_dir / info['tokens'], dtype=manifest['dtype'], mode='r',
+                         shape=(info['rows'], manifest['seq_len']))
+    else:
+        rows = np.empty((0, manifest['seq_len']), dtype=manifest['dtype'])  # Empty split, no .bin written
+    index = np.load(output_dir / info['index'], mmap_mode='r')
+    return rows, index, dict(info, **{k: v for k, v in manifest.items() if k != 'splits'})
+
+
+WORD_PATTERN = re.compile(r"\w+")
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def shingle_hashes(text: str) -> List[int]:
+    """
+    Hash the word shingles of a sample's conversation.
+    
+    The system prompt line is identical in every sample, so it is skipped.
+    """
+    conversation = text.split("\n", 1)[-1].lower()
+    words = WORD_PATTERN.findall(conversation)
+    if len(words) <= SHINGLE_SIZE:
+        return [zlib.crc32(" ".join(words).encode('utf-8'))]
+    return list({
+        zlib.crc32(" ".join(words[i:i + SHINGLE_SIZE]).encode('utf-8'))
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    })
+
+
+def minhash_signatures(texts: Iterable[str], count: int, num_perm: int = MINHASH_PERMUTATIONS, seed: int = RANDOM_SEED):
+    """
+    MinHash signatures for `count` texts, shape [count, num_perm].
+    
+    Texts are consumed lazily in chunks. All shingle hashes of a chunk are
+    permuted at once with (a * h + b) mod p and the per-text minimum is
+    taken with np.minimum.reduceat.
+    """
+    import numpy as np
+    
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    
+    signatures = np.empty((count, num_perm), dtype=np.uint64)
+    texts = iter(texts)
+    
+    # Work in chunks so the [shingles, num_perm] matrix stays small
+    for start in range(0, count, MINHASH_CHUNK_SIZE):
+        hashes = [shingle_hashes(text) for text in islice(texts, MINHASH_CHUNK_SIZE)]
+        offsets = np.cumsum([0] + [len(h) for h in hashes[:-1]])
+        flat = np.fromiter((h for hs in hashes for h in hs), dtype=np.uint64)
+        
+        # crc32 < 2^32 and a < 2^31, so a * h fits in uint64
+        permuted = (flat[:, None] * a[None, :] + b[None, :]) % MERSENNE_PRIME
+        signatures[start:start + len(hashes)] = np.minimum.reduceat(permuted, offsets, axis=0)
+    
+    return signatures
+
+
+def near_duplicate_mask(
+    emotions: Sequence[str],
+    texts: Iterable[str],
+    threshold: float = DEDUP_THRESHOLD,
+    num_perm: int = MINHASH_PERMUTATIONS,
+    bands: int = LSH_BANDS,
+) -> List[bool]:
+    """
+    Mark which samples to keep after near-duplicate removal.
+    
+    Signatures are split into bands and hashed into buckets (LSH); samples
+    sharing a bucket with the same emotion are candidates, confirmed when
+    their estimated Jaccard similarity reaches the threshold. Each
+    cluster keeps its first sample. Buckets are keyed by emotion, so
+    every emotion keeps at least one sample.
+    """
+    count = len(emotions)
+    if not count:
+        return []
+    
+    signatures = minhash_signatures(texts, count, num_perm)
+    rows_per_band = num_perm // bands
+    
+    parent = list(range(count))
+    
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    for band in range(bands):
+        columns = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        buckets = {}
+        for idx in range(count):
+            key = (emotions[idx], columns[idx].tobytes())
+            first = buckets.setdefault(key, idx)
+            if first == idx:
+                continue
+            root_first, root_idx = find(first), find(idx)
+            if root_first == root_idx:
+                continue
+            if (signatures[first] == signatures[idx]).mean() >= threshold:
+                # Lower index wins so the earliest sample is the representative
+                parent[max(root_first, root_idx)] = min(root_first, root_idx)
+    
+    return [find(i) == i for i in range(count)]
+
+
+class BuildCache:
+    """
+    Per-intent sample cache for incremental rebuilds.
+    
+    Each intent's generated samples are stored in one JSONL file named by
+    a hash of the intent's content and the generation config (seed,
+    system prompt, BUILD_CACHE_VERSION). Because every intent has its own
+    RNG, a cached file is exactly what a clean build would regenerate.
+    """
+    
+    def __init__(self, cache_dir: Path, seed: int, system_prompt: str):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.config = {'seed': seed, 'system_prompt': system_prompt, 'version': BUILD_CACHE_VERSION}
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+    
+    def key(self, intent: Dict) -> str:
+        payload = json.dumps({'intent': intent, 'config': self.config}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str, emotion_id: int) -> Optional[List[SampleRecord]]:
+        self.used.add(key)
+        path = self.cache_dir / f"{key}.jsonl"
+        if not path.exists():
+            self.misses += 1
+            return None
+        self.hits += 1
+        with open(path, 'r', encoding='utf-8') as f:
+            return [
+                SampleRecord(emotion_id, tuple(patterns), tuple(responses), prefix)
+                for patterns, responses, prefix in map(json.loads, f)
+            ]
+    
+    def put(self, key: str, records: List[SampleRecord]):
+        path = self.cache_dir / f"{key}.jsonl"
+        tmp_path = path.with_suffix(f".tmp-{os.getpid()}")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps([record.patterns, record.responses, record.prefix]) + "\n")
+        os.replace(tmp_path, path)
+    
+    def finish(self):
+        """Report hits and drop entries of intents that changed or disappeared"""
+        stale = [p for p in self.cache_dir.glob("*.jsonl") if p.stem not in self.used]
+        for path in stale:
+            path.unlink()
+        print(f"♻️ Build cache: {self.hits} intents reused, {self.misses} rebuilt, {len(stale)} stale entries removed")
+
+
+# Per-process builder used by pool workers (set by _init_worker)
+_worker_builder = None
+
+
+def _init_worker(input_file: str, output_dir: str, seed: int, system_prompt: str):
+    global _worker_builder
+    _worker_builder = FreudDatasetBuilder(input_file, output_dir, seed=seed)
+    _worker_builder.system_prompt = system_prompt
+
+
+def _build_intent_worker(intent: Dict, emotion_id: int) -> List[SampleRecord]:
+    return list(_worker_builder.generate_intent_samples(intent, emotion_id))
 
 
 class FreudDatasetBuilder:
@@ -41,10 +469,18 @@ class FreudDatasetBuilder:
     - Proper format for transformer training
     """
     
-    def __init__(self, input_file: str, output_dir: str = "freud_training_data"):
+    def __init__(
+        self,
+        input_file: str,
+        output_dir: str = "freud_training_data",
+        seed: int = RANDOM_SEED,
+        cache_dir: Optional[str] = None,
+    ):
         self.input_file = input_file
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.seed = seed
+        self.cache_dir = cache_dir
         
         # System prompt (same as your original)
         self.system_prompt = (
@@ -53,9 +489,16 @@ class FreudDatasetBuilder:
             "You ask gentle follow-up questions and never judge the user."
         )
         
+        self.cache = BuildCache(cache_dir, seed, self.system_prompt) if cache_dir else None
+        
         self.data = None
-        self.samples = []
+        self.samples: List[SampleRecord] = []
+        self.emotion_table = []  # (tag, patterns, responses) per intent, indexed by emotion_id
+        self.splits = {}
+        self.manifest = None
+        self.balance_report = {}
         self.stats = defaultdict(int)
+        self.dedup_by_emotion = defaultdict(int)  # Near-duplicates removed per emotion
     
     def load_data(self):
         """Load the original Dataset.json file"""
@@ -110,84 +553,181 @@ class FreudDatasetBuilder:
         Returns:
             Formatted multi-turn conversation string
         """
-        conversation = f"<|system|>: {self.system_prompt}\n"
+        header = f"<|user|>:\n[emotion: {emotion}]\n"
+        parts = [f"<|system|>: {self.system_prompt}\n"]
         
         for user_msg, assistant_msg in turns:
-            conversation += (
-                f"<|user|>:\n"
-                f"[emotion: {emotion}]\n"
-                f"{user_msg.strip()}\n"
-                f"<|assistant|>:\n"
-                f"{assistant_msg.strip()}\n"
-            )
+            parts += (header, user_msg.strip(), "\n<|assistant|>:\n", assistant_msg.strip(), "\n")
         
-        return conversation.strip()
+        return "".join(parts).strip()
     
-    def augment_response(self, response: str, emotion: str) -> str:
+    def augment_response(self, response: str, emotion: str, rng: random.Random = random) -> str:
         """
         Add slight variations to responses to prevent memorization.
         This doesn't change the meaning, just makes it more natural.
         """
+        prefix = self._pick_prefix(response, emotion, rng)
+        return AUGMENTATION_PREFIXES[emotion][prefix] + response if prefix >= 0 else response
+    
+    @staticmethod
+    def _pick_prefix(response: str, emotion: str, rng: random.Random) -> int:
+        """Index of the empathetic prefix to add to a response, or -1 for none"""
         # Simple augmentation: sometimes add empathetic prefixes
-        prefixes = {
-            'sad': ['I hear you. ', 'I understand. ', 'That sounds difficult. '],
-            'anxious': ['I can sense your worry. ', 'Anxiety can be tough. ', ''],
-            'stressed': ['Stress is real. ', 'That sounds overwhelming. ', ''],
-            'angry': ['I hear your frustration. ', 'It\'s okay to feel angry. ', ''],
-            'happy': ['I\'m glad to hear that! ', 'That\'s wonderful! ', ''],
-        }
-        
-        if emotion in prefixes and random.random() < 0.3:  # 30% chance to add prefix
-            prefix = random.choice(prefixes[emotion])
-            if response and not response.startswith(prefix.strip()):
-                return prefix + response
+        if emotion in AUGMENTATION_PREFIXES and rng.random() < 0.3:  # 30% chance to add prefix
+            options = AUGMENTATION_PREFIXES[emotion]
+            choice = rng.choice(range(len(options)))
+            if response and not response.startswith(options[choice].strip()):
+                return choice
         
-        return response
+        return -1
     
-    def build_dataset(self):
-        """Main method to build the enhanced dataset"""
-        print("\n🔨 Building enhanced dataset...")
+    def generate_intent_samples(self, intent: Dict, emotion_id: int = 0) -> Iterator[SampleRecord]:
+        """
+        Generate the samples for one intent as compact records.
         
-        intents = self.data.get('intents', [])
+        Args:
+            intent: Intent with tag, patterns and responses
+            emotion_id: Position of the intent in self.emotion_table
+        """
+        emotion = intent.get('tag', 'neutral')
+        patterns = intent.get('patterns', [])
+        responses = intent.get('responses', [])
+        
+        if not patterns or not responses:
+            return
+        
+        rng = intent_rng(emotion, self.seed)
+        response_ids = range(len(responses))
         
-        for intent in intents:
-            emotion = intent.get('tag', 'neutral')
-            patterns = intent.get('patterns', [])
-            responses = intent.get('responses', [])
+        # Create single-turn samples
+        for pattern_id in range(len(patterns)):
+            response_id = rng.choice(response_ids)
             
-            if not patterns or not responses:
-                continue
+            # Optionally augment the response
+            prefix = -1
+            if rng.random() < 0.3:  # 30% augmentation
+                prefix = self._pick_prefix(responses[response_id], emotion, rng)
             
-            # Create single-turn samples
-            for pattern in patterns:
-                response = random.choice(responses)
+            yield SampleRecord(emotion_id, (pattern_id,), (response_id,), prefix)
+        
+        # Create multi-turn samples (if enough patterns)
+        if len(patterns) >= 2:
+            # Create conversations of 2-3 turns
+            for i in range(len(patterns) - 1):
+                num_turns = min(rng.randint(2, 3), len(patterns) - i)
+                turn_patterns = []
+                turn_responses = []
                 
-                # Optionally augment the response
-                if random.random() < 0.3:  # 30% augmentation
-                    response = self.augment_response(response, emotion)
+                for j in range(num_turns):
+                    if i + j < len(patterns):
+                        turn_patterns.append(i + j)
+                        turn_responses.append(rng.choice(response_ids))
                 
-                sample = self.create_single_turn_sample(emotion, pattern, response)
-                self.samples.append({'text': sample})
-                self.stats['single_turn'] += 1
-                self.stats[f'emotion_{emotion}'] += 1
+                if len(turn_patterns) >= 2:
+                    yield SampleRecord(emotion_id, tuple(turn_patterns), tuple(turn_responses))
+    
+    def render_sample(self, record: SampleRecord) -> str:
+        """Render a sample record into the training text format"""
+        emotion, patterns, responses = self.emotion_table[record.emotion_id]
+        
+        if len(record.patterns) == 1:
+            response = responses[record.responses[0]]
+            if record.prefix >= 0:
+                response = AUGMENTATION_PREFIXES[emotion][record.prefix] + response
+            return self.create_single_turn_sample(emotion, patterns[record.patterns[0]], response)
+        
+        turns = [(patterns[p], responses[r]) for p, r in zip(record.patterns, record.responses)]
+        return self.create_multi_turn_sample(emotion, turns)
+    
+    def sample_emotion(self, record: SampleRecord) -> str:
+        """Emotion tag of a sample record"""
+        return self.emotion_table[record.emotion_id][0]
+    
+    def _register_intent(self, intent: Dict) -> int:
+        self.emotion_table.append((
+            intent.get('tag', 'neutral'),
+            intent.get('patterns', []),
+            intent.get('responses', []),
+        ))
+        return len(self.emotion_table) - 1
+    
+    def _recount_samples(self):
+        """Recount sample kinds and emotions from self.samples (after dedup / balancing)"""
+        for key in [k for k in self.stats if k in ('single_turn', 'multi_turn') or k.startswith('emotion_')]:
+            del self.stats[key]
+        for record in self.samples:
+            self._count_sample(record)
+    
+    def _count_sample(self, record: SampleRecord):
+        kind = record.kind
+        self.stats[kind] += 1
+        if kind == 'single_turn':
+            self.stats[f'emotion_{self.sample_emotion(record)}'] += 1
+    
+    def map_intents(self, intents, workers: int = 1) -> Iterator[List[SampleRecord]]:
+        """
+        Generate samples for each intent, in input order.
+        
+        With workers > 1 intents are processed in a process pool. At most
+        a few intents per worker are in flight, so lazily parsed input
+        stays lazy. Output is identical for any worker count because each
+        intent has its own RNG. With a build cache, only intents whose
+        content or config changed are generated.
+        """
+        cache = self.cache
+        
+        if workers <= 1:
+            for intent in intents:
+                emotion_id = self._register_intent(intent)
+                key = cache.key(intent) if cache else None
+                samples = cache.get(key, emotion_id) if cache else None
+                if samples is None:
+                    samples = list(self.generate_intent_samples(intent, emotion_id))
+                    if cache:
+                        cache.put(key, samples)
+                yield samples
+            return
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.input_file, str(self.output_dir), self.seed, self.system_prompt),
+        ) as executor:
+            # Entries are (key, cached samples or None, future or None)
+            pending = deque()
             
-            # Create multi-turn samples (if enough patterns)
-            if len(patterns) >= 2:
-                # Create conversations of 2-3 turns
-                for i in range(len(patterns) - 1):
-                    num_turns = min(random.randint(2, 3), len(patterns) - i)
-                    turns = []
-                    
-                    for j in range(num_turns):
-                        if i + j < len(patterns):
-                            user_msg = patterns[i + j]
-                            asst_msg = random.choice(responses)
-                            turns.append((user_msg, asst_msg))
-                    
-                    if len(turns) >= 2:
-                        sample = self.create_multi_turn_sample(emotion, turns)
-                        self.samples.append({'text': sample})
-                        self.stats['multi_turn'] += 1
+            def take():
+                key, samples, future = pending.popleft()
+                if samples is None:
+                    samples = future.result()
+                    if cache:
+                        cache.put(key, samples)
+                return samples
+            
+            for intent in intents:
+                emotion_id = self._register_intent(intent)
+                key = cache.key(intent) if cache else None
+                samples = cache.get(key, emotion_id) if cache else None
+                future = executor.submit(_build_intent_worker, intent, emotion_id) if samples is None else None
+                pending.append((key, samples, future))
+                if len(pending) >= workers * 4:
+                    yield take()
+            while pending:
+                yield take()
+    
+    def build_dataset(self, workers: int = 1):
+        """Main method to build the enhanced dataset"""
+        print("\n🔨 Building enhanced dataset...")
+        
+        intents = self.data.get('intents', [])
+        
+        for records in self.map_intents(intents, workers):
+            self.samples.extend(records)
+            for record in records:
+                self._count_sample(record)
+        
+        if self.cache:
+            self.cache.finish()
         
         print(f"✅ Created {len(self.samples)} samples")
         print(f"   - Single-turn: {self.stats['single_turn']}")
@@ -195,50 +735,438 @@ class FreudDatasetBuilder:
         
         return self
     
-    def split_and_save(self):
+    def deduplicate(self, threshold: float = DEDUP_THRESHOLD):
+        """
+        Remove near-duplicate samples with MinHash + LSH.
+        
+        Runs in roughly linear time: every sample is hashed once and only
+        samples sharing an LSH bucket are compared.
+        """
+        print(f"\n🧹 Removing near-duplicates (Jaccard >= {threshold})...")
+        
+        emotions = [self.sample_emotion(record) for record in self.samples]
+        texts = (self.render_sample(record) for record in self.samples)
+        keep = near_duplicate_mask(emotions, texts, threshold)
+        
+        removed = defaultdict(int)
+        for emotion, kept in zip(emotions, keep):
+            if not kept:
+                removed[emotion] += 1
+        
+        before = len(self.samples)
+        self.samples = [sample for sample, kept in zip(self.samples, keep) if kept]
+        self._record_dedup(removed)
+        
+        print(f"✅ Removed {before - len(self.samples)} of {before} samples "
+              f"({(before - len(self.samples)) / max(before, 1) * 100:.1f}%)")
+        for emotion, count in sorted(removed.items(), key=lambda kv: -kv[1])[:5]:
+            print(f"   - {emotion}: -{count}")
+        
+        return self
+    
+    def _record_dedup(self, removed: Dict[str, int]):
+        for emotion, count in removed.items():
+            self.stats['dedup_removed'] += count
+            self.dedup_by_emotion[emotion] += count
+    
+    def build_streaming(
+        self,
+        shard_bytes: int = SHARD_SIZE_BYTES,
+        compress: bool = False,
+        workers: int = 1,
+        dedup_threshold: Optional[float] = None,
+    ):
+        """
+        Build and save the dataset in one pass with flat memory use.
+        
+        Intents are parsed incrementally from the input file and every
+        sample goes straight to a size-bounded JSONL shard. The split is
+        decided per sample by `split_for_sample`, and a manifest.json
+        index lists the shards of each split.
+        """
+        print("\n🌊 Building dataset in streaming mode...")
+        
+        writers = {
+            split: ShardWriter(self.output_dir, split, max_bytes=shard_bytes, compress=compress)
+            for split in ('train', 'validation')
+        }
+        
+        num_intents = 0
+        for records in self.map_intents(iter_intents(self.input_file), workers):
+            num_intents += 1
+            
+            if dedup_threshold is not None and records:
+                # Duplicates never cross emotions, so deduplicating one
+                # intent at a time keeps memory bounded by the intent size
+                emotion = self.sample_emotion(records[0])
+                keep = near_duplicate_mask(
+                    [emotion] * len(records),
+                    (self.render_sample(record) for record in records),
+                    dedup_threshold,
+                )
+                removed = keep.count(False)
+                if removed:
+                    self._record_dedup({emotion: removed})
+                records = [record for record, kept in zip(records, keep) if kept]
+            
+            for record in records:
+                sample = self.render_sample(record)
+                writers[split_for_sample(sample)].write({'text': sample})
+                self._count_sample(record)
+            
+            if records:
+                # The intent is fully written - release its patterns and responses
+                self.emotion_table[records[0].emotion_id] = (self.sample_emotion(records[0]), [], [])
+        
+        if self.cache:
+            self.cache.finish()
+        
+        splits = {}
+        for split, writer in writers.items():
+            shards = writer.close()
+            splits[split] = {
+                'samples': sum(shard['samples'] for shard in shards),
+                'shards': shards,
+            }
+        
+        manifest = {
+            'format': 'jsonl',
+            'compression': 'gzip' if compress else None,
+            'shard_size_bytes': shard_bytes,
+            'intents': num_intents,
+            'splits': splits,
+        }
+        with open(self.output_dir / "manifest.json", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        self.manifest = manifest
+        
+        train_count = splits['train']['samples']
+        val_count = splits['validation']['samples']
+        self._save_stats(train_count + val_count, train_count, val_count)
+        
+        print(f"✅ Streamed {num_intents} intents into {train_count + val_count} samples")
+        print(f"📊 Split: {train_count} train, {val_count} validation")
+        for split, info in splits.items():
+            print(f"   - {split}: {len(info['shards'])} shard(s)")
+        print(f"📑 Manifest saved to {self.output_dir / 'manifest.json'}")
+        
+        return self
+    
+    def _emotion_groups(self) -> Dict[str, List[int]]:
+        """Positions of the samples of each emotion in self.samples"""
+        groups = defaultdict(list)
+        for pos, sample in enumerate(self.samples):
+            groups[self.sample_emotion(sample)].append(pos)
+        return groups
+    
+    def _resample_weights(self, positions: List[int]) -> List[float]:
+        """
+        Weights that give every intent of an emotion the same share, and
+        every opening pattern inside an intent the same share of that, so
+        an intent or user message with few samples is not drowned out.
+        """
+        group_sizes = defaultdict(int)
+        for pos in positions:
+            record = self.samples[pos]
+            group_sizes[(record.emotion_id, record.patterns[0])] += 1
+        
+        patterns_per_intent = defaultdict(int)
+        for emotion_id, _ in group_sizes:
+            patterns_per_intent[emotion_id] += 1
+        
+        weights = []
+        for pos in positions:
+            record = self.samples[pos]
+            group = (record.emotion_id, record.patterns[0])
+            weights.append(1.0 / (patterns_per_intent[record.emotion_id] * group_sizes[group]))
+        return weights
+    
+    def balance(self, max_per_emotion: int = MAX_SAMPLES_PER_EMOTION, min_per_emotion: int = MIN_SAMPLES_PER_EMOTION):
+        """
+        Balance the dataset across emotions (in-memory builds only).
+        
+        Emotions above max_per_emotion are downsampled without replacement;
+        emotions below min_per_emotion are resampled with replacement up to
+        the floor. Both draws are weighted by `_resample_weights`. Only
+        sample positions are shuffled around - the final list is built once
+        and reuses the existing sample objects.
+        """
+        print(f"\n⚖️ Balancing emotions (min {min_per_emotion}, max {max_per_emotion})...")
+        
+        rng = random.Random(self.seed)
+        selected = []
+        self.balance_report = {}
+        
+        for emotion, positions in self._emotion_groups().items():
+            count = len(positions)
+            if count > max_per_emotion:
+                chosen = weighted_sample(rng, positions, self._resample_weights(positions), max_per_emotion)
+            elif count < min_per_emotion:
+                weights = self._resample_weights(positions)
+                chosen = positions + rng.choices(positions, weights=weights, k=min_per_emotion - count)
+            else:
+                chosen = positions
+            selected.extend(chosen)
+            self.balance_report[emotion] = {'before': count, 'after': len(chosen)}
+        
+        before = len(self.samples)
+        selected.sort()  # Keep the original order, repeats next to their source
+        self.samples = [self.samples[pos] for pos in selected]
+        
+        capped = sum(1 for r in self.balance_report.values() if r['after'] < r['before'])
+        raised = sum(1 for r in self.balance_report.values() if r['after'] > r['before'])
+        print(f"✅ {before} -> {len(self.samples)} samples "
+              f"({capped} emotions capped, {raised} resampled up)")
+        
+        return self
+    
+    def _stratified_split(self, rng: random.Random) -> Tuple[List[SampleRecord], List[SampleRecord]]:
+        """
+        Split each emotion separately so every emotion gets its share of
+        validation samples. Resampled copies of a sample always stay in
+        the same split as the original.
+        """
+        groups = defaultdict(list)
+        seen = set()
+        for sample in self.samples:
+            if id(sample) not in seen:
+                seen.add(id(sample))
+                groups[self.sample_emotion(sample)].append(sample)
+        
+        val_ids = set()
+        for emotion, unique in groups.items():
+            rng.shuffle(unique)
+            num_val = round(len(unique) * (1 - TRAIN_SPLIT))
+            if num_val == 0 and len(unique) >= 2:
+                num_val = 1
+            val_ids.update(id(sample) for sample in unique[:num_val])
+        
+        train_samples = [sample for sample in self.samples if id(sample) not in val_ids]
+        val_samples = [sample for sample in self.samples if id(sample) in val_ids]
+        rng.shuffle(train_samples)
+        rng.shuffle(val_samples)
+        return train_samples, val_samples
+    
+    def split_and_save(self, stratified: bool = True):
         """Split into train/validation and save to disk"""
         print(f"\n💾 Splitting and saving dataset...")
         
-        # Shuffle samples
-        random.shuffle(self.samples)
+        rng = random.Random(self.seed)
         
-        # Split
-        split_idx = int(len(self.samples) * TRAIN_SPLIT)
-        train_samples = self.samples[:split_idx]
-        val_samples = self.samples[split_idx:]
+        if stratified:
+            train_samples, val_samples = self._stratified_split(rng)
+        else:
+            # Shuffle samples
+            rng.shuffle(self.samples)
+            
+            # Split
+            split_idx = int(len(self.samples) * TRAIN_SPLIT)
+            train_samples = self.samples[:split_idx]
+            val_samples = self.samples[split_idx:]
         
-        print(f"📊 Split: {len(train_samples)} train, {len(val_samples)} validation")
+        print(f"📊 Split: {len(train_samples)} train, {len(val_samples)} validation"
+              f"{' (stratified by emotion)' if stratified else ''}")
+        self.splits = {'train': train_samples, 'validation': val_samples}
+        # Counted during the build, before dedup and balancing changed the list
+        self._recount_samples()
         
         # Save JSON files
         train_file = self.output_dir / "train.json"
         val_file = self.output_dir / "validation.json"
         
-        with open(train_file, 'w', encoding='utf-8') as f:
-            json.dump(train_samples, f, ensure_ascii=False, indent=2)
-        
-        with open(val_file, 'w', encoding='utf-8') as f:
-            json.dump(val_samples, f, ensure_ascii=False, indent=2)
+        self._write_json(train_file, train_samples)
+        self._write_json(val_file, val_samples)
         
         print(f"✅ Saved to {self.output_dir}/")
         print(f"   - {train_file}")
         print(f"   - {val_file}")
         
-        # Save statistics
+        self._save_stats(len(self.samples), len(train_samples), len(val_samples))
+        
+        return self
+    
+    def _write_json(self, path: Path, records: List[SampleRecord]):
+        """
+        Write records as a JSON array of {"text": ...} objects.
+        
+        Output is identical to json.dump(..., indent=2), but each sample
+        is rendered only when it is written.
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            if not records:
+                f.write("[]")
+                return
+            separator = "[\n"
+            for record in records:
+                text = json.dumps(self.render_sample(record), ensure_ascii=False)
+                f.write(f'{separator}  {{\n    "text": {text}\n  }}')
+                separator = ",\n"
+            f.write("\n]")
+    
+    def _save_stats(self, total: int, train: int, val: int):
+        """Save statistics"""
         stats_file = self.output_dir / "dataset_stats.json"
         stats = {
-            'total_samples': len(self.samples),
-            'train_samples': len(train_samples),
-            'val_samples': len(val_samples),
+            'total_samples': total,
+            'train_samples': train,
+            'val_samples': val,
             'single_turn': self.stats['single_turn'],
             'multi_turn': self.stats['multi_turn'],
             'emotions': {k: v for k, v in self.stats.items() if k.startswith('emotion_')}
         }
+        if self.balance_report:
+            stats['balance'] = self.balance_report
+        if self.splits:
+            per_split = {}
+            for split, samples in self.splits.items():
+                for sample in samples:
+                    emotion = self.sample_emotion(sample)
+                    per_split.setdefault(emotion, {'train': 0, 'validation': 0})[split] += 1
+            stats['split_by_emotion'] = per_split
+        if 'dedup_removed' in self.stats:
+            stats['dedup_removed'] = self.stats['dedup_removed']
+            stats['dedup_by_emotion'] = dict(self.dedup_by_emotion)
         
         with open(stats_file, 'w', encoding='utf-8') as f:
             json.dump(stats, f, indent=2)
         
         print(f"📊 Statistics saved to {stats_file}")
+    
+    @staticmethod
+    def _tokenize(tokenizer, texts: Iterable[str]) -> Iterator[List[int]]:
+        """Tokenize texts in batches, yielding one id list per text"""
+        batch = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) >= TOKENIZE_BATCH_SIZE:
+                yield from tokenizer(batch, add_special_tokens=False)['input_ids']
+                batch = []
+        if batch:
+            yield from tokenizer(batch, add_special_tokens=False)['input_ids']
+    
+    def save_packed(
+        self,
+        tokenizer_name: str,
+        seq_len: int = MAX_CONVERSATION_LENGTH,
+        overlong: str = "truncate",
+        splits: Optional[Dict[str, Iterable[str]]] = None,
+    ):
+        """
+        Tokenize the splits once and save them as packed binary token arrays.
+        
+        For each split this writes:
+        - {split}.bin: token ids (uint16, or uint32 for large vocabularies),
+          shape [rows, seq_len], samples packed back to back and each row
+          padded only at its end
+        - {split}.idx.npy: int64 [num_samples, 2] of (flat start, length)
+          so sample boundaries are known for attention separation
+        and packed_manifest.json with the layout and overlong samples.
+        
+        Each sample ends with the EOS token. Samples longer than seq_len
+        are flagged in the manifest (by position in the split) and
+        truncated, or dropped with overlong="drop".
+        
+        Args:
+            tokenizer_name: HuggingFace tokenizer to use (e.g. microsoft/phi-2)
+            seq_len: Length of each packed row
+            overlong: "truncate" or "drop"
+            splits: Split name -> sample texts (defaults to the last build)
+        """
+        import numpy as np
+        from transformers import AutoTokenizer
+        
+        if overlong not in ("truncate", "drop"):
+            raise ValueError(f"overlong must be 'truncate' or 'drop', not '{overlong}'")
         
+        if splits is None:
+            if self.splits:
+                splits = {
+                    name: (self.render_sample(record) for record in records)
+                    for name, records in self.splits.items()
+                }
+            elif self.manifest:
+                splits = {
+                    name: iter_shard_samples(self.output_dir, info['shards'])
+                    for name, info in self.manifest['splits'].items()
+                }
+            else:
+                raise RuntimeError("Nothing to pack - build and save the dataset first")
+        
+        print(f"\n📦 Packing tokenized samples ({tokenizer_name}, {seq_len} tokens/row)...")
+        
+        tokenizer = AutoTokenizer.from_pretrained(tokenizer_name, trust_remote_code=True)
+        eos_id = tokenizer.eos_token_id
+        pad_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else eos_id
+        dtype = np.uint16 if len(tokenizer) <= 2 ** 16 else np.uint32
+        
+        manifest = {
+            'tokenizer': tokenizer_name,
+            'dtype': np.dtype(dtype).name,
+            'seq_len': seq_len,
+            'eos_token_id': eos_id,
+            'pad_token_id': pad_id,
+            'overlong_policy': overlong,
+            'splits': {},
+        }
+        
+        for name, texts in splits.items():
+            chunks, lengths, flagged = [], [], []
+            
+            for sample_idx, ids in enumerate(self._tokenize(tokenizer, texts)):
+                ids.append(eos_id)
+                if len(ids) > seq_len:
+                    flagged.append({'sample': sample_idx, 'tokens': len(ids)})
+                    if overlong == "drop":
+                        continue
+                    ids = ids[:seq_len]
+                chunks.append(np.asarray(ids, dtype=dtype))
+                lengths.append(len(ids))
+            
+            rows = pack_lengths(lengths, seq_len)
+            
+            token_file = self.output_dir / f"{name}.bin"
+            index_file = self.output_dir / f"{name}.idx.npy"
+            index = np.zeros((len(lengths), 2), dtype=np.int64)
+            
+            # numpy cannot map an empty file, so an empty split has no .bin
+            # (load_packed gives back a [0, seq_len] array for it)
+            if rows:
+                packed = np.memmap(token_file, dtype=dtype, mode='w+', shape=(len(rows), seq_len))
+                packed[:] = pad_id
+                
+                for row_id, members in enumerate(rows):
+                    offset = 0
+                    for idx in members:
+                        packed[row_id, offset:offset + lengths[idx]] = chunks[idx]
+                        index[idx] = (row_id * seq_len + offset, lengths[idx])
+                        offset += lengths[idx]
+                
+                packed.flush()
+                del packed
+            elif token_file.exists():
+                token_file.unlink()  # Left over from an earlier, non-empty build
+            np.save(index_file, index)
+            
+            total_tokens = sum(lengths)
+            padding = 1 - total_tokens / max(len(rows) * seq_len, 1)
+            manifest['splits'][name] = {
+                'tokens': token_file.name if rows else None,
+                'index': index_file.name,
+                'rows': len(rows),
+                'samples': len(lengths),
+                'total_tokens': total_tokens,
+                'padding_ratio': padding,
+                'overlong': flagged,
+            }
+            
+            print(f"   - {name}: {len(lengths)} samples -> {len(rows)} rows "
+                  f"({total_tokens:,} tokens, {padding * 100:.1f}% padding, "
+                  f"{len(flagged)} over {seq_len} tokens)")
+        
+        with open(self.output_dir / "packed_manifest.json", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        
+        print(f"✅ Packed data saved to {self.output_dir}/")
         return self
     
     def show_samples(self, n: int = 3):
@@ -246,7 +1174,7 @@ class FreudDatasetBuilder:
         print(f"\n🔍 Sample Conversations:\n")
         
         for i in range(min(n, len(self.samples))):
-            sample = self.samples[i]['text']
+            sample = self.render_sample(self.samples[i])
             print(f"{'='*80}")
             print(f"Sample {i+1}:")
             print(f"{'='*80}")
@@ -255,23 +1183,173 @@ class FreudDatasetBuilder:
             print()
 
 
+def benchmark_workers(input_file: str, worker_counts=(1, 2, 4, 8), scale: int = 1):
+    """
+    Time build_dataset for several worker counts and check the outputs match.
+    
+    Args:
+        input_file: Source intents file
+        worker_counts: Pool sizes to compare
+        scale: Replicate every intent this many times (with distinct tags)
+    """
+    print(f"\n⏱️ Worker scaling benchmark ({input_file}, scale x{scale})")
+    
+    with open(input_file, 'r', encoding='utf-8') as f:
+        intents = json.load(f).get('intents', [])
+    intents = [
+        dict(intent, tag=f"{intent.get('tag', 'neutral')}_{copy}" if copy else intent.get('tag', 'neutral'))
+        for copy in range(scale)
+        for intent in intents
+    ]
+    
+    results = []
+    reference = None
+    
+    for workers in worker_counts:
+        builder = FreudDatasetBuilder(input_file)
+        builder.data = {'intents': intents}
+        
+        start = time.perf_counter()
+        builder.build_dataset(workers=workers)
+        elapsed = time.perf_counter() - start
+        
+        digest = hashlib.sha256("\n".join(map(builder.render_sample, builder.samples)).encode('utf-8')).hexdigest()
+        reference = reference or digest
+        results.append((workers, elapsed, len(builder.samples), digest == reference))
+    
+    base = results[0][1]
+    print(f"\n   {'workers':>8}{'seconds':>10}{'speed-up':>10}{'samples':>10}  identical")
+    for workers, elapsed, count, identical in results:
+        print(f"   {workers:>8}{elapsed:>10.2f}{base / elapsed:>9.2f}x{count:>10}  {'✅' if identical else '❌'}")
+    
+    return results
+
+
+def measure_sample_memory(input_file: str, scale: int = 1) -> Tuple[int, int]:
+    """
+    Compare the peak memory of building sample records and of rendering them into dicts.
+    
+    Args:
+        input_file: Source intents file
+        scale: Replicate every intent this many times (with distinct tags)
+    """
+    with open(input_file, 'r', encoding='utf-8') as f:
+        intents = json.load(f).get('intents', [])
+    intents = [
+        dict(intent, tag=f"{intent.get('tag', 'neutral')}_{copy}" if copy else intent.get('tag', 'neutral'))
+        for copy in range(scale)
+        for intent in intents
+    ]
+    
+    builder = FreudDatasetBuilder(input_file)
+    builder.data = {'intents': intents}
+    
+    # Peak (not current) memory of each step; the peak is reset in between
+    # so the second step is measured on its own above what the first kept
+    tracemalloc.start()
+    builder.build_dataset()
+    records = tracemalloc.get_traced_memory()[1]
+    
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    rendered = [{'text': builder.render_sample(record)} for record in builder.samples]
+    texts = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    
+    print(f"\n🧮 Sample memory ({len(rendered):,} samples, scale x{scale})")
+    print(f"   rendered dicts: {texts / 1024 ** 2:>8.1f} MB ({texts / len(rendered):.0f} B/sample)")
+    print(f"   records:        {records / 1024 ** 2:>8.1f} MB ({records / len(rendered):.0f} B/sample, incl. intent table)")
+    print(f"   reduction:      {texts / max(records, 1):>8.1f}x")
+    
+    return texts, records
+
+
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Freud Mental Health AI - Dataset Builder")
+    parser.add_argument("--input", default="Dataset.json", help="Source intents file")
+    parser.add_argument("--output-dir", default="freud_training_data")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream samples into sharded JSONL files with flat memory use")
+    parser.add_argument("--shard-mb", type=int, default=SHARD_SIZE_BYTES // (1024 * 1024),
+                        help="Max uncompressed shard size in MB (streaming mode)")
+    parser.add_argument("--gzip", action="store_true", help="Gzip-compress shards (streaming mode)")
+    parser.add_argument("--workers", type=int, default=1, help="Build intents in a process pool")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Reuse per-intent samples from the build cache when the intent is unchanged")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Build cache location (default: <output-dir>/.build_cache)")
+    parser.add_argument("--dedup", action="store_true", help="Remove near-duplicate samples (MinHash/LSH)")
+    parser.add_argument("--dedup-threshold", type=float, default=DEDUP_THRESHOLD,
+                        help="Estimated Jaccard similarity treated as duplicate")
+    parser.add_argument("--balance", action="store_true", help="Cap and floor the samples per emotion")
+    parser.add_argument("--max-per-emotion", type=int, default=MAX_SAMPLES_PER_EMOTION)
+    parser.add_argument("--min-per-emotion", type=int, default=MIN_SAMPLES_PER_EMOTION)
+    parser.add_argument("--global-split", action="store_true",
+                        help="Shuffle-and-slice split instead of stratifying by emotion")
+    parser.add_argument("--tokenizer", default=None,
+                        help="Also emit packed token-id .bin/.idx files using this tokenizer")
+    parser.add_argument("--seq-len", type=int, default=MAX_CONVERSATION_LENGTH,
+                        help="Packed row length in tokens")
+    parser.add_argument("--drop-overlong", action="store_true",
+                        help="Drop samples over --seq-len instead of truncating them")
+    parser.add_argument("--benchmark-workers", action="store_true",
+                        help="Compare build times for 1, 2, 4 and 8 workers and exit")
+    parser.add_argument("--benchmark-scale", type=int, default=1,
+                        help="Replicate intents N times for the worker and memory benchmarks")
+    parser.add_argument("--memory-report", action="store_true",
+                        help="Compare in-memory size of rendered samples and sample records, then exit")
+    args = parser.parse_args()
+    
+    if args.stream and args.balance:
+        # Balancing needs every sample of an emotion at once, streaming never holds them
+        parser.error("--balance only works with the in-memory build (drop --stream)")
+    
     print("🧠 Freud Mental Health AI - Dataset Builder")
     print("=" * 80)
     
     # Check if Dataset.json exists
-    if not os.path.exists('Dataset.json'):
-        print("❌ Error: Dataset.json not found in current directory!")
+    if not os.path.exists(args.input):
+        print(f"❌ Error: {args.input} not found in current directory!")
         print("   Please place your Dataset.json file here and run again.")
         return
     
+    if args.benchmark_workers:
+        benchmark_workers(args.input, scale=args.benchmark_scale)
+        return
+    
+    if args.memory_report:
+        measure_sample_memory(args.input, scale=args.benchmark_scale)
+        return
+    
     # Build the dataset
-    builder = FreudDatasetBuilder('Dataset.json')
-    builder.load_data()
-    builder.build_dataset()
-    builder.show_samples(n=2)  # Show 2 samples for verification
-    builder.split_and_save()
+    cache_dir = None
+    if args.incremental:
+        cache_dir = args.cache_dir or str(Path(args.output_dir) / ".build_cache")
+    builder = FreudDatasetBuilder(args.input, args.output_dir, cache_dir=cache_dir)
+    if args.stream:
+        builder.build_streaming(
+            shard_bytes=args.shard_mb * 1024 * 1024,
+            compress=args.gzip,
+            workers=args.workers,
+            dedup_threshold=args.dedup_threshold if args.dedup else None,
+        )
+    else:
+        builder.load_data()
+        builder.build_dataset(workers=args.workers)
+        if args.dedup:
+            builder.deduplicate(args.dedup_threshold)
+        if args.balance:
+            builder.balance(args.max_per_emotion, args.min_per_emotion)
+        builder.show_samples(n=2)  # Show 2 samples for verification
+        builder.split_and_save(stratified=not args.global_split)
+    
+    if args.tokenizer:
+        builder.save_packed(
+            args.tokenizer,
+            seq_len=args.seq_len,
+            overlong="drop" if args.drop_overlong else "truncate",
+        )
     
     print("\n" + "=" * 80)
     print("✨ Dataset preparation complete!")
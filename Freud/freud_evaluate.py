@@ -0,0 +1,278 @@
+"""
+Freud Mental Health AI - Validation Perplexity
+==============================================
+
+Computes loss and perplexity of a trained model over
+freud_training_data/validation.json, overall and per emotion tag.
+
+Samples are tokenized once, sorted by length and grouped into batches
+bounded by a token budget, so almost no compute is spent on padding.
+Everything runs under `torch.inference_mode`.
+
+Usage:
+    python freud_evaluate.py --model freud_phi2_model_merged
+    python freud_evaluate.py --model freud_phi2_model_merged --limit 200 --batch-tokens 2048
+
+Author: Your Project
+Date: January 2026
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import torch
+import torch.nn.functional as F
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+from freud_model_cache import ModelSnapshotCache
+
+
+VALIDATION_PATH = "freud_training_data/validation.json"
+MAX_SEQ_LENGTH = 512
+BATCH_TOKENS = 4096  # Padded tokens per batch (batch size x longest sample)
+MAX_BATCH_SIZE = 64
+
+EMOTION_PATTERN = re.compile(r"\[emotion: (.*?)\]")
+
+
+def extract_emotion(text: str) -> str:
+    """Return the first emotion tag in a training sample"""
+    match = EMOTION_PATTERN.search(text)
+    return match.group(1) if match else "unknown"
+
+
+def make_length_buckets(lengths: List[int], batch_tokens: int, max_batch_size: int) -> List[List[int]]:
+    """
+    Group sample indices into batches of similar length.
+
+    Indices are sorted by length and a batch is closed as soon as adding
+    the next (longest so far) sample would exceed the padded token budget.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    batches = []
+    batch = []
+
+    for idx in order:
+        longest = lengths[idx]
+        if batch and ((len(batch) + 1) * longest > batch_tokens or len(batch) >= max_batch_size):
+            batches.append(batch)
+            batch = []
+        batch.append(idx)
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+class FreudEvaluator:
+    """
+    Batched loss / perplexity evaluation for Freud models.
+    """
+
+    def __init__(self, model_path: str, max_length: int = MAX_SEQ_LENGTH, cache_dir: Optional[str] = None):
+        self.model_path = model_path
+        self.cache_dir = cache_dir
+        self.max_length = max_length
+        self.model = None
+        self.tokenizer = None
+        self.input_ids = []
+        self.emotions = []
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    def load_model(self):
+        """Load the model and tokenizer for evaluation"""
+        print(f"🔄 Loading model from {self.model_path}...")
+
+        # FP16 only pays off on GPU; CPU kernels are fastest in FP32
+        dtype = torch.float16 if self.device.type == "cuda" else torch.float32
+
+        if self.cache_dir:
+            cache = ModelSnapshotCache(self.cache_dir, dtype=str(dtype).replace("torch.", ""))
+            self.model, self.tokenizer = cache.load(self.model_path)
+        else:
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_path, trust_remote_code=True)
+            self.model = AutoModelForCausalLM.from_pretrained(
+                self.model_path,
+                torch_dtype=dtype,
+                trust_remote_code=True,
+            )
+
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        self.model.to(self.device)
+        self.model.eval()
+
+        print(f"✅ Model loaded on {self.device} ({dtype})")
+        return self
+
+    def load_samples(self, path: str = VALIDATION_PATH, limit: Optional[int] = None):
+        """Load validation samples and tokenize them once"""
+        print(f"📂 Loading samples from {path}...")
+
+        with open(path, 'r', encoding='utf-8') as f:
+            samples = json.load(f)
+
+        if limit:
+            samples = samples[:limit]
+
+        texts = [sample['text'] for sample in samples]
+        self.emotions = [extract_emotion(text) for text in texts]
+
+        start = time.perf_counter()
+        encoded = self.tokenizer(
+            texts,
+            truncation=True,
+            max_length=self.max_length,
+            add_special_tokens=True,
+        )
+        self.input_ids = encoded['input_ids']
+
+        print(f"✅ Tokenized {len(texts)} samples in {time.perf_counter() - start:.1f}s")
+        return self
+
+    def _score_batch(self, batch: List[int]):
+        """Return summed token NLL and token count for each sample in a batch"""
+        seqs = [self.input_ids[i] for i in batch]
+        longest = max(len(seq) for seq in seqs)
+        pad_id = self.tokenizer.pad_token_id
+
+        input_ids = torch.full((len(seqs), longest), pad_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(seqs), longest), dtype=torch.long)
+        for row, seq in enumerate(seqs):
+            input_ids[row, :len(seq)] = torch.tensor(seq, dtype=torch.long)
+            attention_mask[row, :len(seq)] = 1
+
+        input_ids = input_ids.to(self.device)
+        attention_mask = attention_mask.to(self.device)
+
+        logits = self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+        logits = logits[:, :-1].float()
+        targets = input_ids[:, 1:]
+        target_mask = attention_mask[:, 1:].float()
+
+        nll = F.cross_entropy(
+            logits.reshape(-1, logits.size(-1)),
+            targets.reshape(-1),
+            reduction="none",
+        ).view_as(target_mask) * target_mask
+
+        return nll.sum(dim=1).tolist(), target_mask.sum(dim=1).tolist(), len(seqs) * longest
+
+    def evaluate(self, batch_tokens: int = BATCH_TOKENS, max_batch_size: int = MAX_BATCH_SIZE) -> Dict:
+        """Run the evaluation and return a report dictionary"""
+        lengths = [len(ids) for ids in self.input_ids]
+        batches = make_length_buckets(lengths, batch_tokens, max_batch_size)
+
+        print(f"\n📏 Evaluating {len(lengths)} samples in {len(batches)} length-bucketed batches...")
+
+        tag_nll = defaultdict(float)
+        tag_tokens = defaultdict(float)
+        tag_samples = defaultdict(int)
+        padded_tokens = 0
+
+        start = time.perf_counter()
+        with torch.inference_mode():
+            for n, batch in enumerate(batches, 1):
+                nll, tokens, padded = self._score_batch(batch)
+                padded_tokens += padded
+
+                for idx, sample_nll, sample_tokens in zip(batch, nll, tokens):
+                    tag = self.emotions[idx]
+                    tag_nll[tag] += sample_nll
+                    tag_tokens[tag] += sample_tokens
+                    tag_samples[tag] += 1
+
+                if n % 10 == 0 or n == len(batches):
+                    print(f"   {n}/{len(batches)} batches", end="\r")
+        elapsed = time.perf_counter() - start
+
+        total_nll = sum(tag_nll.values())
+        total_tokens = sum(tag_tokens.values())
+        loss = total_nll / max(total_tokens, 1)
+
+        report = {
+            'samples': len(lengths),
+            'tokens': int(total_tokens),
+            'loss': loss,
+            'perplexity': math.exp(loss),
+            'seconds': elapsed,
+            'samples_per_sec': len(lengths) / elapsed,
+            'tokens_per_sec': sum(lengths) / elapsed,
+            'padding_ratio': 1 - sum(lengths) / max(padded_tokens, 1),
+            'emotions': {
+                tag: {
+                    'samples': tag_samples[tag],
+                    'loss': tag_nll[tag] / max(tag_tokens[tag], 1),
+                    'perplexity': math.exp(tag_nll[tag] / max(tag_tokens[tag], 1)),
+                }
+                for tag in sorted(tag_samples, key=tag_samples.get, reverse=True)
+            },
+        }
+
+        self.print_report(report)
+        return report
+
+    def print_report(self, report: Dict):
+        """Display the overall and per-emotion results"""
+        print(f"\n\n📊 Evaluation Results")
+        print("=" * 80)
+        print(f"   Samples:      {report['samples']:,}")
+        print(f"   Tokens:       {report['tokens']:,}")
+        print(f"   Loss:         {report['loss']:.4f}")
+        print(f"   Perplexity:   {report['perplexity']:.2f}")
+        print(f"   Throughput:   {report['samples_per_sec']:.1f} samples/s, "
+              f"{report['tokens_per_sec']:.0f} tokens/s")
+        print(f"   Padding:      {report['padding_ratio'] * 100:.1f}% of computed tokens")
+        print(f"   Time:         {report['seconds']:.1f}s")
+
+        print(f"\n   {'emotion':<24}{'samples':>10}{'loss':>10}{'ppl':>12}")
+        print(f"   {'-' * 56}")
+        for tag, row in report['emotions'].items():
+            print(f"   {tag:<24}{row['samples']:>10}{row['loss']:>10.4f}{row['perplexity']:>12.2f}")
+        print("=" * 80)
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Freud Mental Health AI - Validation Perplexity")
+    parser.add_argument("--model", default="freud_phi2_model_merged",
+                        help="Model directory or HuggingFace model name")
+    parser.add_argument("--data", default=VALIDATION_PATH, help="Validation JSON file")
+    parser.add_argument("--limit", type=int, default=None, help="Only evaluate the first N samples")
+    parser.add_argument("--batch-tokens", type=int, default=BATCH_TOKENS,
+                        help="Padded token budget per batch")
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--output", default=None, help="Write the report as JSON to this file")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Load the model from a converted snapshot cache in this directory")
+    args = parser.parse_args()
+
+    print("🧠 Freud Mental Health AI - Evaluation")
+    print("=" * 80 + "\n")
+
+    if not Path(args.data).exists():
+        print(f"❌ Validation data not found at: {args.data}")
+        sys.exit(1)
+
+    evaluator = FreudEvaluator(args.model, cache_dir=args.cache_dir)
+    evaluator.load_model()
+    evaluator.load_samples(args.data, limit=args.limit)
+    report = evaluator.evaluate(batch_tokens=args.batch_tokens, max_batch_size=args.max_batch_size)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
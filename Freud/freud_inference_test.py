@@ -6,16 +6,25 @@ Test your trained model locally before deploying to production.
 
 Usage:
     python freud_inference_test.py
+    python freud_inference_test.py --profile                     # per-phase timings
+    python freud_inference_test.py --profile --trace-dir traces  # + Chrome traces
+    python freud_inference_test.py --cache-dir freud_model_cache # fast restarts
 
 Author: Your Project
 Date: January 2026
 """
 
+import argparse
+import time
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoModelForCausalLM, AutoTokenizer, LogitsProcessorList
 from pathlib import Path
+from typing import Optional
 import sys
 
+from freud_model_cache import ModelSnapshotCache
+from freud_profiler import InferenceProfiler
+
 
 class FreudTester:
     """
@@ -25,16 +34,27 @@ class FreudTester:
     to ensure quality before deployment.
     """
     
-    def __init__(self, model_path: str):
+    def __init__(
+        self,
+        model_path: str,
+        profile: bool = False,
+        trace_dir: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+    ):
         """
         Initialize the tester with a trained model.
         
         Args:
             model_path: Path to your trained model directory or HuggingFace model name
+            profile: Record per-phase timings and memory peaks (off by default)
+            trace_dir: If set (with profile), export a torch profiler Chrome trace per call
+            cache_dir: If set, load from a converted FP16 snapshot kept in this directory
         """
         self.model_path = model_path
         self.model = None
         self.tokenizer = None
+        self.profiler = InferenceProfiler(enabled=profile, trace_dir=trace_dir)
+        self.snapshot_cache = ModelSnapshotCache(cache_dir, dtype="float16") if cache_dir else None
         
         self.system_prompt = (
             "You are Freud, a calm, empathetic therapeutic AI assistant. "
@@ -47,23 +67,34 @@ class FreudTester:
         print(f"🔄 Loading model from {self.model_path}...")
         
         try:
-            # Load tokenizer
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                self.model_path,
-                trust_remote_code=True
-            )
-            
-            # Set padding token
-            if self.tokenizer.pad_token is None:
-                self.tokenizer.pad_token = self.tokenizer.eos_token
-            
-            # Load model
-            self.model = AutoModelForCausalLM.from_pretrained(
-                self.model_path,
-                device_map="auto",
-                torch_dtype=torch.float16,  # Use FP16 for faster inference
-                trust_remote_code=True
-            )
+            with self.profiler.run("load_model"):
+                if self.snapshot_cache is not None:
+                    # Converted FP16 safetensors snapshot, memory-mapped
+                    with self.profiler.phase("load_snapshot"):
+                        self.model, self.tokenizer = self.snapshot_cache.load(
+                            self.model_path,
+                            device_map="auto",
+                        )
+                else:
+                    # Load tokenizer
+                    with self.profiler.phase("load_tokenizer"):
+                        self.tokenizer = AutoTokenizer.from_pretrained(
+                            self.model_path,
+                            trust_remote_code=True
+                        )
+                    
+                    # Load model
+                    with self.profiler.phase("load_weights"):
+                        self.model = AutoModelForCausalLM.from_pretrained(
+                            self.model_path,
+                            device_map="auto",
+                            torch_dtype=torch.float16,  # Use FP16 for faster inference
+                            trust_remote_code=True
+                        )
+                
+                # Set padding token
+                if self.tokenizer.pad_token is None:
+                    self.tokenizer.pad_token = self.tokenizer.eos_token
             
             print(f"✅ Model loaded successfully!")
             print(f"📊 Parameters: {self.model.num_parameters():,}")
@@ -94,42 +125,54 @@ class FreudTester:
         Returns:
             Generated response string
         """
-        # Build prompt in training format
-        prompt = (
-            f"<|system|>: {self.system_prompt}\n"
-            f"<|user|>:\n"
-            f"[emotion: {emotion}]\n"
-            f"{user_input.strip()}\n"
-            f"<|assistant|>:\n"
-        )
-        
-        # Tokenize
-        inputs = self.tokenizer(
-            prompt,
-            return_tensors="pt",
-            truncation=True,
-            max_length=512
-        ).to(self.model.device)
-        
-        # Generate
-        with torch.no_grad():
-            outputs = self.model.generate(
-                **inputs,
-                max_new_tokens=max_tokens,
-                temperature=temperature,
-                top_p=top_p,
-                do_sample=True,
-                repetition_penalty=1.2,  # Prevent repetition
-                no_repeat_ngram_size=3,  # Prevent repeating 3-grams
-                pad_token_id=self.tokenizer.pad_token_id,
-                eos_token_id=self.tokenizer.eos_token_id,
+        with self.profiler.run("generate_response"):
+            # Build prompt in training format
+            prompt = (
+                f"<|system|>: {self.system_prompt}\n"
+                f"<|user|>:\n"
+                f"[emotion: {emotion}]\n"
+                f"{user_input.strip()}\n"
+                f"<|assistant|>:\n"
             )
-        
-        # Decode
-        full_response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-        
-        # Extract assistant's response
-        response = self._extract_response(full_response, prompt)
+            
+            # Tokenize
+            with self.profiler.phase("tokenize"):
+                inputs = self.tokenizer(
+                    prompt,
+                    return_tensors="pt",
+                    truncation=True,
+                    max_length=512
+                ).to(self.model.device)
+            
+            # Per-step timer is only attached when profiling
+            step_timer = self.profiler.step_timer()
+            extra_kwargs = {}
+            if step_timer is not None:
+                extra_kwargs['logits_processor'] = LogitsProcessorList([step_timer])
+            
+            # Generate
+            with self.profiler.phase("generate"), torch.no_grad():
+                generate_start = time.perf_counter()
+                outputs = self.model.generate(
+                    **inputs,
+                    max_new_tokens=max_tokens,
+                    temperature=temperature,
+                    top_p=top_p,
+                    do_sample=True,
+                    repetition_penalty=1.2,  # Prevent repetition
+                    no_repeat_ngram_size=3,  # Prevent repeating 3-grams
+                    pad_token_id=self.tokenizer.pad_token_id,
+                    eos_token_id=self.tokenizer.eos_token_id,
+                    **extra_kwargs,
+                )
+            self.profiler.record_generation(step_timer, generate_start, time.perf_counter())
+            
+            with self.profiler.phase("postprocess"):
+                # Decode
+                full_response = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
+                
+                # Extract assistant's response
+                response = self._extract_response(full_response, prompt)
         
         return response
     
@@ -274,11 +317,22 @@ class FreudTester:
 
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Freud Mental Health AI - Inference Tester")
+    parser.add_argument("--model", default="freud_phi2_model_merged",
+                        help="Model directory or HuggingFace model name")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print per-phase timings and memory peaks after each call")
+    parser.add_argument("--trace-dir", default=None,
+                        help="Export a torch profiler Chrome trace per call (implies --profile)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Serve the model from a converted snapshot cache in this directory")
+    args = parser.parse_args()
+    
     print("🧠 Freud Mental Health AI - Inference Tester")
     print("="*80 + "\n")
     
     # Model path - UPDATE THIS to your model location
-    MODEL_PATH = "freud_phi2_model_merged"  # Or your HuggingFace model name
+    MODEL_PATH = args.model  # Or your HuggingFace model name
     
     # Check if model exists
     if not Path(MODEL_PATH).exists():
@@ -290,7 +344,12 @@ def main():
         sys.exit(1)
     
     # Initialize tester
-    tester = FreudTester(MODEL_PATH)
+    tester = FreudTester(
+        MODEL_PATH,
+        profile=args.profile or args.trace_dir is not None,
+        trace_dir=args.trace_dir,
+        cache_dir=args.cache_dir,
+    )
     tester.load_model()
     
     # Ask user what they want to do
@@ -0,0 +1,28 @@
+"""
+Freud Mental Health AI - Process Memory Helpers
+===============================================
+
+Shared by the inference profiler and the dataset benchmark. Kept free of
+torch and transformers, so importing it does not add their few hundred MB
+to the RSS peak it is there to measure.
+
+Author: Your Project
+Date: January 2026
+"""
+
+import sys
+from typing import Optional
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+
+def rss_peak_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if unknown)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux and the BSDs report KB
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
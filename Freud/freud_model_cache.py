@@ -0,0 +1,239 @@
+"""
+Freud Mental Health AI - Converted Model Cache
+==============================================
+
+Writes ready-to-serve model snapshots so restarts skip the expensive
+parts of `from_pretrained` (dtype conversion, full weight
+materialization of the merged model).
+
+A snapshot is the model saved in the target dtype as safetensors, next
+to its tokenizer, under a directory named by a hash of the source
+weights and the conversion config. Later starts load the snapshot with
+`low_cpu_mem_usage=True`, which memory-maps the safetensors files and
+needs no conversion.
+
+Only dtype conversion is cached: bitsandbytes 4-bit weights cannot be
+serialized by the pinned transformers version, so quantized loading
+still happens at start-up from the cached FP16 snapshot.
+
+Usage:
+    python freud_model_cache.py freud_phi2_model_merged --dtype float16
+    python freud_model_cache.py freud_phi2_model_merged --benchmark
+
+Author: Your Project
+Date: January 2026
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple
+
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+
+CACHE_DIR = "freud_model_cache"
+SNAPSHOT_VERSION = 1  # Bump when the snapshot layout changes
+META_FILE = "freud_snapshot.json"
+STALE_TMP_SECONDS = 3600  # A conversion temp dir older than this belongs to a crashed run
+
+DTYPES = {
+    'float16': torch.float16,
+    'bfloat16': torch.bfloat16,
+    'float32': torch.float32,
+}
+
+
+def resolve_source(model_path: str) -> Path:
+    """Return a local directory for a model path or HuggingFace model name"""
+    if Path(model_path).exists():
+        return Path(model_path)
+
+    from huggingface_hub import snapshot_download
+    return Path(snapshot_download(model_path))
+
+
+def source_fingerprint(source_dir: Path) -> str:
+    """
+    Fingerprint the source weights without reading them.
+
+    Files in the HuggingFace cache are symlinks to blobs named by their
+    content hash, so the blob name is used. Plain files contribute their
+    size and modification time.
+    """
+    digest = hashlib.sha256()
+
+    for path in sorted(p for p in source_dir.rglob("*") if p.is_file()):
+        rel = path.relative_to(source_dir).as_posix()
+        if path.is_symlink():
+            marker = Path(os.readlink(path)).name
+        else:
+            stat = path.stat()
+            marker = f"{stat.st_size}:{stat.st_mtime_ns}"
+        digest.update(f"{rel}={marker}\n".encode('utf-8'))
+
+    return digest.hexdigest()
+
+
+def remove_stale_tmp_dirs(target: Path, max_age: float = STALE_TMP_SECONDS):
+    """Delete temporary directories left next to a snapshot by conversions that crashed"""
+    for tmp_dir in target.parent.glob(target.name + ".tmp*"):
+        if time.time() - tmp_dir.stat().st_mtime > max_age:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class ModelSnapshotCache:
+    """
+    Converts models once and serves them from a local safetensors snapshot.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, dtype: str = "float16", trust_remote_code: bool = True):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype '{dtype}' (choose from {', '.join(DTYPES)})")
+
+        self.cache_dir = Path(cache_dir)
+        self.dtype = dtype
+        self.trust_remote_code = trust_remote_code
+
+    def snapshot_key(self, source_dir: Path) -> str:
+        """Hash of the source weights and the conversion config"""
+        config = {
+            'source': source_fingerprint(source_dir),
+            'dtype': self.dtype,
+            'version': SNAPSHOT_VERSION,
+        }
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()[:20]
+
+    def snapshot_path(self, model_path: str) -> Path:
+        """Directory where the snapshot for this model/config lives"""
+        source_dir = resolve_source(model_path)
+        name = Path(model_path).name.replace("/", "--")
+        return self.cache_dir / f"{name}-{self.dtype}-{self.snapshot_key(source_dir)}"
+
+    def convert(self, model_path: str) -> Path:
+        """Write the snapshot for a model if it does not exist yet"""
+        target = self.snapshot_path(model_path)
+        if (target / META_FILE).exists():
+            return target
+
+        print(f"🔧 Converting {model_path} to a {self.dtype} snapshot...")
+        start = time.perf_counter()
+
+        source_dir = resolve_source(model_path)
+        tokenizer = AutoTokenizer.from_pretrained(source_dir, trust_remote_code=self.trust_remote_code)
+        model = AutoModelForCausalLM.from_pretrained(
+            source_dir,
+            torch_dtype=DTYPES[self.dtype],
+            low_cpu_mem_usage=True,
+            trust_remote_code=self.trust_remote_code,
+        )
+
+        # Write to a temporary directory and rename, so an interrupted
+        # conversion never leaves a half-written snapshot behind. The name
+        # is unique per process, so parallel conversions never share it.
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        remove_stale_tmp_dirs(target)
+        tmp_dir = target.with_name(f"{target.name}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+
+        model.save_pretrained(tmp_dir, safe_serialization=True)
+        tokenizer.save_pretrained(tmp_dir)
+        with open(tmp_dir / META_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                'source': str(model_path),
+                'dtype': self.dtype,
+                'version': SNAPSHOT_VERSION,
+                'created': time.strftime("%Y-%m-%d %H:%M:%S"),
+            }, f, indent=2)
+
+        try:
+            os.replace(tmp_dir, target)
+        except OSError:
+            # The target is only there if another process finished the same snapshot first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not (target / META_FILE).exists():
+                raise
+
+        print(f"✅ Snapshot written to {target} in {time.perf_counter() - start:.1f}s")
+        return target
+
+    def load(self, model_path: str, device_map: Optional[str] = None):
+        """Load model and tokenizer from the snapshot, converting on first use"""
+        return self.load_snapshot(self.convert(model_path), device_map)
+
+    def load_snapshot(self, snapshot: Path, device_map: Optional[str] = None):
+        """Load model and tokenizer from a snapshot directory written by convert"""
+        tokenizer = AutoTokenizer.from_pretrained(snapshot, trust_remote_code=self.trust_remote_code)
+        model = AutoModelForCausalLM.from_pretrained(
+            snapshot,
+            torch_dtype=DTYPES[self.dtype],
+            low_cpu_mem_usage=True,  # Memory-maps the safetensors shards
+            device_map=device_map,
+            trust_remote_code=self.trust_remote_code,
+        )
+        return model, tokenizer
+
+    def prune(self, model_path: str):
+        """Delete outdated snapshots of a model, keeping the current one"""
+        current = self.snapshot_path(model_path)
+        prefix = f"{Path(model_path).name.replace('/', '--')}-{self.dtype}-"
+
+        for path in self.cache_dir.glob(prefix + "*"):
+            if path != current and path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+                print(f"🗑️ Removed stale snapshot {path.name}")
+
+
+def benchmark_load(model_path: str, cache: ModelSnapshotCache) -> Tuple[float, float]:
+    """Time a plain from_pretrained load against a warm snapshot load"""
+    start = time.perf_counter()
+    model = AutoModelForCausalLM.from_pretrained(
+        model_path,
+        torch_dtype=DTYPES[cache.dtype],
+        trust_remote_code=cache.trust_remote_code,
+    )
+    cold = time.perf_counter() - start
+    del model
+
+    cache.convert(model_path)
+
+    start = time.perf_counter()
+    model, _ = cache.load(model_path)
+    warm = time.perf_counter() - start
+    del model
+
+    print(f"\n⏱️ Load times for {model_path} ({cache.dtype})")
+    print(f"   from_pretrained (cold): {cold:.1f}s")
+    print(f"   snapshot (warm):        {warm:.1f}s")
+    print(f"   speed-up:               {cold / max(warm, 1e-9):.1f}x")
+    return cold, warm
+
+
+def main():
+    """Main execution function"""
+    parser = argparse.ArgumentParser(description="Freud Mental Health AI - Converted Model Cache")
+    parser.add_argument("model", help="Model directory or HuggingFace model name")
+    parser.add_argument("--dtype", default="float16", choices=sorted(DTYPES))
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--benchmark", action="store_true", help="Compare cold and warm load times")
+    parser.add_argument("--prune", action="store_true", help="Remove outdated snapshots of this model")
+    args = parser.parse_args()
+
+    cache = ModelSnapshotCache(args.cache_dir, dtype=args.dtype)
+
+    if args.benchmark:
+        benchmark_load(args.model, cache)
+    else:
+        cache.convert(args.model)
+
+    if args.prune:
+        cache.prune(args.model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Freud Mental Health AI - Inference Profiler
+===========================================
+
+Opt-in instrumentation for FreudTester. Records per-phase wall time
+(tokenize, prefill, decode, post-processing, model loading), per-step
+decode times and allocation peaks, and can capture a torch profiler
+trace in Chrome trace format (open it in chrome://tracing or Perfetto).
+
+When the profiler is disabled every hook is a shared no-op, so the
+instrumented code paths cost a single attribute check.
+
+Usage:
+    python freud_inference_test.py --profile
+    python freud_inference_test.py --profile --trace-dir traces/
+
+Author: Your Project
+Date: January 2026
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import torch
+from transformers import LogitsProcessor
+
+from freud_memory import rss_peak_mb
+
+
+_NULL_CONTEXT = nullcontext()
+
+
+class DecodeStepTimer(LogitsProcessor):
+    """
+    Logits processor that timestamps every generation step.
+
+    `generate` calls logits processors once per step, right after the
+    forward pass, so the first call marks the end of prefill and the gaps
+    between later calls are the per-token decode times. Scores are
+    returned unchanged.
+    """
+
+    def __init__(self, synchronize: bool = False):
+        self.synchronize = synchronize
+        self.timestamps: List[float] = []
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        if self.synchronize:
+            torch.cuda.synchronize()
+        self.timestamps.append(time.perf_counter())
+        return scores
+
+
+class InferenceProfiler:
+    """
+    Collects timing and memory data for load_model / generate_response.
+
+    Each call wrapped in `run()` produces one record with:
+    - phases: wall time per named phase (seconds)
+    - steps: per-step decode times (seconds)
+    - peaks: CUDA allocation peak per phase (MB) and process RSS peak (MB)
+    """
+
+    def __init__(self, enabled: bool = False, trace_dir: Optional[str] = None):
+        self.enabled = enabled
+        self.trace_dir = Path(trace_dir) if trace_dir else None
+        self.runs: List[Dict] = []
+        self._current = None
+        self._torch_profiler = None
+
+    @property
+    def _cuda(self) -> bool:
+        return torch.cuda.is_available()
+
+    @contextmanager
+    def _run(self, label: str):
+        self._current = {'label': label, 'phases': {}, 'steps': [], 'peaks': {}}
+        self._torch_profiler = None
+
+        if self.trace_dir is not None:
+            activities = [torch.profiler.ProfilerActivity.CPU]
+            if self._cuda:
+                activities.append(torch.profiler.ProfilerActivity.CUDA)
+            self._torch_profiler = torch.profiler.profile(
+                activities=activities,
+                record_shapes=True,
+                profile_memory=True,
+            )
+            self._torch_profiler.__enter__()
+
+        start = time.perf_counter()
+        try:
+            yield self._current
+        finally:
+            self._current['phases']['total'] = time.perf_counter() - start
+            self._current['peaks']['rss_mb'] = rss_peak_mb()
+
+            if self._torch_profiler is not None:
+                self._torch_profiler.__exit__(None, None, None)
+                self._export_trace(label)
+
+            self.runs.append(self._current)
+            self.print_summary(self._current)
+            self._current = None
+
+    def run(self, label: str):
+        """Context manager around one profiled call (no-op when disabled)"""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._run(label)
+
+    @contextmanager
+    def _phase(self, name: str):
+        if self._cuda:
+            torch.cuda.synchronize()
+            torch.cuda.reset_peak_memory_stats()
+
+        start = time.perf_counter()
+        try:
+            with torch.profiler.record_function(name):
+                yield
+        finally:
+            # Record the phase even when it raised, so the failing step still shows up
+            if self._cuda:
+                torch.cuda.synchronize()
+                self._current['peaks'][name] = torch.cuda.max_memory_allocated() / 1024 ** 2
+            self._current['phases'][name] = time.perf_counter() - start
+
+    def phase(self, name: str):
+        """Context manager timing one named phase (no-op when disabled)"""
+        if not self.enabled or self._current is None:
+            return _NULL_CONTEXT
+        return self._phase(name)
+
+    def step_timer(self) -> Optional[DecodeStepTimer]:
+        """Logits processor for per-step timing, or None when disabled"""
+        if not self.enabled or self._current is None:
+            return None
+        return DecodeStepTimer(synchronize=self._cuda)
+
+    def record_generation(self, timer: Optional[DecodeStepTimer], start: float, end: float):
+        """Split a `generate` call into prefill and decode using the step timer"""
+        if timer is None or self._current is None or not timer.timestamps:
+            return
+
+        stamps = timer.timestamps
+        phases = self._current['phases']
+        phases['prefill'] = stamps[0] - start
+        phases['decode'] = end - stamps[0]
+        self._current['steps'] = [b - a for a, b in zip(stamps, stamps[1:])]
+
+    def _export_trace(self, label: str):
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        trace_file = self.trace_dir / f"{label}_{len(self.runs) + 1:03d}.json"
+        self._torch_profiler.export_chrome_trace(str(trace_file))
+        self._current['trace'] = str(trace_file)
+
+    def print_summary(self, record: Dict):
+        """Print the phase table for one run"""
+        print(f"\n⏱️ Profile: {record['label']}")
+        print(f"   {'phase':<16}{'time (ms)':>12}{'peak (MB)':>12}")
+        print(f"   {'-' * 40}")
+
+        for name, seconds in record['phases'].items():
+            peak = record['peaks'].get(name)
+            peak_str = f"{peak:.1f}" if peak is not None else "-"
+            print(f"   {name:<16}{seconds * 1000:>12.1f}{peak_str:>12}")
+
+        steps = record['steps']
+        if steps:
+            ordered = sorted(steps)
+            mean = sum(steps) / len(steps)
+            p50 = ordered[len(ordered) // 2]
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            print(f"   decode steps: {len(steps) + 1} tokens, "
+                  f"mean {mean * 1000:.1f} ms, p50 {p50 * 1000:.1f} ms, "
+                  f"p95 {p95 * 1000:.1f} ms, {1 / mean:.1f} tok/s")
+
+        if record['peaks'].get('rss_mb') is not None:
+            print(f"   process RSS peak: {record['peaks']['rss_mb']:.0f} MB")
+
+        if 'trace' in record:
+            print(f"   trace: {record['trace']}")
+            sort_key = "cuda_time_total" if self._cuda else "cpu_time_total"
+            print(self._torch_profiler.key_averages().table(sort_by=sort_key, row_limit=15))
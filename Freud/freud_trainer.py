@@ -0,0 +1,624 @@
+"""
+Freud Mental Health AI - Trainer
+================================
+
+Script version of freud_trainer.ipynb that spends less compute on padding:
+- Packing: samples are packed into max_seq_length rows (best-fit
+  decreasing). A block-diagonal causal attention mask and position_ids
+  that restart at every sample keep packed samples from seeing each other.
+- Length grouping: without packing, samples of similar length are
+  batched together.
+- Token budgets: the number of rows per batch follows their length,
+  bounded by --batch-tokens padded tokens per batch.
+
+--smoke trains a tiny randomly initialised Llama-style model with a
+byte-level tokenizer on CPU. It compares tokens/sec and padding ratio of
+the notebook's fixed batches, length-grouped batches and packing.
+
+Packing passes a 4D attention mask to the model. This needs a model
+implementation that accepts 4D masks (transformers >= 4.37 for the
+built-in Phi and Llama models). Before training, the trainer checks that
+packed and unpacked logits match, and refuses to pack if they do not.
+
+Usage:
+    python freud_trainer.py --smoke
+    python freud_trainer.py --batching packed --batch-tokens 4096
+    python freud_trainer.py --batching grouped --model microsoft/phi-2
+
+Author: Your Project
+Date: January 2026
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import torch
+import torch.nn.functional as F
+from transformers import AutoModelForCausalLM, AutoTokenizer, get_linear_schedule_with_warmup
+
+from freud_dataset_builder import pack_lengths
+from freud_evaluate import make_length_buckets
+
+
+BATCHING_MODES = ("fixed", "grouped", "packed")
+IGNORE_INDEX = -100
+
+
+@dataclass
+class TrainingConfig:
+    """Training configuration (defaults mirror freud_trainer.ipynb)"""
+
+    # Model Settings
+    base_model: str = "microsoft/phi-2"
+    load_in_4bit: bool = True
+
+    # Data Paths
+    train_data_path: str = "freud_training_data/train.json"
+    val_data_path: str = "freud_training_data/validation.json"
+
+    # Output Settings
+    output_dir: str = "freud_phi2_model"
+
+    # Training Hyperparameters
+    learning_rate: float = 2e-4
+    num_epochs: int = 3
+    batch_size: int = 4  # Per-device batch size in "fixed" mode
+    gradient_accumulation_steps: int = 4
+    max_seq_length: int = 512
+    warmup_ratio: float = 0.1
+    max_steps: Optional[int] = None  # Stop after this many optimizer steps
+
+    # QLoRA Settings
+    lora_r: int = 16
+    lora_alpha: int = 32
+    lora_dropout: float = 0.05
+    lora_target_modules: Tuple[str, ...] = ("Wqkv", "fc1", "fc2")  # Phi-2 specific
+
+    # Checkpoint Settings
+    save_steps: int = 500
+    logging_steps: int = 50
+
+    # Batching
+    batching: str = "packed"  # "fixed" (notebook), "grouped" or "packed"
+    batch_tokens: int = 4096  # Padded tokens per batch in "grouped" / "packed" mode
+    max_batch_size: int = 64
+    group_size: int = 50  # Batches per length-sorted mega-batch
+    seed: int = 42
+
+    def __post_init__(self):
+        if self.batching not in BATCHING_MODES:
+            raise ValueError(f"Unknown batching mode '{self.batching}' (choose from {', '.join(BATCHING_MODES)})")
+        if self.batch_tokens < self.max_seq_length:
+            raise ValueError("batch_tokens must be at least max_seq_length")
+
+
+class ByteTokenizer:
+    """
+    UTF-8 byte tokenizer for smoke runs (nothing to download).
+
+    Mimics the parts of a HuggingFace tokenizer the trainer uses.
+    """
+
+    pad_token_id = 0
+    bos_token_id = 1
+    eos_token_id = 2
+    offset = 3
+    vocab_size = 256 + offset
+
+    def __call__(self, texts: List[str], truncation: bool = True, max_length: Optional[int] = None, **kwargs) -> Dict:
+        input_ids = []
+        for text in texts:
+            ids = [self.bos_token_id] + [b + self.offset for b in text.encode('utf-8')]
+            input_ids.append(ids[:max_length] if truncation and max_length else ids)
+        return {'input_ids': input_ids}
+
+    def save_pretrained(self, path: str):
+        pass
+
+
+def plan_batches(lengths: List[int], config: TrainingConfig, rng: random.Random) -> List[List[List[int]]]:
+    """
+    Plan one epoch of batches.
+
+    A batch is a list of rows and a row is a list of sample indices. Rows
+    hold a single sample unless packing is enabled.
+
+    - fixed: shuffled rows, config.batch_size per batch
+    - grouped / packed: rows are shuffled, cut into mega-batches of
+      group_size * max_batch_size rows, and each mega-batch is split into
+      length-sorted batches of at most batch_tokens padded tokens. Batch
+      order is shuffled again, so long and short batches are interleaved.
+    """
+    if config.batching == "packed":
+        rows = pack_lengths(lengths, config.max_seq_length)
+    else:
+        rows = [[idx] for idx in range(len(lengths))]
+    rng.shuffle(rows)
+
+    if config.batching == "fixed":
+        return [rows[i:i + config.batch_size] for i in range(0, len(rows), config.batch_size)]
+
+    row_lengths = [sum(lengths[idx] for idx in row) for row in rows]
+    mega_size = config.group_size * config.max_batch_size
+    batches = []
+
+    for start in range(0, len(rows), mega_size):
+        chunk = range(start, min(start + mega_size, len(rows)))
+        buckets = make_length_buckets([row_lengths[i] for i in chunk], config.batch_tokens, config.max_batch_size)
+        batches.extend([rows[chunk[j]] for j in bucket] for bucket in buckets)
+
+    rng.shuffle(batches)
+    return batches
+
+
+def collate(batch: List[List[int]], token_ids: List[List[int]], pad_id: int) -> Dict[str, torch.Tensor]:
+    """
+    Build model inputs for one planned batch.
+
+    `segments` numbers the samples of each row from 1 (0 = padding). The
+    first token of every sample gets no label, so no sample is trained to
+    continue the one packed before it.
+    """
+    widths = [sum(len(token_ids[idx]) for idx in row) for row in batch]
+    shape = (len(batch), max(widths))
+
+    input_ids = torch.full(shape, pad_id, dtype=torch.long)
+    labels = torch.full(shape, IGNORE_INDEX, dtype=torch.long)
+    position_ids = torch.zeros(shape, dtype=torch.long)
+    segments = torch.zeros(shape, dtype=torch.long)
+
+    for r, row in enumerate(batch):
+        pos = 0
+        for k, idx in enumerate(row, 1):
+            ids = torch.tensor(token_ids[idx], dtype=torch.long)
+            end = pos + len(ids)
+            input_ids[r, pos:end] = ids
+            labels[r, pos + 1:end] = ids[1:]
+            position_ids[r, pos:end] = torch.arange(len(ids))
+            segments[r, pos:end] = k
+            pos = end
+
+    return {
+        'input_ids': input_ids,
+        'labels': labels,
+        'position_ids': position_ids,
+        'segments': segments,
+    }
+
+
+def block_diagonal_mask(segments: torch.Tensor, dtype: torch.dtype, additive: bool) -> torch.Tensor:
+    """
+    4D [batch, 1, seq, seq] causal mask that only lets tokens attend
+    within their own sample.
+
+    Args:
+        segments: [batch, seq] sample number per token (0 = padding)
+        dtype: Mask dtype (the model's compute dtype)
+        additive: Return 0 / -inf style values instead of 1 / 0
+    """
+    seq_len = segments.size(1)
+    causal = torch.ones(seq_len, seq_len, dtype=torch.bool, device=segments.device).tril()
+    allowed = (segments[:, :, None] == segments[:, None, :]) & causal
+    allowed = allowed[:, None]
+
+    if additive:
+        return torch.zeros(allowed.shape, dtype=dtype, device=segments.device).masked_fill(
+            ~allowed, torch.finfo(dtype).min
+        )
+    return allowed.to(dtype)
+
+
+def detect_mask_format(model, device: torch.device, dtype: torch.dtype) -> Optional[bool]:
+    """
+    Find the 4D mask convention the model understands.
+
+    Two random sequences are packed into one row and the logits of the
+    second are compared with running it alone. transformers versions
+    disagree on whether 4D masks are 1/0 or additive, so both are tried.
+
+    Returns:
+        True for additive masks, False for 1/0 masks, None if neither
+        isolates the samples (packing is not safe with this model)
+    """
+    was_training = model.training
+    model.eval()
+
+    generator = torch.Generator().manual_seed(0)
+    first = torch.randint(3, model.config.vocab_size, (7,), generator=generator)
+    second = torch.randint(3, model.config.vocab_size, (5,), generator=generator)
+
+    packed = torch.cat([first, second])[None].to(device)
+    position_ids = torch.cat([torch.arange(7), torch.arange(5)])[None].to(device)
+    segments = torch.tensor([[1] * 7 + [2] * 5], device=device)
+    tolerance = 1e-3 if dtype == torch.float32 else 2e-2
+    result = None
+
+    with torch.inference_mode():
+        alone = model(input_ids=second[None].to(device)).logits[0].float()
+        scale = alone.abs().max().clamp(min=1.0)
+
+        for additive in (True, False):
+            mask = block_diagonal_mask(segments, dtype, additive)
+            try:
+                logits = model(input_ids=packed, attention_mask=mask, position_ids=position_ids).logits
+            except (ValueError, RuntimeError):
+                continue
+            if (logits[0, 7:].float() - alone).abs().max() <= tolerance * scale:
+                result = additive
+                break
+
+    model.train(was_training)
+    return result
+
+
+class FreudTrainer:
+    """
+    Minimal training loop with packing and token-budget batching.
+    """
+
+    def __init__(self, config: TrainingConfig):
+        self.config = config
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.model = None
+        self.tokenizer = None
+        self.train_ids = []
+        self.val_ids = []
+        self.additive_mask = None
+
+    def load_model(self):
+        """Load the base model with 4-bit quantization and LoRA (as in the notebook)"""
+        config = self.config
+        print(f"🔄 Loading {config.base_model}...")
+
+        self.tokenizer = AutoTokenizer.from_pretrained(config.base_model, trust_remote_code=True)
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        if config.load_in_4bit and self.device.type == "cuda":
+            from transformers import BitsAndBytesConfig
+            from peft import LoraConfig, get_peft_model, prepare_model_for_kbit_training
+
+            bnb_config = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_compute_dtype=torch.float16,
+                bnb_4bit_use_double_quant=True,
+            )
+            model = AutoModelForCausalLM.from_pretrained(
+                config.base_model,
+                quantization_config=bnb_config,
+                device_map="auto",
+                trust_remote_code=True,
+            )
+            model.config.pad_token_id = self.tokenizer.eos_token_id
+            model = prepare_model_for_kbit_training(model)
+            model = get_peft_model(model, LoraConfig(
+                r=config.lora_r,
+                lora_alpha=config.lora_alpha,
+                lora_dropout=config.lora_dropout,
+                bias="none",
+                task_type="CAUSAL_LM",
+                target_modules=list(config.lora_target_modules),
+            ))
+        else:
+            model = AutoModelForCausalLM.from_pretrained(config.base_model, trust_remote_code=True)
+            model.to(self.device)
+
+        model.config.use_cache = False
+        self.model = model
+        print(f"✅ Model loaded on {self.device}")
+        return self
+
+    def use_model(self, model, tokenizer):
+        """Train an already constructed model (used by smoke runs)"""
+        self.model = model.to(self.device)
+        self.tokenizer = tokenizer
+        return self
+
+    @property
+    def compute_dtype(self) -> torch.dtype:
+        return torch.float16 if self.device.type == "cuda" else torch.float32
+
+    def tokenize(self, texts: List[str]) -> List[List[int]]:
+        """Tokenize samples and end each with EOS, so packed samples have a clear boundary"""
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.config.max_seq_length - 1)['input_ids']
+        return [ids + [self.tokenizer.eos_token_id] for ids in encoded]
+
+    def load_data(self, limit: Optional[int] = None):
+        """Load and tokenize the train / validation JSON files"""
+        for split, path in (('train', self.config.train_data_path), ('validation', self.config.val_data_path)):
+            if not path or not Path(path).exists():
+                if split == 'train':
+                    raise FileNotFoundError(f"Training data not found at: {path}")
+                continue
+
+            with open(path, 'r', encoding='utf-8') as f:
+                texts = [sample['text'] for sample in json.load(f)[:limit]]
+
+            start = time.perf_counter()
+            ids = self.tokenize(texts)
+            print(f"📂 {split}: {len(ids):,} samples, {sum(map(len, ids)):,} tokens "
+                  f"(tokenized in {time.perf_counter() - start:.1f}s)")
+
+            if split == 'train':
+                self.train_ids = ids
+            else:
+                self.val_ids = ids
+
+        return self
+
+    def check_packing(self):
+        """Make sure packed samples cannot attend to each other"""
+        if self.config.batching != "packed":
+            return self
+
+        self.additive_mask = detect_mask_format(self.model, self.device, self.compute_dtype)
+        if self.additive_mask is None:
+            raise RuntimeError(
+                "This model does not isolate packed samples with a 4D attention mask "
+                "(needs transformers >= 4.37). Use --batching grouped instead."
+            )
+        print(f"✅ Packing check passed ({'additive' if self.additive_mask else '1/0'} 4D mask)")
+        return self
+
+    def _forward(self, batch: Dict[str, torch.Tensor]) -> Tuple[torch.Tensor, int]:
+        """Summed token loss and number of target tokens of one batch"""
+        batch = {name: tensor.to(self.device) for name, tensor in batch.items()}
+        segments = batch.pop('segments')
+        labels = batch.pop('labels')
+
+        if self.config.batching == "packed":
+            batch['attention_mask'] = block_diagonal_mask(segments, self.compute_dtype, self.additive_mask)
+        else:
+            batch['attention_mask'] = (segments > 0).long()
+            del batch['position_ids']  # Every row starts at 0, the model's default
+
+        with torch.autocast(device_type="cuda", dtype=torch.float16, enabled=self.device.type == "cuda"):
+            logits = self.model(**batch).logits
+
+        logits = logits[:, :-1].float()
+        targets = labels[:, 1:]
+        loss = F.cross_entropy(
+            logits.reshape(-1, logits.size(-1)),
+            targets.reshape(-1),
+            ignore_index=IGNORE_INDEX,
+            reduction="sum",
+        )
+        return loss, int((targets != IGNORE_INDEX).sum())
+
+    @staticmethod
+    def _target_tokens(batch: List[List[int]], token_ids: List[List[int]]) -> int:
+        return sum(len(token_ids[idx]) - 1 for row in batch for idx in row)
+
+    def train(self) -> Dict:
+        """Run the training loop and return a throughput report"""
+        config = self.config
+        rng = random.Random(config.seed)
+        lengths = [len(ids) for ids in self.train_ids]
+        pad_id = self.tokenizer.pad_token_id
+
+        steps_per_epoch = math.ceil(len(plan_batches(lengths, config, random.Random(config.seed))) /
+                                    config.gradient_accumulation_steps)
+        total_steps = config.max_steps or steps_per_epoch * config.num_epochs
+
+        params = [p for p in self.model.parameters() if p.requires_grad]
+        optimizer = torch.optim.AdamW(params, lr=config.learning_rate)
+        scheduler = get_linear_schedule_with_warmup(optimizer, int(total_steps * config.warmup_ratio), total_steps)
+        if hasattr(torch.amp, "GradScaler"):  # torch >= 2.3; torch.cuda.amp.GradScaler is deprecated there
+            scaler = torch.amp.GradScaler("cuda", enabled=self.device.type == "cuda")
+        else:
+            scaler = torch.cuda.amp.GradScaler(enabled=self.device.type == "cuda")
+
+        print(f"\n🚀 Training ({config.batching} batching): {total_steps} optimizer steps, "
+              f"{steps_per_epoch} per epoch")
+
+        self.model.train()
+        step = 0
+        real_tokens = 0
+        padded_tokens = 0
+        window_loss = 0.0
+        window_tokens = 0
+        start = time.perf_counter()
+
+        for epoch in range(config.num_epochs):
+            batches = plan_batches(lengths, config, rng)
+
+            for group_start in range(0, len(batches), config.gradient_accumulation_steps):
+                group = batches[group_start:group_start + config.gradient_accumulation_steps]
+                # Normalise by the tokens of the whole accumulation group, so every
+                # token has the same weight however the batches were cut
+                group_tokens = sum(self._target_tokens(batch, self.train_ids) for batch in group)
+
+                for batch in group:
+                    inputs = collate(batch, self.train_ids, pad_id)
+                    loss, tokens = self._forward(inputs)
+                    scaler.scale(loss / max(group_tokens, 1)).backward()
+
+                    window_loss += loss.item()
+                    window_tokens += tokens
+                    real_tokens += int((inputs['segments'] > 0).sum())
+                    padded_tokens += inputs['segments'].numel()
+
+                scaler.step(optimizer)
+                scaler.update()
+                optimizer.zero_grad(set_to_none=True)
+                scheduler.step()
+                step += 1
+
+                if step % config.logging_steps == 0 or step == total_steps:
+                    elapsed = time.perf_counter() - start
+                    print(f"   step {step:>6}/{total_steps}  loss {window_loss / max(window_tokens, 1):.4f}  "
+                          f"lr {scheduler.get_last_lr()[0]:.2e}  {real_tokens / elapsed:,.0f} tok/s  "
+                          f"padding {100 * (1 - real_tokens / padded_tokens):.1f}%")
+                    window_loss = 0.0
+                    window_tokens = 0
+
+                if config.save_steps and step % config.save_steps == 0:
+                    self.save(Path(config.output_dir) / f"checkpoint-{step}")
+
+                if step >= total_steps:
+                    break
+
+            if self.val_ids:
+                print(f"   epoch {epoch + 1}: validation loss {self.evaluate():.4f}")
+
+            if step >= total_steps:
+                break
+
+        elapsed = time.perf_counter() - start
+        return {
+            'batching': config.batching,
+            'steps': step,
+            'seconds': elapsed,
+            'tokens': real_tokens,
+            'tokens_per_sec': real_tokens / elapsed,
+            'padding_ratio': 1 - real_tokens / max(padded_tokens, 1),
+        }
+
+    def evaluate(self) -> float:
+        """Validation loss per token, with the same batching as training"""
+        lengths = [len(ids) for ids in self.val_ids]
+        batches = plan_batches(lengths, self.config, random.Random(self.config.seed))
+        total_loss = 0.0
+        total_tokens = 0
+
+        self.model.eval()
+        with torch.inference_mode():
+            for batch in batches:
+                loss, tokens = self._forward(collate(batch, self.val_ids, self.tokenizer.pad_token_id))
+                total_loss += loss.item()
+                total_tokens += tokens
+        self.model.train()
+
+        return total_loss / max(total_tokens, 1)
+
+    def save(self, path: Optional[Path] = None):
+        """Save the model (LoRA adapter when training with QLoRA) and tokenizer"""
+        path = Path(path or self.config.output_dir)
+        self.model.save_pretrained(path)
+        self.tokenizer.save_pretrained(path)
+        print(f"💾 Saved to {path}")
+
+
+def build_smoke_model(vocab_size: int, seed: int = 42):
+    """Tiny randomly initialised Llama-style model that trains in seconds on CPU"""
+    from transformers import LlamaConfig, LlamaForCausalLM
+
+    torch.manual_seed(seed)
+    return LlamaForCausalLM(LlamaConfig(
+        vocab_size=vocab_size,
+        hidden_size=64,
+        intermediate_size=176,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        max_position_embeddings=2048,
+        pad_token_id=ByteTokenizer.pad_token_id,
+        bos_token_id=ByteTokenizer.bos_token_id,
+        eos_token_id=ByteTokenizer.eos_token_id,
+        use_cache=False,
+    ))
+
+
+def smoke_run(config: TrainingConfig, samples: int = 256) -> List[Dict]:
+    """
+    Train the tiny model once per batching mode on the same samples and
+    compare throughput and padding.
+    """
+    config = replace(
+        config,
+        max_seq_length=1024,  # Bytes, not subword tokens
+        batch_tokens=max(config.batch_tokens, 8192),
+        num_epochs=1,
+        gradient_accumulation_steps=1,
+        logging_steps=10 ** 9,
+        save_steps=0,
+        learning_rate=1e-3,
+    )
+    tokenizer = ByteTokenizer()
+    results = []
+
+    for mode in BATCHING_MODES:
+        mode_config = replace(config, batching=mode, train_data_path=config.val_data_path, val_data_path="")
+        trainer = FreudTrainer(mode_config)
+        trainer.use_model(build_smoke_model(tokenizer.vocab_size, config.seed), tokenizer)
+        trainer.load_data(limit=samples)
+        trainer.check_packing()
+        results.append(trainer.train())
+
+    print(f"\n📊 Smoke run ({samples} samples, tiny model on {trainer.device})")
+    print(f"   {'batching':<10}{'steps':>8}{'seconds':>10}{'tok/s':>12}{'padding':>10}")
+    print(f"   {'-' * 50}")
+    for row in results:
+        print(f"   {row['batching']:<10}{row['steps']:>8}{row['seconds']:>10.1f}"
+              f"{row['tokens_per_sec']:>12,.0f}{row['padding_ratio'] * 100:>9.1f}%")
+
+    return results
+
+
+def main():
+    """Main execution function"""
+    defaults = TrainingConfig()
+    parser = argparse.ArgumentParser(description="Freud Mental Health AI - Trainer")
+    parser.add_argument("--model", default=defaults.base_model, help="Base model name or directory")
+    parser.add_argument("--train-data", default=defaults.train_data_path)
+    parser.add_argument("--val-data", default=defaults.val_data_path)
+    parser.add_argument("--output-dir", default=defaults.output_dir)
+    parser.add_argument("--batching", default=defaults.batching, choices=BATCHING_MODES)
+    parser.add_argument("--batch-tokens", type=int, default=defaults.batch_tokens,
+                        help="Padded tokens per batch (grouped / packed batching)")
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size, help="Rows per batch (fixed batching)")
+    parser.add_argument("--seq-len", type=int, default=defaults.max_seq_length)
+    parser.add_argument("--epochs", type=int, default=defaults.num_epochs)
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--lr", type=float, default=defaults.learning_rate)
+    parser.add_argument("--no-4bit", action="store_true", help="Train the full model without QLoRA")
+    parser.add_argument("--smoke", action="store_true",
+                        help="Compare batching modes on a tiny model on CPU (uses --val-data)")
+    parser.add_argument("--smoke-samples", type=int, default=256)
+    args = parser.parse_args()
+
+    config = TrainingConfig(
+        base_model=args.model,
+        load_in_4bit=not args.no_4bit,
+        train_data_path=args.train_data,
+        val_data_path=args.val_data,
+        output_dir=args.output_dir,
+        learning_rate=args.lr,
+        num_epochs=args.epochs,
+        batch_size=args.batch_size,
+        max_seq_length=args.seq_len,
+        max_steps=args.max_steps,
+        batching=args.batching,
+        batch_tokens=args.batch_tokens,
+    )
+
+    print("🧠 Freud Mental Health AI - Trainer")
+    print("=" * 80)
+
+    if args.smoke:
+        if not Path(config.val_data_path).exists():
+            print(f"❌ Smoke data not found at: {config.val_data_path}")
+            sys.exit(1)
+        smoke_run(config, samples=args.smoke_samples)
+        return
+
+    trainer = FreudTrainer(config)
+    trainer.load_model()
+    trainer.load_data()
+    trainer.check_packing()
+    report = trainer.train()
+    trainer.save()
+
+    print(f"\n✅ Training complete: {report['tokens']:,} tokens in {report['seconds'] / 60:.1f} min, "
+          f"{report['tokens_per_sec']:,.0f} tok/s, padding {report['padding_ratio'] * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,69 @@ from fastapi import FastAPI
 from pydantic import BaseModel
 import torch
 from transformers import AutoTokenizer, AutoModelForCausalLM
+from huggingface_hub import snapshot_download
+from huggingface_hub.utils import LocalEntryNotFoundError
+from pathlib import Path
+import os
 import re
+import sys
+import time
+
+# freud_model_cache.py is copied next to app.py in the Space; in this repo it lives in ../Freud
+sys.path.append(str(Path(__file__).resolve().parent.parent / "Freud"))
+from freud_model_cache import META_FILE, ModelSnapshotCache
 
 app = FastAPI()
 
 # Load model
 MODEL_NAME = "Dalton-Khatri/freud-mental-health-assistant"
+# Converted float32 safetensors snapshots live here; set to "" to disable
+MODEL_CACHE_DIR = os.environ.get("FREUD_MODEL_CACHE", "model_cache")
+
+
+def hub_snapshot():
+    """Local hub snapshot of the model, downloading it only if it is not in the HF cache"""
+    try:
+        return Path(snapshot_download(MODEL_NAME, local_files_only=True))
+    except LocalEntryNotFoundError:
+        return Path(snapshot_download(MODEL_NAME))
+
+
+def load_model():
+    """Load the model, serving it from a converted local snapshot when possible"""
+    if not MODEL_CACHE_DIR:
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        model = AutoModelForCausalLM.from_pretrained(MODEL_NAME, torch_dtype=torch.float32)
+        return tokenizer, model
+
+    cache = ModelSnapshotCache(MODEL_CACHE_DIR, dtype="float32", trust_remote_code=False)
+
+    # The pointer names the snapshot the last start used, so a warm restart
+    # needs neither the network nor the HF cache. Delete it to pick up a
+    # newer commit of the model from the Hub.
+    pointer = Path(MODEL_CACHE_DIR) / (MODEL_NAME.replace("/", "--") + ".current")
+    snapshot = Path(MODEL_CACHE_DIR) / pointer.read_text().strip() if pointer.exists() else None
+
+    if snapshot is None or not (snapshot / META_FILE).exists():
+        # Converting from the local hub folder keeps the cache key off the network
+        snapshot = cache.convert(str(hub_snapshot()))
+        tmp_pointer = pointer.with_name(f"{pointer.name}.{os.getpid()}")
+        tmp_pointer.write_text(snapshot.name)
+        os.replace(tmp_pointer, pointer)
+
+    model, tokenizer = cache.load_snapshot(snapshot)
+    return tokenizer, model
+
+
 print(f"Loading {MODEL_NAME}...")
+load_start = time.perf_counter()
 
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForCausalLM.from_pretrained(MODEL_NAME, torch_dtype=torch.float32)
+tokenizer, model = load_model()
 
 if tokenizer.pad_token is None:
     tokenizer.pad_token = tokenizer.eos_token
 
-print("✅ Model loaded!")
+print(f"✅ Model loaded in {time.perf_counter() - load_start:.1f}s!")
 
 class GenerateRequest(BaseModel):
     prompt: str